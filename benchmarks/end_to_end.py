@@ -0,0 +1,181 @@
+"""
+Measure WorkLogCreator end to end against a local stand-in for Jira and Tempo.
+
+    python benchmarks/end_to_end.py [--sizes 10 100 1000] [--latency 0.0] [--error-rate 0.0]
+                                    [--throttle-rate 0.0] [--threads 16] [--json]
+
+For each size n, the fake server (benchmarks/fake_server.py) is started in a separate process and
+a fresh WorkLogCreator with empty caches runs, in this order:
+
+  - create_logs: n new worklogs, two per workday
+  - get_logs_in_timespan: all of them
+  - delete_logs: all of them
+  - create_workdays: n worklogs for n / 2 workdays
+  - create_logs_from_yaml: the n worklogs again, replacing the workdays
+
+Wall time and the number of HTTP requests (retries included) are taken from one run, peak memory
+of the client process from a second run under tracemalloc, which slows it down.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+import requests
+
+from tempo_worklog_cli.time_span import AFTERNOON, MORNING, TimeSpan
+from tempo_worklog_cli.util.io_util import save_yaml
+from tempo_worklog_cli.util.serialization import converter
+from tempo_worklog_cli.work_log import WorkLog
+from tempo_worklog_cli.worklog_creator import DEFAULT_NUM_THREADS, WorkLogCreator
+
+FAKE_SERVER = Path(__file__).with_name("fake_server.py")
+ISSUES = ["PP-1", "PP-2", "CORE-24", "RES-123"]
+START_DATE = date(2024, 1, 1)  # monday
+
+
+def workdays(n: int) -> list[date]:
+    days = (START_DATE + timedelta(days=d) for d in range(2 * n))
+    return [day for day in days if day.weekday() < 5][:n]
+
+
+def make_worklogs(n: int) -> list[WorkLog]:
+    return [
+        WorkLog(
+            issue=ISSUES[i % len(ISSUES)],
+            time_span=(MORNING if i % 2 == 0 else AFTERNOON).change_date(day),
+            description=f"log {i}",
+        )
+        for i, day in enumerate(day for day in workdays((n + 1) // 2) for _ in range(2))
+    ][:n]
+
+
+class FakeServerProcess:
+    """
+    fake server in a child process, such that it doesn't count towards the client's memory and
+    doesn't compete with it for the GIL
+    """
+
+    def __init__(self, latency: float, error_rate: float, throttle_rate: float) -> None:
+        self._process = subprocess.Popen(
+            [
+                sys.executable,
+                str(FAKE_SERVER),
+                "--port=0",
+                f"--latency={latency}",
+                f"--error-rate={error_rate}",
+                f"--throttle-rate={throttle_rate}",
+            ],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        urls = dict(self._process.stdout.readline().strip().split("=", 1) for _ in range(2))
+        self.url: str = urls["URL"]
+        self.tempo_url: str = urls["TEMPO_URL"]
+
+    def calls(self) -> int:
+        return sum(requests.get(f"{self.url}/_fake/calls").json().values())
+
+    def reset(self) -> None:
+        requests.post(f"{self.url}/_fake/reset")
+
+    def stop(self) -> None:
+        self._process.terminate()
+        self._process.wait()
+
+
+def measure(server: FakeServerProcess, fun: Callable[[], Any], memory: bool) -> dict[str, float]:
+    calls = server.calls()
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    fun()
+    wall_s = time.perf_counter() - start
+    if not memory:
+        return {"wall_s": wall_s, "requests": server.calls() - calls}
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"peak_mib": peak / 2**20}
+
+
+def run(server: FakeServerProcess, n: int, threads: int, memory: bool) -> dict[str, dict]:
+    server.reset()
+    worklogs = make_worklogs(n)
+    days = workdays((n + 1) // 2)
+    time_span = TimeSpan.from_start_and_end(days[0], days[-1])
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        yaml_path = Path(tmp_dir) / "worklogs.yaml"
+        save_yaml(converter.unstructure(worklogs), yaml_path)
+        creator = WorkLogCreator(
+            url=server.url,
+            user="user@example.com",
+            jira_token="jira-token",
+            tempo_token="tempo-token",
+            num_threads=threads,
+            cache_dir=Path(tmp_dir),
+            tempo_url=server.tempo_url,
+        )
+        operations = {
+            "create_logs": lambda: creator.create_logs(worklogs),
+            "get_logs_in_timespan": lambda: creator.get_logs_in_timespan(time_span),
+            "delete_logs": lambda: creator.delete_logs(time_span),
+            "create_workdays": lambda: creator.create_workdays(days[0], days[-1], "PP-1", "work"),
+            "create_logs_from_yaml": lambda: creator.create_logs_from_yaml(yaml_path),
+        }
+        return {name: measure(server, fun, memory) for name, fun in operations.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 503s")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of 429s")
+    parser.add_argument("--threads", type=int, default=DEFAULT_NUM_THREADS)
+    parser.add_argument("--json", action="store_true", help="print results as json")
+    args = parser.parse_args()
+
+    server = FakeServerProcess(args.latency, args.error_rate, args.throttle_rate)
+    results = []
+    try:
+        for n in args.sizes:
+            timings = run(server, n, args.threads, memory=False)
+            memory = run(server, n, args.threads, memory=True)
+            for operation, result in timings.items():
+                results.append({"n": n, "operation": operation, **result, **memory[operation]})
+                if not args.json:
+                    print(
+                        f"n={n:>5}  {operation:<22} {result['wall_s'] * 1000:10.1f} ms  "
+                        f"{result['requests']:>6} requests  "
+                        f"{memory[operation]['peak_mib']:8.2f} MiB peak"
+                    )
+    finally:
+        server.stop()
+
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "config": {
+                        key: getattr(args, key)
+                        for key in ("latency", "error_rate", "throttle_rate", "threads")
+                    },
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""
+Local stand-in for the Jira REST API (v2) and the Tempo REST API (v4) for offline benchmarks.
+
+    python benchmarks/fake_server.py [--port 8080] [--latency 0.05] [--error-rate 0.01]
+                                     [--throttle-rate 0.01]
+
+Worklogs are kept in memory. Jira serves `/rest/api/2/...`, Tempo serves `/tempo/4/...`, so a
+WorkLogCreator is pointed at it with `url=server.url, tempo_url=server.tempo_url` (or the `URL`
+and `TEMPO_URL` environment variables for the CLI). Every request is delayed by `latency`
+seconds and fails with a 503 or is throttled with a 429 at the given rates.
+
+When run as a script, the request counts are served at `/_fake/calls` and everything is reset by
+a POST to `/_fake/reset`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+ACCOUNT_ID = "account-1"
+TEMPO_PREFIX = "/tempo/4"
+# not counted as API calls, for controlling a server running in another process
+ADMIN_CALLS = "/_fake/calls"
+ADMIN_RESET = "/_fake/reset"
+
+ISSUE_PATTERN = re.compile(r"([A-Z][A-Z0-9]*)-(\d+)")
+
+
+def issue_id(key: str) -> int:
+    """
+    stable made-up issue id of an issue key
+    """
+    project, number = ISSUE_PATTERN.fullmatch(key).groups()
+    return sum(ord(c) for c in project) * 100000 + int(number)
+
+
+class FakeServer(ThreadingHTTPServer):
+    """
+    threaded HTTP server with the state of the fake Jira and Tempo instances. Requests are
+    counted per endpoint in `calls` (e.g. "GET /worklogs"), retried requests included.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.latency: float = latency
+        self.error_rate: float = error_rate
+        self.throttle_rate: float = throttle_rate
+        self.calls: Counter[str] = Counter()
+        self.worklogs: dict[int, dict[str, Any]] = {}
+        self.issues: dict[str, int] = {}  # key -> id of all issues seen so far
+        self._random: random.Random = random.Random(seed)
+        self._ids: itertools.count = itertools.count(1)
+        self.lock: threading.Lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    @property
+    def tempo_url(self) -> str:
+        return self.url + TEMPO_PREFIX
+
+    def start(self) -> FakeServer:
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> FakeServer:
+        return self.start()
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    def reset(self) -> None:
+        """
+        forget all worklogs and request counts
+        """
+        with self.lock:
+            self.worklogs.clear()
+            self.calls.clear()
+
+    def failure(self) -> int | None:
+        """
+        status code of a randomly injected failure, if any
+        """
+        with self.lock:
+            p = self._random.random()
+        if p < self.throttle_rate:
+            return 429
+        if p < self.throttle_rate + self.error_rate:
+            return 503
+        return None
+
+    def issue_key(self, issue: str | int) -> str | None:
+        with self.lock:
+            if str(issue).isdigit():
+                keys = [key for key, id_ in self.issues.items() if id_ == int(issue)]
+                return keys[0] if keys else None
+            if not ISSUE_PATTERN.fullmatch(str(issue)):
+                return None
+            self.issues.setdefault(str(issue), issue_id(str(issue)))
+            return str(issue)
+
+    def save_worklog(self, data: dict[str, Any], worklog_id: int | None = None) -> dict[str, Any]:
+        with self.lock:
+            if worklog_id is None:
+                worklog_id = next(self._ids)
+            log = {
+                "self": f"{self.tempo_url}/worklogs/{worklog_id}",
+                "tempoWorklogId": worklog_id,
+                "issue": {"id": int(data["issueId"])},
+                "timeSpentSeconds": int(data["timeSpentSeconds"]),
+                "startDate": data["startDate"],
+                "startTime": data.get("startTime", "00:00:00"),
+                "description": data.get("description", ""),
+                "author": {"accountId": data.get("authorAccountId", ACCOUNT_ID)},
+                "updatedAt": datetime.now().isoformat(timespec="seconds") + "Z",
+            }
+            self.worklogs[worklog_id] = log
+        return log
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: FakeServer
+    protocol_version = "HTTP/1.1"
+    # otherwise, each response with a body waits ~40 ms for the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: Any = None, headers: dict[str, str] | None = None) -> None:
+        data = b"" if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self) -> dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def _handle(self, method: str) -> None:
+        url = urlparse(self.path)
+        params = {name: values[0] for name, values in parse_qs(url.query).items()}
+        body = self._body() if method in ("POST", "PUT") else {}
+        if url.path == ADMIN_CALLS:
+            with self.server.lock:
+                self._send(200, dict(self.server.calls))
+            return
+        if url.path == ADMIN_RESET:
+            self.server.reset()
+            self._send(200, {})
+            return
+        if url.path.startswith(TEMPO_PREFIX):
+            api, path = "tempo", url.path[len(TEMPO_PREFIX) :]
+        else:
+            api, path = "jira", url.path.removeprefix("/rest/api/2")
+        endpoint = re.sub(r"/[^/]*\d[^/]*", "/{id}", path)  # e.g. /worklogs/{id}
+        with self.server.lock:
+            self.server.calls[f"{method} {endpoint}"] += 1
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        status = self.server.failure()
+        if status is not None:
+            self._send(status, {"errors": ["injected failure"]}, {"Retry-After": "0"})
+            return
+
+        handler = self._tempo if api == "tempo" else self._jira
+        try:
+            result = handler(method, path, params, body)
+        except Exception as e:
+            self._send(500, {"errorMessages": [repr(e)]})
+            return
+        if result is None:
+            self._send(404, {"errorMessages": [f"{method} {url.path} not found"]})
+        else:
+            self._send(*result)
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_PUT(self) -> None:
+        self._handle("PUT")
+
+    def do_DELETE(self) -> None:
+        self._handle("DELETE")
+
+    def _jira(self, method: str, path: str, params: dict[str, str], body: dict[str, Any]):
+        if path == "/serverInfo":
+            return 200, {
+                "baseUrl": self.server.url,
+                "version": "9.12.0",
+                "versionNumbers": [9, 12, 0],
+                "deploymentType": "Server",
+            }
+        if path == "/myself":
+            return 200, {"accountId": ACCOUNT_ID, "emailAddress": "user@example.com"}
+        if path == "/field":
+            return 200, []
+        if path.startswith("/issue/"):
+            key = self.server.issue_key(path.removeprefix("/issue/"))
+            if key is None:
+                return 404, {"errorMessages": ["Issue does not exist"]}
+            return 200, self._issue(key)
+        if path == "/search":
+            jql = params.get("jql") or body.get("jql", "")
+            keys = (self.server.issue_key(issue) for issue in re.findall(r"[\w-]+", jql))
+            issues = [self._issue(key) for key in dict.fromkeys(keys) if key is not None]
+            return 200, {
+                "startAt": 0,
+                "maxResults": len(issues),
+                "total": len(issues),
+                "issues": issues,
+            }
+        return None
+
+    def _issue(self, key: str) -> dict[str, Any]:
+        id_ = self.server.issues[key]
+        return {"id": str(id_), "key": key, "self": f"{self.server.url}/issue/{id_}", "fields": {}}
+
+    def _tempo(self, method: str, path: str, params: dict[str, str], body: dict[str, Any]):
+        match = re.fullmatch(r"/worklogs/(\d+)", path)
+        if match:
+            worklog_id = int(match.group(1))
+            with self.server.lock:
+                exists = worklog_id in self.server.worklogs
+            if not exists:
+                return 404, {"errors": [{"message": "Worklog not found"}]}
+            if method == "GET":
+                return 200, self.server.worklogs[worklog_id]
+            if method == "PUT":  # the issue of a worklog can't be changed
+                issue = {"issueId": self.server.worklogs[worklog_id]["issue"]["id"]}
+                return 200, self.server.save_worklog({**body, **issue}, worklog_id)
+            if method == "DELETE":
+                with self.server.lock:
+                    del self.server.worklogs[worklog_id]
+                return (204,)
+        if method == "POST" and path == "/worklogs":
+            return 200, self.server.save_worklog(body)
+        if method == "GET" and (path == "/worklogs" or path.startswith("/worklogs/user/")):
+            account_id = path.removeprefix("/worklogs/user/") if path != "/worklogs" else None
+            with self.server.lock:
+                logs = [
+                    log
+                    for log in self.server.worklogs.values()
+                    if params["from"] <= log["startDate"] <= params["to"]
+                    and params.get("updatedFrom", "") <= log["updatedAt"]
+                    and account_id in (None, log["author"]["accountId"])
+                ]
+            logs.sort(key=lambda log: (log["startDate"], log["startTime"]))
+            offset, limit = int(params.get("offset", 0)), int(params.get("limit", 5000))
+            metadata = {"count": len(logs[offset : offset + limit]), "offset": offset}
+            if offset + limit < len(logs):
+                next_params = dict(params, offset=str(offset + limit))
+                query = "&".join(f"{name}={value}" for name, value in next_params.items())
+                metadata["next"] = f"{self.server.tempo_url}{path}?{query}"
+            return 200, {"results": logs[offset : offset + limit], "metadata": metadata}
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080, help="0 picks a free port")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 503 responses")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of 429s")
+    args = parser.parse_args()
+
+    server = FakeServer(args.port, args.latency, args.error_rate, args.throttle_rate)
+    print(f"URL={server.url}\nTEMPO_URL={server.tempo_url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
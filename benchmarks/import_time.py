@@ -0,0 +1,108 @@
+"""
+Report the import time of the tempo CLI entry point and the wall time of `tempo --help`.
+
+    python benchmarks/import_time.py [--runs N] [--budget-ms MS] [--top N]
+
+Import times are taken from `python -X importtime` (cumulative microseconds per module). The
+script exits with status 1 if the median time `tempo --help` takes on top of a bare interpreter
+start exceeds the budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+ENTRY_MODULE = "tempo_worklog_cli.cli"
+HELP_COMMAND = f"from {ENTRY_MODULE} import cli; cli(['--help'])"
+HEAVY_MODULES = ("jira", "requests", "tempoapiclient", "ruamel.yaml", "cattrs", "click")
+
+
+def import_times(module: str) -> dict[str, int]:
+    """
+    cumulative import time in microseconds of every module imported by `import module`
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def wall_times_ms(command: str, runs: int) -> list[float]:
+    """
+    wall times in milliseconds of running `command` in a fresh interpreter
+    """
+    wall_times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", command], capture_output=True, check=True)
+        wall_times.append((time.perf_counter() - start) * 1000)
+    return wall_times
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="number of `tempo --help` runs")
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="startup budget in ms")
+    parser.add_argument("--top", type=int, default=10, help="number of heaviest modules to list")
+    parser.add_argument("--json", action="store_true", help="print results as json")
+    args = parser.parse_args()
+
+    times = import_times(ENTRY_MODULE)
+    baseline = import_times("sys")
+    wall_times = wall_times_ms(HELP_COMMAND, args.runs)
+    interpreter_ms = statistics.median(wall_times_ms("pass", args.runs))
+    results = {
+        "entry_module_import_ms": times[ENTRY_MODULE] / 1000,
+        "heaviest_modules_ms": {
+            name: times[name] / 1000
+            for name in sorted(times, key=times.get, reverse=True)
+            if name not in baseline and name != ENTRY_MODULE
+        },
+        "heavy_modules_imported": [name for name in HEAVY_MODULES if name in times],
+        "help_wall_time_ms": {
+            "median": statistics.median(wall_times),
+            "min": min(wall_times),
+            "max": max(wall_times),
+        },
+        "interpreter_startup_ms": interpreter_ms,
+        "help_overhead_ms": statistics.median(wall_times) - interpreter_ms,
+        "budget_ms": args.budget_ms,
+    }
+    results["heaviest_modules_ms"] = dict(list(results["heaviest_modules_ms"].items())[: args.top])
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"import {ENTRY_MODULE}: {results['entry_module_import_ms']:.1f} ms")
+        for name, ms in results["heaviest_modules_ms"].items():
+            print(f"  {ms:8.1f} ms  {name}")
+        print(f"heavy modules imported: {', '.join(results['heavy_modules_imported']) or '-'}")
+        help_times = results["help_wall_time_ms"]
+        print(
+            f"tempo --help: median {help_times['median']:.1f} ms "
+            f"(min {help_times['min']:.1f} ms, max {help_times['max']:.1f} ms, {args.runs} runs)"
+        )
+        print(
+            f"overhead over bare interpreter ({interpreter_ms:.1f} ms): "
+            f"{results['help_overhead_ms']:.1f} ms, budget {args.budget_ms:.0f} ms"
+        )
+
+    return int(results["help_overhead_ms"] > args.budget_ms)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
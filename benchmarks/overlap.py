@@ -0,0 +1,83 @@
+"""
+Compare the pairwise and sweep-line implementations of `work_log.overlapping`.
+
+    python benchmarks/overlap.py [--sizes 100 1000 10000] [--quadratic-limit N] [--json]
+
+The worklogs resemble a real import: two entries per workday with a few percent of them shifted
+into their neighbours. The pairwise version is skipped for sizes above `--quadratic-limit`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from itertools import combinations
+
+from tempo_worklog_cli.time_span import TimeSpan
+from tempo_worklog_cli.work_log import WorkLog, overlapping
+
+
+def overlapping_pairwise(logs: list[WorkLog]) -> list[tuple[WorkLog, WorkLog]]:
+    """
+    previous O(n^2) implementation, checking every pair
+    """
+    return [(log1, log2) for log1, log2 in combinations(logs, 2) if log1.time_span & log2.time_span]
+
+
+def make_worklogs(n: int, seed: int = 0) -> list[WorkLog]:
+    rng = random.Random(seed)
+    worklogs = []
+    for i in range(n):
+        day, half = divmod(i, 2)
+        start = datetime(2000, 1, 3, 9 if half == 0 else 14) + timedelta(days=day)
+        if rng.random() < 0.05:
+            start += timedelta(hours=rng.choice([-2, 2]))
+        worklogs.append(WorkLog("PP-1", TimeSpan(start, timedelta(hours=4)), f"log {i}"))
+    rng.shuffle(worklogs)
+    return worklogs
+
+
+def timed(fun, *args) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fun(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--quadratic-limit", type=int, default=10000)
+    parser.add_argument("--json", action="store_true", help="print results as json")
+    args = parser.parse_args()
+
+    results = []
+    for n in args.sizes:
+        worklogs = make_worklogs(n)
+        sweep_time, pairs = timed(overlapping, worklogs)
+        result = {"n": n, "pairs": len(pairs), "sweep_s": sweep_time, "pairwise_s": None}
+        if n <= args.quadratic_limit:
+            pairwise_time, expected = timed(overlapping_pairwise, worklogs)
+            assert pairs == expected, "implementations disagree"
+            result["pairwise_s"] = pairwise_time
+        results.append(result)
+
+        if not args.json:
+            pairwise = result["pairwise_s"]
+            print(
+                f"n={n:>6}  pairs={len(pairs):>5}  sweep={sweep_time * 1000:9.2f} ms  "
+                + (
+                    f"pairwise={pairwise * 1000:10.2f} ms  speedup={pairwise / sweep_time:7.1f}x"
+                    if pairwise is not None
+                    else "pairwise=skipped"
+                )
+            )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Measure how many WorkLog dicts per second are structured and unstructured.
+
+    python benchmarks/serialization.py [-n 100000] [--repeat 3] [--json]
+
+The baseline is a plain cattrs Converter with the previous structure hooks, which generates the
+WorkLog function with detailed validation on first use.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time as timer
+from datetime import date, datetime, time, timedelta
+
+from cattrs import Converter
+
+from tempo_worklog_cli.time_span import TimeSpan
+from tempo_worklog_cli.util.serialization import (
+    TIME_DELTA_REGEX,
+    converter,
+    structure_date,
+    unstructure_date,
+    unstructure_datetime,
+    unstructure_timedelta,
+)
+from tempo_worklog_cli.work_log import WorkLog
+
+
+def structure_datetime_baseline(dt: str | datetime, _: type[datetime] = datetime) -> datetime:
+    if isinstance(dt, datetime):
+        return dt
+    try:
+        return datetime.fromisoformat(dt)
+    except ValueError:
+        pass
+    try:
+        return datetime.combine(datetime.min.date(), time.fromisoformat(dt))
+    except ValueError:
+        raise ValueError(f"could not convert {dt} to datetime")
+
+
+def structure_timedelta_baseline(td_str: str, _: type[timedelta] = timedelta) -> timedelta:
+    td_match = TIME_DELTA_REGEX.match(td_str)
+    if td_match and any(td_match.groups()):
+        (days, hours, minutes, seconds) = td_match.groups()
+        return timedelta(
+            days=int(days or 0),
+            hours=int(hours or 0),
+            minutes=int(minutes or 0),
+            seconds=int(seconds or 0),
+        )
+    try:
+        d_str, t_str = td_str.split("T")
+        days = int(d_str)
+    except ValueError:
+        t_str = td_str
+        days = 0
+    t = time.fromisoformat(t_str)
+    return timedelta(days=days, hours=t.hour, minutes=t.minute, seconds=t.second)
+
+
+def baseline_converter() -> Converter:
+    baseline = Converter(forbid_extra_keys=True)
+    baseline.register_unstructure_hook(date, unstructure_date)
+    baseline.register_unstructure_hook(datetime, unstructure_datetime)
+    baseline.register_unstructure_hook(timedelta, unstructure_timedelta)
+    baseline.register_structure_hook(date, structure_date)
+    baseline.register_structure_hook(datetime, structure_datetime_baseline)
+    baseline.register_structure_hook(timedelta, structure_timedelta_baseline)
+    baseline.register_structure_hook(
+        TimeSpan,
+        lambda dct, _: TimeSpan(
+            start=baseline.structure(dct["start"], datetime),
+            duration=baseline.structure(dct["duration"], timedelta),
+        ),
+    )
+    baseline.register_unstructure_hook(
+        TimeSpan,
+        lambda time_span: {
+            "start": baseline.unstructure(time_span.start),
+            "duration": baseline.unstructure(time_span.duration),
+        },
+    )
+    return baseline
+
+
+def make_worklogs(n: int) -> list[WorkLog]:
+    return [
+        WorkLog(
+            "PP-1",
+            TimeSpan(datetime(2000, 1, 3, 9) + timedelta(days=i // 2), timedelta(hours=4)),
+            f"log {i}",
+            i if i % 2 else None,
+        )
+        for i in range(n)
+    ]
+
+
+def rate(fun, n: int, repeat: int) -> float:
+    """
+    best rate out of `repeat` runs, which is the least affected by noise
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = timer.perf_counter()
+        fun()
+        best = min(best, timer.perf_counter() - start)
+    return n / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=100_000, help="number of worklogs")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    parser.add_argument("--json", action="store_true", help="print results as json")
+    args = parser.parse_args()
+
+    worklogs = make_worklogs(args.n)
+    results = {}
+    for name, conv in (("baseline", baseline_converter()), ("current", converter)):
+        dicts = conv.unstructure(worklogs, list[WorkLog])
+        assert conv.structure(dicts[:10], list[WorkLog]) == worklogs[:10]
+        results[name] = {
+            "structure_per_s": rate(
+                lambda: conv.structure(dicts, list[WorkLog]), args.n, args.repeat
+            ),
+            "unstructure_per_s": rate(
+                lambda: conv.unstructure(worklogs, list[WorkLog]), args.n, args.repeat
+            ),
+        }
+
+    if args.json:
+        print(json.dumps({"n": args.n, **results}, indent=2))
+        return
+    for name, result in results.items():
+        print(
+            f"{name:>8}: structure {result['structure_per_s']:>10,.0f} records/s  "
+            f"unstructure {result['unstructure_per_s']:>10,.0f} records/s"
+        )
+    speedup = results["current"]["structure_per_s"] / results["baseline"]["structure_per_s"]
+    print(f"structure speedup: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
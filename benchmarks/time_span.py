@@ -0,0 +1,118 @@
+"""
+Compare memory and throughput of TimeSpan with the previous dataclass implementation.
+
+    python benchmarks/time_span.py [-n 1000000] [--json]
+
+Both are measured for building `n` spans, putting them into a set (hashing and equality),
+intersecting neighbouring spans and subtracting them from each other.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from tempo_worklog_cli.time_span import TimeSpan
+
+
+@dataclass(frozen=True)
+class DataclassTimeSpan:
+    """
+    previous implementation, holding a datetime and a timedelta
+    """
+
+    start: datetime
+    duration: timedelta
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "start", self.start.replace(microsecond=0))
+        object.__setattr__(
+            self, "duration", self.duration - timedelta(microseconds=self.duration.microseconds)
+        )
+
+    @property
+    def end(self) -> datetime:
+        return self.start + self.duration
+
+    def __and__(self, other: DataclassTimeSpan) -> DataclassTimeSpan | None:
+        if self.start <= other.start < self.end or other.start <= self.start < other.end:
+            start = max(self.start, other.start)
+            return DataclassTimeSpan(start, min(self.end, other.end) - start)
+
+    def __sub__(self, other: DataclassTimeSpan) -> tuple[DataclassTimeSpan, ...]:
+        overlap = self & other
+        if not overlap:
+            return (self,)
+        spans = []
+        if self.start < overlap.start:
+            spans.append(DataclassTimeSpan(self.start, overlap.start - self.start))
+        if overlap.end < self.end:
+            spans.append(DataclassTimeSpan(overlap.end, self.end - overlap.end))
+        return tuple(spans)
+
+
+def timed(fun) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fun()
+    return time.perf_counter() - start, result
+
+
+def measure(cls: type, n: int) -> dict[str, float]:
+    starts = [datetime(2000, 1, 3, 9) + timedelta(minutes=45 * i) for i in range(n)]
+    duration = timedelta(hours=1)
+
+    build_s, spans = timed(lambda: [cls(start, duration) for start in starts])
+
+    # measured separately, since tracing allocations slows down building considerably
+    del spans
+    gc.collect()
+    tracemalloc.start()
+    spans = [cls(start, duration) for start in starts]
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    set_s, _ = timed(lambda: set(spans))
+    pairs = list(zip(spans, spans[1:]))
+    intersect_s, _ = timed(lambda: [span1 & span2 for span1, span2 in pairs])
+    subtract_s, _ = timed(lambda: [span1 - span2 for span1, span2 in pairs])
+    return {
+        "bytes_per_span": memory / n,
+        "build_s": build_s,
+        "set_s": set_s,
+        "intersect_s": intersect_s,
+        "subtract_s": subtract_s,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=1_000_000, help="number of spans")
+    parser.add_argument("--json", action="store_true", help="print results as json")
+    args = parser.parse_args()
+
+    results = {
+        "dataclass": measure(DataclassTimeSpan, args.n),
+        "slotted": measure(TimeSpan, args.n),
+    }
+    if args.json:
+        print(json.dumps({"n": args.n, **results}, indent=2))
+        return
+
+    print(f"n={args.n}")
+    for name, result in results.items():
+        print(
+            f"{name:>10}: {result['bytes_per_span']:6.0f} B/span  "
+            + "  ".join(
+                f"{key[:-2]}={result[key] * 1000:8.1f} ms"
+                for key in ("build_s", "set_s", "intersect_s", "subtract_s")
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
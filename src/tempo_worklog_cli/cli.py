@@ -1,34 +1,148 @@
 import logging
 import os
 from datetime import date, datetime, timedelta
-from pathlib import Path
+from typing import Any
 
 import click
 from click import Context
 from dotenv import load_dotenv
 
+from tempo_worklog_cli.constants import TEMPO_DIR
 from tempo_worklog_cli.time_span import TimeSpan
-from tempo_worklog_cli.util.serialization import converter
-from tempo_worklog_cli.work_log import WorkLog
-from tempo_worklog_cli.worklog_creator import WorkLogCreator
+from tempo_worklog_cli.util.serialization import converter, frozen_today
+from tempo_worklog_cli.work_log import WorkLog, load_worklogs_from_yaml, overlapping
+from tempo_worklog_cli.worklog_creator import (
+    DEFAULT_NUM_THREADS,
+    WorkLogCreator,
+    WorkLogCreatorError,
+)
+
+DOTENV_PATH = TEMPO_DIR / ".env"
 
-DOTENV_PATH = Path("~/.tempo/.env").expanduser()
-load_dotenv(DOTENV_PATH)
+JIRA = "JIRA_TOKEN"
+TEMPO = "TEMPO_TOKEN"
+URL = "URL"
+USER = "USER_EMAIL"
+TEMPO_URL = "TEMPO_URL"  # optional
 
-JIRA = os.environ["JIRA_TOKEN"]
-TEMPO = os.environ["TEMPO_TOKEN"]
-URL = os.environ["URL"]
-USER = os.environ["USER_EMAIL"]
+REPLAY_CREDENTIALS = {
+    URL: "https://replay.invalid",
+    USER: "user@replay.invalid",
+    JIRA: "replay",
+    TEMPO: "replay",
+}
 
 LOG_CREATOR = "log_creator"
 
 
+class LazyWorkLogCreator:
+    """
+    stand-in for a WorkLogCreator, which reads the credentials and connects to Jira and Tempo only
+    once a command actually uses it. This keeps help, argument validation and offline commands
+    free of network I/O.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        self._kwargs: dict[str, Any] = kwargs
+        self._creator: WorkLogCreator | None = None
+        self.logger: logging.Logger = logging.getLogger(WorkLogCreator.__name__)
+
+    @property
+    def creator(self) -> WorkLogCreator:
+        if self._creator is None:
+            load_dotenv(DOTENV_PATH)
+            missing = [name for name in (URL, USER, JIRA, TEMPO) if name not in os.environ]
+            cassette = self._kwargs.get("cassette")
+            if missing and not (cassette is not None and cassette.replaying):
+                raise click.ClickException(
+                    f"missing environment variables {', '.join(missing)} (see {DOTENV_PATH})"
+                )
+            # replays don't connect anywhere, so credentials are optional
+            env = {**REPLAY_CREDENTIALS, **os.environ}
+            kwargs = dict(self._kwargs)
+            if TEMPO_URL in os.environ:
+                kwargs["tempo_url"] = os.environ[TEMPO_URL]
+            self._creator = WorkLogCreator(
+                url=env[URL],
+                user=env[USER],
+                jira_token=env[JIRA],
+                tempo_token=env[TEMPO],
+                **kwargs,
+            )
+        return self._creator
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.creator, name)
+
+    def close(self) -> None:
+        if self._creator is not None:
+            self._creator.close()
+
+    def echo_stats(self) -> None:
+        """
+        print the request, phase and cache stats to stderr, if the creator was ever constructed
+        """
+        if self._creator is not None:
+            click.echo(self._creator.stats.format(), err=True)
+
+
 @click.group()
 @click.option(
     "--loglevel", "-l", default="info", help="one of (debug, info, warning, error, critical)"
 )
+@click.option(
+    "--concurrency",
+    "-c",
+    type=click.IntRange(min=1),
+    default=None,
+    help=f"maximum number of concurrent requests (default: {DEFAULT_NUM_THREADS})",
+)
+@click.option(
+    "--rate-limit",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    help="maximum number of requests per second to each of Jira and Tempo",
+)
+@click.option(
+    "--mirror/--no-mirror",
+    default=False,
+    help="keep a local SQLite mirror of your worklogs, synced incrementally with Tempo",
+)
+@click.option(
+    "--record",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="record all Jira and Tempo exchanges to this cassette file, tokens are scrubbed",
+)
+@click.option(
+    "--replay",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="replay Jira and Tempo exchanges from this cassette file instead of connecting",
+)
+@click.option(
+    "--replay-latency/--no-replay-latency",
+    default=True,
+    help="replay with the recorded latency or without any waiting",
+)
+@click.option(
+    "--stats",
+    is_flag=True,
+    default=False,
+    help="print requests per endpoint, time per phase and cache hit rates on exit",
+)
 @click.pass_context
-def cli(ctx: Context, loglevel: str):
+def cli(
+    ctx: Context,
+    loglevel: str,
+    concurrency: int | None,
+    rate_limit: float | None,
+    mirror: bool,
+    record: str | None,
+    replay: str | None,
+    replay_latency: bool,
+    stats: bool,
+):
     """
     Tempo timesheets command line interface for (batch) creating and deleting work log entries
     from arguments or yaml files.
@@ -36,7 +150,27 @@ def cli(ctx: Context, loglevel: str):
     level = logging.getLevelNamesMapping().get(loglevel.upper(), 30)
     logging.basicConfig(level=level, format="%(asctime)s|%(name)s|%(levelname)s: %(message)s")
     ctx.ensure_object(dict)
-    ctx.obj[LOG_CREATOR] = WorkLogCreator(url=URL, user=USER, jira_token=JIRA, tempo_token=TEMPO)
+    # relative dates (e.g. today-1) of all arguments and yaml files of this command agree
+    ctx.with_resource(frozen_today())
+    kwargs: dict[str, Any] = {"rate_limit": rate_limit, "mirror": mirror}
+    if concurrency is not None:
+        kwargs["num_threads"] = concurrency
+    if record is not None and replay is not None:
+        raise click.UsageError("--record and --replay are mutually exclusive")
+    if record is not None or replay is not None:
+        from tempo_worklog_cli.util.cassette import Cassette
+
+        if replay is not None:
+            cassette = Cassette(replay, mode="replay", latency=replay_latency)
+        else:
+            cassette = Cassette(record, mode="record")
+            ctx.call_on_close(cassette.save)
+        # persistent caches would change which requests are made from run to run
+        kwargs.update(cassette=cassette, cache_dir=None)
+    ctx.obj[LOG_CREATOR] = LazyWorkLogCreator(**kwargs)
+    ctx.call_on_close(ctx.obj[LOG_CREATOR].close)
+    if stats:
+        ctx.call_on_close(ctx.obj[LOG_CREATOR].echo_stats)
 
 
 @cli.command()
@@ -73,6 +207,58 @@ def get(ctx: Context, start: str, end: str):
         click.echo(log)
 
 
+@cli.command()
+@click.argument("start")
+@click.argument("end")
+@click.option(
+    "--by",
+    type=click.Choice(["day", "week", "issue"]),
+    default="day",
+    help="group hours per day, ISO week or issue",
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["table", "json", "csv"]),
+    default="table",
+    help="output format",
+)
+@click.pass_context
+def report(ctx: Context, start: str, end: str, by: str, fmt: str):
+    """
+    Report hours booked from START to END dates (inclusive) per day, ISO week or issue.
+
+    Days and weeks show the deviation from the daily workload of 7.7h per workday, table rows
+    that deviate are flagged with '!'.
+
+    Dates must be given in isoformat YYYY-MM-DD or follow the pattern
+
+      today|week-start|week-end[+/-DAYS]
+
+    where week-start and week-end are the dates of the current week's MON and FRI respectively
+    and the
+    group [+/-DAYS] with DAYS an integer is optional.
+
+    \b
+    Examples:
+             today: today
+           today-1: yesterday
+           today+2: the day after tomorrow
+      week-start-7: last week's MON
+        week-end-1: this week's THU
+        week-end+3: next week's MON
+    """
+    from tempo_worklog_cli.report import build_report, format_report
+
+    ctx.ensure_object(dict)
+    start_date, end_date = converter.structure(start, date), converter.structure(end, date)
+    if end_date < start_date:
+        raise click.BadParameter(f"{end} is before {start}", param_hint="END")
+    batch = ctx.obj[LOG_CREATOR].get_batch_in_date_range(start_date, end_date)
+    rows = build_report(batch, start_date, end_date, by=by)
+    click.echo(format_report(rows, by=by, fmt=fmt))
+
+
 @cli.command()
 @click.argument("start")
 @click.argument("end")
@@ -105,6 +291,27 @@ def delete(ctx: Context, start: str, end: str):
     ctx.obj[LOG_CREATOR].delete_logs(time_span=time_span)
 
 
+@cli.command()
+@click.argument("filename", type=click.Path(exists=True))
+def validate(filename: str):
+    """
+    Validate worklog entries in yaml file at FILENAME without connecting to Jira or Tempo.
+
+    Supported yaml formats:
+      - dict representation of WorkLogSequence
+      - list of dict representation of WorkLog
+    """
+    try:
+        worklogs = load_worklogs_from_yaml(filename)
+    except Exception as e:
+        raise click.ClickException(f"invalid worklogs in {filename}: {e}")
+
+    overlapping_logs = overlapping(worklogs)
+    if overlapping_logs:
+        raise click.ClickException(f"overlapping worklogs: {overlapping_logs}")
+    click.echo(f"{len(worklogs)} valid worklogs in {filename}")
+
+
 @cli.group()
 @click.pass_context
 def create(_: Context):
@@ -116,17 +323,29 @@ def create(_: Context):
 
 @create.command()
 @click.argument("filename", type=click.Path(exists=True))
+@click.option(
+    "--sync",
+    is_flag=True,
+    default=False,
+    help="leave existing entries identical to entries in FILENAME untouched",
+)
 @click.pass_context
-def from_yaml(ctx: Context, filename: str):
+def from_yaml(ctx: Context, filename: str, sync: bool):
     """
     Create worklog entries from yaml file at FILENAME.
 
+    Entries are created in chunks while the file is read. Overlapping entries stop the creation
+    before the later one is sent, use `tempo validate FILENAME` to check the whole file first.
+
     Supported yaml formats:
       - dict representation of WorkLogSequence
       - list of dict representation of WorkLog
     """
     ctx.ensure_object(dict)
-    ctx.obj[LOG_CREATOR].create_logs_from_yaml(filename)
+    try:
+        ctx.obj[LOG_CREATOR].create_logs_from_yaml(filename, sync=sync)
+    except WorkLogCreatorError as e:
+        raise click.ClickException(str(e)) from e
 
 
 @create.command()
@@ -215,6 +434,46 @@ def workdays(ctx: Context, start: str, end: str, issue: str, descriptions: str):
     )
 
 
+@create.command()
+@click.argument("start")
+@click.argument("end")
+@click.argument("issue")
+@click.argument("description")
+@click.pass_context
+def fill_gaps(ctx: Context, start: str, end: str, issue: str, description: str):
+    """
+    Create entries for ISSUE with DESCRIPTION for all parts of the workdays from START to END
+    dates (inclusive) that are not covered by existing entries yet. Workdays consist of the
+    morning and afternoon spans of `create workdays`, weekend days are skipped.
+
+    ISSUE must be given in <project-code>-<issue-number> format (e.g. CORE-24)
+
+    Dates must be given in isoformat YYYY-MM-DD or follow the pattern
+
+      today|week-start|week-end[+/-DAYS]
+
+    where week-start and week-end are the dates of the current week's MON and FRI respectively
+    and the
+    group [+/-DAYS] with DAYS an integer is optional.
+
+    \b
+    Examples:
+             today: today
+           today-1: yesterday
+           today+2: the day after tomorrow
+      week-start-7: last week's MON
+        week-end-1: this week's THU
+        week-end+3: next week's MON
+    """
+    ctx.ensure_object(dict)
+    ctx.obj[LOG_CREATOR].fill_gaps(
+        start_date=converter.structure(start, date),
+        end_date=converter.structure(end, date),
+        issue=issue,
+        description=description,
+    )
+
+
 @create.command()
 @click.argument("start")
 @click.argument("duration")
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
+from pathlib import Path
 
 AUTHOR = "author"
 ACCOUNT_ID = "accountId"
@@ -24,3 +25,6 @@ DAILY_WORKLOAD = timedelta(seconds=27720)  # 7.7h in seconds
 DAY_START = datetime(year=1, month=1, day=1, hour=9, minute=30)
 LUNCH_BREAK_START = datetime(year=1, month=1, day=1, hour=12, minute=30)
 LUNCH_BREAK_END = datetime(year=1, month=1, day=1, hour=13, minute=30)
+
+TEMPO_DIR = Path("~/.tempo").expanduser()
+TEMPO_API_URL = "https://api.tempo.io/4"
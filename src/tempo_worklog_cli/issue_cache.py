@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Iterable
+from concurrent.futures import Future
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from tempo_worklog_cli.constants import TEMPO_DIR
+from tempo_worklog_cli.util.persistent_cache import DEFAULT_TTL, PersistentCache
+
+if TYPE_CHECKING:
+    from jira import JIRA
+
+    from tempo_worklog_cli.util.stats import RunStats
+
+ISSUE_CACHE_PATH = TEMPO_DIR / "issue_cache.json"
+SEARCH_BATCH_SIZE = 100  # maximum number of issues Jira returns per search page
+
+logger = logging.getLogger(__name__)
+
+
+class IssueCache:
+    """
+    bidirectional cache between Jira issue keys (e.g. PP-1) and their numeric ids.
+
+    Mappings are persisted on disk, since they practically never change. Concurrent lookups of the
+    same uncached issue from different threads are coalesced into a single Jira request.
+
+    If `stats` are given, lookups served from the cache count as hits, and issues that had to be
+    fetched from Jira (individually or in bulk) as misses.
+    """
+
+    def __init__(
+        self,
+        jira: JIRA,
+        filepath: Path | str | None = ISSUE_CACHE_PATH,
+        ttl: timedelta = DEFAULT_TTL,
+        stats: RunStats | None = None,
+    ) -> None:
+        self._jira: JIRA = jira
+        self._stats: RunStats | None = stats
+        # issue key and issue id (as str) -> [issue key, issue id]
+        self._cache: PersistentCache = PersistentCache(filepath, ttl=ttl)
+        self._lock: threading.Lock = threading.Lock()
+        self._pending: dict[str, Future[tuple[str, str]]] = {}
+
+    @property
+    def jira(self) -> JIRA:
+        return self._jira
+
+    def issue_id(self, issue: str | int) -> str:
+        """
+        numeric Jira id (as str) of an issue given by its key or id
+        """
+        return self._lookup(str(issue))[1]
+
+    def issue_key(self, issue: str | int) -> str:
+        """
+        Jira key (e.g. PP-1) of an issue given by its key or id
+        """
+        return self._lookup(str(issue))[0]
+
+    def add(self, key: str, issue_id: str | int) -> None:
+        """
+        store a known key <-> id mapping
+        """
+        entry = [key, str(issue_id)]
+        self._cache.update({key: entry, str(issue_id): entry})
+
+    def resolve(self, issues: Iterable[str | int]) -> None:
+        """
+        bulk resolve all uncached issues (given by key or id) with as few JQL searches as possible,
+        such that subsequent calls to `issue_id` and `issue_key` are served from the cache.
+
+        Issues that can't be resolved this way are left to be looked up individually.
+        """
+        missing = sorted({str(issue) for issue in issues if self._cache.get(str(issue)) is None})
+        self._count(misses=len(missing))
+        for i in range(0, len(missing), SEARCH_BATCH_SIZE):
+            batch = missing[i : i + SEARCH_BATCH_SIZE]
+            try:
+                found = self._jira.search_issues(
+                    f"issue in ({', '.join(batch)})",
+                    maxResults=len(batch),
+                    fields="key",
+                    validate_query=False,
+                )
+            except Exception as e:
+                logger.warning(
+                    "bulk issue resolution failed, falling back to single lookups: %s", e
+                )
+                continue
+
+            entries = {}
+            for jira_issue in found:
+                entry = [jira_issue.key, str(jira_issue.id)]
+                entries[jira_issue.key] = entries[str(jira_issue.id)] = entry
+            self._cache.update(entries)
+
+    def _count(self, hits: int = 0, misses: int = 0) -> None:
+        if self._stats is not None and (hits or misses):
+            self._stats.count_cache("issues", hits=hits, misses=misses)
+
+    def _lookup(self, issue: str) -> tuple[str, str]:
+        cached = self._cache.get(issue)
+        if cached is not None:
+            self._count(hits=1)
+            return cached[0], cached[1]
+
+        with self._lock:
+            # another thread might have finished fetching the issue in the meantime
+            cached = self._cache.get(issue)
+            if cached is not None:
+                self._count(hits=1)
+                return cached[0], cached[1]
+
+            future = self._pending.get(issue)
+            is_owner = future is None
+            if future is None:
+                future = self._pending[issue] = Future()
+
+        if not is_owner:
+            self._count(hits=1)  # served by the request of another thread
+            return future.result()
+
+        self._count(misses=1)
+        try:
+            jira_issue = self._jira.issue(issue, fields="key")
+            self.add(jira_issue.key, jira_issue.id)
+            result = (jira_issue.key, str(jira_issue.id))
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._pending[issue]
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field, replace
+
+from tempo_worklog_cli.time_span import IntervalSet, TimeSpan
+from tempo_worklog_cli.work_log import WorkLog
+
+
+@dataclass
+class ReconciliationPlan:
+    """
+    changes that bring new worklogs in without overlapping existing ones:
+
+      - to_update: existing logs trimmed to the part before, after or between new logs
+      - to_delete: existing logs completely covered by new logs
+      - to_create: new logs, followed by further parts of existing logs that were split by them
+      - to_move: logs to create that replace a deleted existing log of the same issue, carrying
+        the id of that existing log such that they can be updated in place
+      - unchanged: existing logs that are identical to a new log (only when syncing)
+    """
+
+    to_update: list[WorkLog] = field(default_factory=list)
+    to_delete: list[WorkLog] = field(default_factory=list)
+    to_create: list[WorkLog] = field(default_factory=list)
+    to_move: list[WorkLog] = field(default_factory=list)
+    unchanged: list[WorkLog] = field(default_factory=list)
+
+
+def _content(log: WorkLog) -> tuple[str, TimeSpan, str]:
+    return log.issue, log.time_span, log.description
+
+
+def plan_reconciliation(
+    new_logs: Iterable[WorkLog], existing_logs: Iterable[WorkLog], sync: bool = False
+) -> ReconciliationPlan:
+    """
+    compute which existing logs have to be trimmed, split or deleted such that they don't overlap
+    with any of the new logs anymore.
+
+    When syncing, new logs that already exist with the same issue, time span and description are
+    not created again and their existing counterparts are left untouched, such that applying the
+    same worklogs twice doesn't change anything the second time.
+
+    The time covered by the new logs is merged into sorted, disjoint spans. Since the ends of
+    these spans are sorted as well, a single pass over the existing logs in order of their start
+    times only ever moves forward through the new spans, which takes
+    O((n + m) log(n + m) + number of overlaps) for n new and m existing logs.
+
+    :param new_logs:
+    :param existing_logs: duplicates (e.g. the same log fetched for several dates) are ignored
+    :param sync: whether to keep existing logs that are identical to new logs
+    :return:
+    """
+    new_logs = list(new_logs)
+    existing_logs = list(dict.fromkeys(existing_logs))
+    # sorted, disjoint (start, end) pairs of seconds, empty spans don't cover anything
+    new_spans = IntervalSet(log.time_span for log in new_logs).bounds
+    plan = ReconciliationPlan()
+
+    if sync:
+        content_to_existing: dict[tuple[str, TimeSpan, str], list[WorkLog]] = {}
+        for existing_log in existing_logs:
+            content_to_existing.setdefault(_content(existing_log), []).append(existing_log)
+        for log in new_logs:
+            matches = content_to_existing.get(_content(log))
+            if matches:
+                plan.unchanged.append(matches.pop(0))
+            else:
+                plan.to_create.append(log)
+        unchanged = set(plan.unchanged)
+        existing_logs = [log for log in existing_logs if log not in unchanged]
+    else:
+        plan.to_create.extend(new_logs)
+
+    first = 0  # index of the first new span which ends after the current existing log starts
+    for existing_log in sorted(existing_logs, key=lambda log: log.time_span.start_seconds):
+        start, end = existing_log.time_span.start_seconds, existing_log.time_span.end_seconds
+        while first < len(new_spans) and new_spans[first][1] <= start:
+            first += 1
+
+        remaining = []
+        cursor = start
+        i = first
+        while i < len(new_spans) and new_spans[i][0] < end:
+            new_start, new_end = new_spans[i]
+            if cursor < new_start:
+                remaining.append(TimeSpan.from_seconds(cursor, new_start - cursor))
+            cursor = max(cursor, new_end)
+            i += 1
+
+        if i == first:  # no overlap with any new log
+            continue
+        if cursor < end:
+            remaining.append(TimeSpan.from_seconds(cursor, end - cursor))
+
+        if not remaining:
+            plan.to_delete.append(existing_log)
+            continue
+
+        plan.to_update.append(replace(existing_log, time_span=remaining[0]))
+        plan.to_create.extend(replace(existing_log, time_span=span) for span in remaining[1:])
+
+    _pair_deletions_with_creations(plan)
+    return plan
+
+
+def _pair_deletions_with_creations(plan: ReconciliationPlan) -> None:
+    """
+    turn pairs of a deleted existing log and a log to create of the same issue into a single
+    update of the existing log, which saves one request per pair. Within each issue, logs are
+    paired in order of their start times.
+
+    Logs on weekends are skipped instead of created (see `WorkLogCreator._force_create_log`), so
+    they aren't paired either: an existing log must not be moved onto a weekend.
+    """
+    issue_to_deleted: dict[str, list[int]] = {}
+    for i in sorted(
+        range(len(plan.to_delete)), key=lambda i: plan.to_delete[i].time_span.start_seconds
+    ):
+        issue_to_deleted.setdefault(plan.to_delete[i].issue, []).append(i)
+
+    moved_deleted = set()
+    moved_created = set()
+    for i in sorted(
+        range(len(plan.to_create)), key=lambda i: plan.to_create[i].time_span.start_seconds
+    ):
+        log = plan.to_create[i]
+        deleted = issue_to_deleted.get(log.issue)
+        if deleted and not log.time_span.on_weekend:
+            j = deleted.pop(0)
+            moved_deleted.add(j)
+            moved_created.add(i)
+            plan.to_move.append(replace(log, worklog_id=plan.to_delete[j].worklog_id))
+
+    plan.to_delete = [log for j, log in enumerate(plan.to_delete) if j not in moved_deleted]
+    plan.to_create = [log for i, log in enumerate(plan.to_create) if i not in moved_created]
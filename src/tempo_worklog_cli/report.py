@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Literal
+
+from tempo_worklog_cli.constants import DAILY_WORKLOAD
+
+if TYPE_CHECKING:
+    from tempo_worklog_cli.worklog_batch import WorkLogBatch
+
+GroupBy = Literal["day", "week", "issue"]
+ReportFormat = Literal["table", "json", "csv"]
+
+GROUP_KEYS = {"day": "date", "week": "week", "issue": "issue"}
+
+
+@dataclass(frozen=True, slots=True)
+class ReportRow:
+    """
+    hours booked on a day, week or issue, and the hours expected by DAILY_WORKLOAD on workdays
+    (None when grouping by issue)
+    """
+
+    key: str
+    hours: float
+    expected_hours: float | None = None
+
+    @property
+    def deviation(self) -> float | None:
+        if self.expected_hours is None:
+            return None
+        return round(self.hours - self.expected_hours, 2)
+
+
+def _hours(seconds: float) -> float:
+    return round(seconds / 3600, 2)
+
+
+def _workdays(start_date: date, end_date: date) -> list[date]:
+    days = (start_date + timedelta(days=d) for d in range((end_date - start_date).days + 1))
+    return [day for day in days if day.weekday() < 5]
+
+
+def build_report(
+    batch: WorkLogBatch, start_date: date, end_date: date, by: GroupBy = "day"
+) -> list[ReportRow]:
+    """
+    aggregate the worklogs of `batch` from `start_date` to `end_date` (inclusive) in a single
+    pass over its columns.
+
+    Days and weeks list all workdays of the range, including those without any worklogs, with
+    DAILY_WORKLOAD expected per workday. Worklogs count towards the day they start on.
+
+    :param batch:
+    :param start_date:
+    :param end_date:
+    :param by: one of (day, week, issue)
+    :return:
+    """
+    if by not in GROUP_KEYS:
+        raise ValueError(f"unknown grouping '{by}'")
+    totals = {key: seconds for (key,), seconds in batch.durations_by(GROUP_KEYS[by]).items()}
+    if by == "issue":
+        return [
+            ReportRow(key=issue, hours=_hours(seconds))
+            for issue, seconds in sorted(totals.items(), key=lambda item: -item[1])
+        ]
+
+    workload = DAILY_WORKLOAD.total_seconds()
+    expected: dict[date | tuple[int, int], float] = {}
+    for day in _workdays(start_date, end_date):
+        key = day if by == "day" else tuple(day.isocalendar()[:2])
+        expected[key] = expected.get(key, 0) + workload
+    rows = []
+    for key in sorted(expected.keys() | totals.keys()):
+        name = key.isoformat() if by == "day" else "{}-W{:02d}".format(*key)
+        rows.append(
+            ReportRow(
+                key=name,
+                hours=_hours(totals.get(key, 0)),
+                expected_hours=_hours(expected.get(key, 0)),
+            )
+        )
+    return rows
+
+
+def format_report(rows: list[ReportRow], by: GroupBy = "day", fmt: ReportFormat = "table") -> str:
+    """
+    render report rows as an aligned table, JSON or CSV. In tables, rows that deviate from the
+    expected hours are flagged with '!'.
+    """
+    columns = [by, "hours"] if by == "issue" else [by, "hours", "expected_hours", "deviation"]
+    records = [
+        dict(zip(columns, (row.key, row.hours, row.expected_hours, row.deviation))) for row in rows
+    ]
+
+    if fmt == "json":
+        return json.dumps(records, indent=2)
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(records)
+        return buffer.getvalue()
+    if fmt != "table":
+        raise ValueError(f"unknown report format '{fmt}'")
+
+    lines = [columns]
+    for row in rows:
+        line = [row.key, f"{row.hours:.2f}"]
+        if by != "issue":
+            line += [f"{row.expected_hours:.2f}", f"{row.deviation:+.2f}"]
+            if row.deviation:
+                line[-1] += " !"
+        lines.append(line)
+    lines.append(["total", f"{sum(row.hours for row in rows):.2f}"])
+    widths = [max(len(line[i]) for line in lines if i < len(line)) for i in range(len(columns))]
+    return "\n".join(
+        "  ".join(value.ljust(width) for value, width in zip(line, widths)).rstrip()
+        for line in lines
+    )
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, replace
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
 from datetime import date, datetime, time, timedelta
+from heapq import merge
+from typing import Any
 
+from cattrs.errors import ForbiddenExtraKeysError
 from typing_extensions import Self, TypeIs
 
 from tempo_worklog_cli.constants import (
@@ -12,6 +16,13 @@ from tempo_worklog_cli.constants import (
     LUNCH_BREAK_START,
 )
 from tempo_worklog_cli.util.io_util import SaveLoad
+from tempo_worklog_cli.util.serialization import (
+    converter,
+    structure_datetime,
+    structure_timedelta,
+    unstructure_datetime,
+    unstructure_timedelta,
+)
 
 
 class TimeSpanError(ValueError):
@@ -22,16 +33,61 @@ def _is_date(obj: object) -> TypeIs[date]:
     return type(obj) is date  # datetime is a subtype of date!
 
 
-@dataclass(frozen=True)
+SECONDS_PER_DAY = 86400
+_MIN_DATETIME = datetime.min
+
+
+def to_seconds(dt: datetime) -> int:
+    """
+    whole seconds of a (naive) datetime since 0001-01-01T00:00:00
+    """
+    return (dt.toordinal() - 1) * SECONDS_PER_DAY + dt.hour * 3600 + dt.minute * 60 + dt.second
+
+
+def from_seconds(seconds: int) -> datetime:
+    """
+    inverse of `to_seconds`
+    """
+    return _MIN_DATETIME + timedelta(seconds=seconds)
+
+
+# TimeSpan refuses attribute assignment, it sets its slots through object.__setattr__ once
+_set = object.__setattr__
+
+
 class TimeSpan(SaveLoad):
-    start: datetime
-    duration: timedelta
+    """
+    immutable time span with a resolution of seconds.
 
-    def __post_init__(self) -> None:
-        object.__setattr__(self, "start", self.start.replace(microsecond=0))
-        object.__setattr__(
-            self, "duration", self.duration - timedelta(microseconds=self.duration.microseconds)
-        )
+    Start and duration are stored as integer seconds (see `to_seconds`), such that comparisons,
+    hashing and set operations don't need any datetime arithmetic. The `start`, `duration` and
+    `end` datetime views are computed on demand, the hash is computed once.
+    """
+
+    __slots__ = ("_start", "_duration", "_hash")
+
+    _start: int
+    _duration: int
+    _hash: int
+
+    def __init__(self, start: datetime, duration: timedelta) -> None:
+        start_seconds = to_seconds(start)
+        # microseconds are truncated
+        duration_seconds = duration.days * SECONDS_PER_DAY + duration.seconds
+        _set(self, "_start", start_seconds)
+        _set(self, "_duration", duration_seconds)
+        _set(self, "_hash", hash((start_seconds, duration_seconds)))
+
+    @classmethod
+    def from_seconds(cls, start: int, duration: int) -> Self:
+        """
+        create from start (see `to_seconds`) and duration in seconds, without datetime conversions
+        """
+        time_span = cls.__new__(cls)
+        _set(time_span, "_start", start)
+        _set(time_span, "_duration", duration)
+        _set(time_span, "_hash", hash((start, duration)))
+        return time_span
 
     @classmethod
     def from_start_and_end(cls, start: datetime | date, end: datetime | date) -> Self:
@@ -41,27 +97,80 @@ class TimeSpan(SaveLoad):
             end = datetime.combine(end, time(23, 59))
         if end <= start:
             raise ValueError(f"end time {end} must be greater than start time {start}")
-        return cls(start=start, duration=end - start)
+        start_seconds = to_seconds(start)
+        return cls.from_seconds(start_seconds, to_seconds(end) - start_seconds)
+
+    @property
+    def start(self) -> datetime:
+        return from_seconds(self._start)
+
+    @property
+    def duration(self) -> timedelta:
+        return timedelta(seconds=self._duration)
 
     @property
     def end(self) -> datetime:
-        return self.start + self.duration
+        return from_seconds(self._start + self._duration)
+
+    @property
+    def start_seconds(self) -> int:
+        return self._start
+
+    @property
+    def duration_seconds(self) -> int:
+        return self._duration
+
+    @property
+    def end_seconds(self) -> int:
+        return self._start + self._duration
+
+    @property
+    def on_weekend(self) -> bool:
+        """
+        whether the start or the end fall on a saturday or sunday
+        """
+        # 0001-01-01 is a monday, so days % 7 is the weekday
+        return any(
+            seconds // SECONDS_PER_DAY % 7 > 4 for seconds in (self._start, self.end_seconds)
+        )
 
     @property
     def dates(self) -> list[date]:
-        return [self.start.date() + timedelta(days=d) for d in range(self.duration.days + 1)]
+        start_date = self.start.date()
+        return [
+            start_date + timedelta(days=d) for d in range(self._duration // SECONDS_PER_DAY + 1)
+        ]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TimeSpan):
+            return NotImplemented
+        return self._start == other._start and self._duration == other._duration
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"cannot assign to field {name!r} of immutable {type(self).__name__}")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"cannot delete field {name!r} of immutable {type(self).__name__}")
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(start={self.start!r}, duration={self.duration!r})"
+
+    def __reduce__(self):
+        return self.__class__.from_seconds, (self._start, self._duration)
 
     def change_date(self, new_date: date) -> TimeSpan:
-        return TimeSpan(
-            start=datetime.combine(date=new_date, time=self.start.time()),
-            duration=self.duration,
-        )
+        start_of_day = (new_date.toordinal() - 1) * SECONDS_PER_DAY
+        return TimeSpan.from_seconds(start_of_day + self._start % SECONDS_PER_DAY, self._duration)
 
     def intersection(self, other: TimeSpan) -> TimeSpan | None:
-        if self.start <= other.start < self.end or other.start <= self.start < other.end:
-            return TimeSpan.from_start_and_end(
-                start=max(self.start, other.start), end=min(self.end, other.end)
-            )
+        start = max(self._start, other._start)
+        end = min(self._start + self._duration, other._start + other._duration)
+        if start < end:
+            return TimeSpan.from_seconds(start, end - start)
+        return None
 
     def __and__(self, other: TimeSpan) -> TimeSpan | None:
         """
@@ -84,15 +193,17 @@ class TimeSpan(SaveLoad):
             `self`
             - single element tuple otherwise
         """
-        overlap = self & other
-        if not overlap:
-            return (replace(self),)
+        start, end = self._start, self._start + self._duration
+        overlap_start = max(start, other._start)
+        overlap_end = min(end, other._start + other._duration)
+        if overlap_start >= overlap_end:
+            return (self,)
 
         spans = []
-        if self.start < overlap.start:
-            spans.append(TimeSpan.from_start_and_end(start=self.start, end=overlap.start))
-        if overlap.end < self.end:
-            spans.append(TimeSpan.from_start_and_end(start=overlap.end, end=self.end))
+        if start < overlap_start:
+            spans.append(TimeSpan.from_seconds(start, overlap_start - start))
+        if overlap_end < end:
+            spans.append(TimeSpan.from_seconds(overlap_end, end - overlap_end))
 
         return tuple(spans)
 
@@ -100,6 +211,164 @@ class TimeSpan(SaveLoad):
         return self.subtract(other)
 
 
+class IntervalSet:
+    """
+    immutable set of points in time, normalised to sorted, disjoint time spans.
+
+    Overlapping and adjacent spans are merged on construction in O(n log n). Union, intersection
+    and difference of two normalised sets are linear merges, and checking a single time span for
+    overlap is a binary search.
+    """
+
+    __slots__ = ("_starts", "_ends")
+
+    def __init__(self, time_spans: Iterable[TimeSpan] = ()) -> None:
+        starts: list[int] = []
+        ends: list[int] = []
+        for start, end in sorted(
+            (span._start, span._start + span._duration) for span in time_spans
+        ):
+            if start >= end:  # empty spans contain no points
+                continue
+            if ends and start <= ends[-1]:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        self._starts: list[int] = starts
+        self._ends: list[int] = ends
+
+    @classmethod
+    def _from_normalised(cls, starts: list[int], ends: list[int]) -> IntervalSet:
+        interval_set = cls.__new__(cls)
+        interval_set._starts = starts
+        interval_set._ends = ends
+        return interval_set
+
+    @property
+    def time_spans(self) -> list[TimeSpan]:
+        return [
+            TimeSpan.from_seconds(start, end - start)
+            for start, end in zip(self._starts, self._ends)
+        ]
+
+    @property
+    def bounds(self) -> list[tuple[int, int]]:
+        """
+        (start, end) seconds (see `to_seconds`) of the time spans, without building TimeSpans
+        """
+        return list(zip(self._starts, self._ends))
+
+    @property
+    def duration(self) -> timedelta:
+        return timedelta(seconds=sum(self._ends) - sum(self._starts))
+
+    def __iter__(self) -> Iterator[TimeSpan]:
+        return iter(self.time_spans)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return self._starts == other._starts and self._ends == other._ends
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.time_spans!r})"
+
+    def overlaps(self, time_span: TimeSpan) -> bool:
+        """
+        whether any point of `time_span` is in the set, never for an empty `time_span`
+        """
+        if time_span._duration <= 0:
+            return False
+        i = bisect_right(self._starts, time_span._start)
+        if i > 0 and self._ends[i - 1] > time_span._start:
+            return True
+        return i < len(self._starts) and self._starts[i] < time_span._start + time_span._duration
+
+    def union(self, other: IntervalSet) -> IntervalSet:
+        starts: list[int] = []
+        ends: list[int] = []
+        for start, end in merge(zip(self._starts, self._ends), zip(other._starts, other._ends)):
+            if ends and start <= ends[-1]:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        return IntervalSet._from_normalised(starts, ends)
+
+    def intersection(self, other: IntervalSet) -> IntervalSet:
+        starts: list[int] = []
+        ends: list[int] = []
+        i = j = 0
+        while i < len(self._starts) and j < len(other._starts):
+            start = max(self._starts[i], other._starts[j])
+            end = min(self._ends[i], other._ends[j])
+            if start < end:
+                starts.append(start)
+                ends.append(end)
+            # advance whichever span ends first, the other one may overlap with further spans
+            if self._ends[i] < other._ends[j]:
+                i += 1
+            else:
+                j += 1
+        return IntervalSet._from_normalised(starts, ends)
+
+    def difference(self, other: IntervalSet) -> IntervalSet:
+        starts: list[int] = []
+        ends: list[int] = []
+        j = 0
+        for start, end in zip(self._starts, self._ends):
+            # skip spans of other that end before this span starts
+            while j < len(other._starts) and other._ends[j] <= start:
+                j += 1
+            cursor = start
+            k = j
+            while k < len(other._starts) and other._starts[k] < end:
+                if cursor < other._starts[k]:
+                    starts.append(cursor)
+                    ends.append(other._starts[k])
+                cursor = max(cursor, other._ends[k])
+                k += 1
+            if cursor < end:
+                starts.append(cursor)
+                ends.append(end)
+        return IntervalSet._from_normalised(starts, ends)
+
+    def __or__(self, other: IntervalSet) -> IntervalSet:
+        return self.union(other)
+
+    def __and__(self, other: IntervalSet) -> IntervalSet:
+        return self.intersection(other)
+
+    def __sub__(self, other: IntervalSet) -> IntervalSet:
+        return self.difference(other)
+
+
+def _structure_time_span(dct: dict[str, Any] | TimeSpan, _: type[TimeSpan]) -> TimeSpan:
+    if isinstance(dct, TimeSpan):
+        return dct
+    extra_keys = dct.keys() - {"start", "duration"}
+    if extra_keys:
+        raise ForbiddenExtraKeysError("", TimeSpan, extra_keys)
+    return TimeSpan(
+        start=structure_datetime(dct["start"]), duration=structure_timedelta(dct["duration"])
+    )
+
+
+def _unstructure_time_span(time_span: TimeSpan) -> dict[str, str]:
+    return {
+        "start": unstructure_datetime(time_span.start),
+        "duration": unstructure_timedelta(time_span.duration),
+    }
+
+
+converter.register_structure_hook(TimeSpan, _structure_time_span)
+converter.register_unstructure_hook(TimeSpan, _unstructure_time_span)
+
+
 FULL_DAY = TimeSpan(start=DAY_START, duration=DAILY_WORKLOAD)
 MORNING = TimeSpan.from_start_and_end(start=DAY_START, end=LUNCH_BREAK_START)
 AFTERNOON = TimeSpan(start=LUNCH_BREAK_END, duration=DAILY_WORKLOAD - MORNING.duration)
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Literal
+from urllib.parse import urlsplit
+
+import requests
+from requests.exceptions import RequestException
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+SCRUBBED = "<scrubbed>"
+# shorter strings would be replaced all over the cassette, and can't be meaningful secrets anyway
+MIN_SECRET_LENGTH = 4
+# response headers that are not safe to store, or don't apply to the stored (decoded) body
+DROPPED_HEADERS = frozenset(
+    {"set-cookie", "authorization", "www-authenticate", "content-encoding", "transfer-encoding"}
+)
+
+CassetteMode = Literal["record", "replay"]
+
+
+class CassetteError(RequestException):
+    """
+    a request that isn't on the replayed cassette. Unlike connection errors, it is not retried.
+    """
+
+
+def _normalised_body(body: bytes | str | None) -> str | None:
+    if body is None:
+        return None
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    try:
+        return json.dumps(json.loads(body), sort_keys=True)
+    except ValueError:
+        return body
+
+
+class Cassette:
+    """
+    HTTP exchanges with Jira and Tempo recorded to or replayed from a JSON file, for reproducing
+    runs offline (see `ThrottledHTTPAdapter`).
+
+    Each exchange on the wire is recorded, including throttled and retried ones, with its
+    response and latency. Request headers aren't stored at all and `secrets` (e.g. API tokens)
+    are replaced in all stored URLs and bodies.
+
+    On replay, requests are matched by method, path with query and body (scrubbed the same way),
+    regardless of the host, and served in recorded order. If a request is made more often than
+    recorded, its last response is repeated. Unless `latency` is False, each response is delayed
+    by its recorded latency. Without latency, the retry backoff of the adapter is skipped as well.
+    """
+
+    def __init__(
+        self,
+        filepath: Path | str,
+        mode: CassetteMode = "replay",
+        latency: bool = True,
+        secrets: Iterable[str] = (),
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        :param filepath:
+        :param mode: whether to record new or replay recorded exchanges
+        :param latency: whether to replay with the recorded latency or none at all
+        :param secrets: strings that must not end up in the cassette file
+        :param sleep:
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"unknown cassette mode '{mode}'")
+        self.filepath: Path = Path(filepath)
+        self.mode: CassetteMode = mode
+        self.latency: bool = latency
+        self.misses: int = 0  # replayed requests that weren't recorded
+        self._secrets: set[str] = set()
+        self._sleep: Callable[[float], None] = sleep
+        self._lock: threading.Lock = threading.Lock()
+        self._interactions: list[dict[str, Any]] = []
+        self._queues: dict[tuple[str, str, str | None], deque[dict[str, Any]]] = {}
+        self.add_secrets(*secrets)
+
+        if mode == "replay":
+            with self.filepath.open(encoding="utf-8") as file:
+                content = json.load(file)
+            if content.get("version") != CASSETTE_VERSION:
+                raise ValueError(f"unsupported cassette version {content.get('version')}")
+            self._interactions = content["interactions"]
+            for interaction in self._interactions:
+                key = self._key(interaction["method"], interaction["url"], interaction["body"])
+                self._queues.setdefault(key, deque()).append(interaction)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @property
+    def instant(self) -> bool:
+        """
+        whether replay skips all waiting
+        """
+        return self.replaying and not self.latency
+
+    def __len__(self) -> int:
+        return len(self._interactions)
+
+    def __enter__(self) -> Cassette:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.save()
+
+    def add_secrets(self, *secrets: str | None) -> None:
+        self._secrets.update(
+            secret for secret in secrets if secret and len(secret) >= MIN_SECRET_LENGTH
+        )
+
+    def _scrub(self, text: str | None) -> str | None:
+        if text is None:
+            return None
+        # longer secrets first, in case one contains another
+        for secret in sorted(self._secrets, key=len, reverse=True):
+            text = text.replace(secret, SCRUBBED)
+        return text
+
+    @staticmethod
+    def _key(method: str, url: str, body: str | None) -> tuple[str, str, str | None]:
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        return method.upper(), path, body
+
+    def record(
+        self, request: requests.PreparedRequest, response: requests.Response, elapsed: float
+    ) -> None:
+        """
+        add an exchange, `response.content` must have been read already
+        """
+        interaction = {
+            "method": request.method,
+            "url": self._scrub(request.url),
+            "body": self._scrub(_normalised_body(request.body)),
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() not in DROPPED_HEADERS
+            },
+            "response": self._scrub(response.content.decode("utf-8", errors="replace")),
+            "elapsed": round(elapsed, 6),
+        }
+        with self._lock:
+            self._interactions.append(interaction)
+
+    def replay(self, request: requests.PreparedRequest) -> requests.Response:
+        key = self._key(
+            request.method or "GET",
+            self._scrub(request.url) or "",
+            self._scrub(_normalised_body(request.body)),
+        )
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                self.misses += 1
+                raise CassetteError(
+                    f"{request.method} {request.url} is not on cassette {self.filepath}",
+                    request=request,
+                )
+            interaction = queue.popleft() if len(queue) > 1 else queue[0]
+
+        if self.latency:
+            self._sleep(interaction["elapsed"])
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.reason = interaction["reason"]
+        response.headers = CaseInsensitiveDict(interaction["headers"])
+        response._content = interaction["response"].encode("utf-8")
+        response._content_consumed = True  # there is no connection to read from or close
+        response.encoding = "utf-8"
+        response.url = request.url or ""
+        response.request = request
+        response.elapsed = timedelta(seconds=interaction["elapsed"])
+        return response
+
+    def save(self) -> None:
+        """
+        write the recorded exchanges to the cassette file, replayed cassettes are left as they are
+        """
+        if self.replaying:
+            return
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            content = {"version": CASSETTE_VERSION, "interactions": list(self._interactions)}
+        with self.filepath.open("w", encoding="utf-8") as file:
+            json.dump(content, file, indent=1)
+        logger.info("recorded %d exchanges to %s", len(content["interactions"]), self.filepath)
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, Timeout
+
+from tempo_worklog_cli.util.throttle import (
+    AdaptiveConcurrencyLimiter,
+    RetryPolicy,
+    TokenBucket,
+    parse_retry_after,
+)
+
+if TYPE_CHECKING:
+    from tempo_worklog_cli.util.cassette import Cassette
+    from tempo_worklog_cli.util.stats import RunStats
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+TOO_MANY_REQUESTS = 429
+RETRY_STATUSES = frozenset({TOO_MANY_REQUESTS, 502, 503, 504})
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose connection pool per host is sized to the number of concurrent workers.
+
+    The pool blocks when all connections are in use instead of opening throwaway connections, so
+    concurrent workers keep reusing the same keep-alive connections rather than paying for new
+    TCP and TLS handshakes.
+    """
+
+    def __init__(self, pool_size: int) -> None:
+        super().__init__(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+        self.pool_size: int = pool_size
+
+
+class ThrottledHTTPAdapter(PooledHTTPAdapter):
+    """
+    PooledHTTPAdapter which is shared by all worker threads and
+
+      - limits the request rate with a token bucket, which also honours Retry-After headers
+      - adaptively lowers the number of concurrent requests when the server throttles
+      - retries throttled requests (429) and, for idempotent methods, server and connection
+        errors with jittered exponential backoff
+      - optionally records every exchange on the wire to a cassette, or replays them from it
+        instead of sending any request
+      - optionally counts requests, their latency, size and retries per endpoint
+    """
+
+    def __init__(
+        self,
+        pool_size: int,
+        rate: float | None = None,
+        retry_policy: RetryPolicy = RetryPolicy(),
+        sleep: Callable[[float], None] = time.sleep,
+        cassette: Cassette | None = None,
+        stats: RunStats | None = None,
+    ) -> None:
+        super().__init__(pool_size)
+        clock = time.monotonic
+        if cassette is not None and cassette.instant:
+            clock = _VirtualClock()
+            sleep = clock.sleep
+        self.cassette: Cassette | None = cassette
+        self.stats: RunStats | None = stats
+        self.bucket: TokenBucket = TokenBucket(rate=rate, clock=clock, sleep=sleep)
+        self.limiter: AdaptiveConcurrencyLimiter = AdaptiveConcurrencyLimiter(pool_size)
+        self.retry_policy: RetryPolicy = retry_policy
+        self._sleep: Callable[[float], None] = sleep
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if self.stats is None:
+            return self._send_with_retries(request, None, **kwargs)
+
+        attempts: list[int] = []
+        response = None
+        start = time.perf_counter()
+        try:
+            response = self._send_with_retries(request, attempts, **kwargs)
+            return response
+        finally:
+            self.stats.record_request(
+                request.method or "GET",
+                request.url or "",
+                time.perf_counter() - start,
+                num_bytes=sum(attempts),
+                retries=max(len(attempts) - 1, 0),
+                error=response is None or response.status_code >= 400,
+            )
+
+    def _send_with_retries(
+        self,
+        request: requests.PreparedRequest,
+        attempts: list[int] | None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        send `request` until it succeeds or can't be retried. If `attempts` is given, the number
+        of bytes sent and received is appended to it for each attempt.
+        """
+        is_idempotent = request.method in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            with self.limiter:
+                self.bucket.acquire()
+                try:
+                    response = self._send_once(request, **kwargs)
+                except (ConnectionError, Timeout) as e:
+                    if attempts is not None:
+                        attempts.append(_body_size(request.body))
+                    if not is_idempotent or attempt >= self.retry_policy.max_retries:
+                        raise
+                    status = None
+                    delay = self.retry_policy.backoff(attempt)
+                    logger.warning("%s %s failed (%s), retrying", request.method, request.url, e)
+                else:
+                    if attempts is not None:
+                        attempts.append(
+                            _body_size(request.body)
+                            + _response_size(response, kwargs.get("stream", False))
+                        )
+                    status = response.status_code
+                    is_retryable = status == TOO_MANY_REQUESTS or (
+                        status in RETRY_STATUSES and is_idempotent
+                    )
+                    if not is_retryable or attempt >= self.retry_policy.max_retries:
+                        if status != TOO_MANY_REQUESTS:
+                            self.limiter.on_success()
+                        return response
+
+                    delay = self.retry_policy.backoff(attempt)
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    if status == TOO_MANY_REQUESTS:
+                        # a 429 means the request was rejected, so it is safe to resend a POST.
+                        # All threads are held back, the retry waits in `bucket.acquire`
+                        self.limiter.on_throttle()
+                        delay = max(delay, retry_after or 0.0)
+                        self.bucket.pause(delay)
+                    elif retry_after is not None:
+                        delay = max(delay, retry_after)
+                    logger.warning(
+                        "%s %s returned %s, retrying in %.1fs (limit %d concurrent requests)",
+                        request.method,
+                        request.url,
+                        status,
+                        delay,
+                        self.limiter.limit,
+                    )
+                    response.close()
+
+            attempt += 1
+            if status != TOO_MANY_REQUESTS:
+                self._sleep(delay)
+
+    def _send_once(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if self.cassette is None:
+            return super().send(request, **kwargs)
+        if self.cassette.replaying:
+            return self.cassette.replay(request)
+
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        response.content  # read the body within the measured time, before recording it
+        self.cassette.record(request, response, time.perf_counter() - start)
+        return response
+
+
+def _body_size(body: bytes | str | None) -> int:
+    if isinstance(body, bytes):
+        return len(body)
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    return 0  # no body, or a stream of unknown size
+
+
+def _response_size(response: requests.Response, stream: bool) -> int:
+    if stream and not response._content_consumed:
+        # don't read streamed responses, which their callers consume
+        return int(response.headers.get("Content-Length") or 0)
+    return len(response.content or b"")
+
+
+class _VirtualClock:
+    """
+    clock that only advances by sleeping on it, which returns immediately. Rate limits, pauses and
+    backoff are then accounted for without any actual waiting.
+    """
+
+    def __init__(self) -> None:
+        self._now: float = 0.0
+        self._lock: threading.Lock = threading.Lock()
+
+    def __call__(self) -> float:
+        return self._now
+
+    def sleep(self, seconds: float) -> None:
+        with self._lock:
+            self._now += max(seconds, 0.0)
+
+
+def mount_adapter(session: requests.Session, adapter: HTTPAdapter) -> HTTPAdapter:
+    """
+    mount `adapter` for http and https requests on `session`
+    """
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return adapter
@@ -1,27 +1,52 @@
-from pathlib import Path
-from typing import Any
+from __future__ import annotations
 
-from ruamel.yaml import YAML
+from collections.abc import Iterator
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from tempo_worklog_cli.util.serialization import converter
 
-yaml = YAML(typ="safe")
-yaml.default_flow_style = False  # disable flow style for consistent YAML format
+if TYPE_CHECKING:
+    from ruamel.yaml import YAML
+
+
+@cache
+def get_yaml() -> YAML:
+    """
+    shared YAML instance, ruamel.yaml is only imported on first use to keep CLI startup fast
+    """
+    from ruamel.yaml import YAML
+
+    yaml = YAML(typ="safe")
+    yaml.default_flow_style = False  # disable flow style for consistent YAML format
+    return yaml
 
 
 def load_yaml(filepath: Path | str) -> dict[str, Any]:
     filepath = Path(filepath)
     with filepath.open("r") as file:
-        return yaml.load(file)
+        return get_yaml().load(file)
+
+
+def iter_yaml(filepath: Path | str) -> Iterator[Any]:
+    """
+    lazily parse the documents of a (multi-document, i.e. `---` separated) yaml file one by one
+    """
+    filepath = Path(filepath)
+    with filepath.open("r") as file:
+        yield from get_yaml().load_all(file)
 
 
 def save_yaml(obj, filepath: Path | str):
     filepath = Path(filepath)
     with filepath.open("w") as file:
-        yaml.dump(obj, file)
+        get_yaml().dump(obj, file)
 
 
 class SaveLoad:
+    __slots__ = ()
+
     def to_dict(self) -> dict[str, Any]:
         return converter.unstructure(self)
 
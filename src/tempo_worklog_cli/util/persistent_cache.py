@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Mapping
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = timedelta(days=30)
+DEFAULT_MAX_ENTRIES = 10000
+
+
+class PersistentCache:
+    """
+    thread-safe key-value store backed by a json file on disk.
+
+    Entries expire after `ttl` and the oldest entries are evicted once there are more than
+    `max_entries`. If `filepath` is None, the cache only lives in memory.
+    """
+
+    def __init__(
+        self,
+        filepath: Path | str | None,
+        ttl: timedelta = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._filepath: Path | None = None if filepath is None else Path(filepath)
+        self._ttl: float = ttl.total_seconds()
+        self._max_entries: int = max_entries
+        self._clock: Callable[[], float] = clock
+        self._lock: threading.RLock = threading.RLock()
+        # key -> (value, time stored), loaded lazily from disk on first access
+        self._entries: dict[str, tuple[Any, float]] | None = None
+
+    @property
+    def filepath(self) -> Path | None:
+        return self._filepath
+
+    def _load(self) -> dict[str, tuple[Any, float]]:
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = {}
+        if self._filepath is not None and self._filepath.is_file():
+            try:
+                with self._filepath.open("r") as file:
+                    self._entries = {
+                        key: (value, stored_at)
+                        for key, (value, stored_at) in json.load(file).items()
+                    }
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning("ignoring corrupt cache file %s: %s", self._filepath, e)
+        return self._entries
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return stored_at + self._ttl < now
+
+    def get(self, key: str) -> Any | None:
+        """
+        return the value stored under `key` or None if there is none or it has expired
+        """
+        with self._lock:
+            entry = self._load().get(key)
+            if entry is None:
+                return None
+            value, stored_at = entry
+            if self._expired(stored_at, self._clock()):
+                del self._entries[key]
+                return None
+            return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+    def set(self, key: str, value: Any) -> None:
+        self.update({key: value})
+
+    def update(self, items: Mapping[str, Any]) -> None:
+        """
+        store all `items` and write the cache to disk once
+        """
+        if not items:
+            return
+
+        with self._lock:
+            entries = self._load()
+            now = self._clock()
+            for key, value in items.items():
+                entries.pop(key, None)  # re-insert to keep dict in insertion (i.e. age) order
+                entries[key] = (value, now)
+            self._evict(now)
+            self.save()
+
+    def _evict(self, now: float) -> None:
+        entries = self._load()
+        for key in [
+            key for key, (_, stored_at) in entries.items() if self._expired(stored_at, now)
+        ]:
+            del entries[key]
+
+        # entries are kept in insertion order, so the first ones are the oldest
+        excess = len(entries) - self._max_entries
+        for key in list(entries)[: max(excess, 0)]:
+            del entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = {}
+            self.save()
+
+    def save(self) -> None:
+        """
+        atomically write the cache to disk (no-op for in-memory caches)
+        """
+        if self._filepath is None:
+            return
+
+        with self._lock:
+            entries = self._load()
+            try:
+                self._filepath.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self._filepath.with_name(f"{self._filepath.name}.{os.getpid()}.tmp")
+                with tmp_path.open("w") as file:
+                    json.dump({key: list(entry) for key, entry in entries.items()}, file)
+                tmp_path.replace(self._filepath)
+            except OSError as e:
+                logger.warning("could not write cache file %s: %s", self._filepath, e)
@@ -1,7 +1,14 @@
 import re
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import TypeVar
 
 from cattrs import Converter
+from cattrs.gen import make_dict_structure_fn, make_dict_unstructure_fn
+
+T = TypeVar("T")
 
 converter = Converter(forbid_extra_keys=True)
 
@@ -11,6 +18,32 @@ WEEK_END = "week-end"
 
 DAY_REGEX = re.compile(rf"({TODAY}|{WEEK_START}|{WEEK_END})([+-]\d+)?")
 TIME_DELTA_REGEX = re.compile(r"(?:(\d)+d)?(?:(\d{1,2})h)?(?:(\d{1,2})m)?(?:(\d{1,2})s)?")
+ISO_TIME_DELTA_REGEX = re.compile(r"(?:(\d+)T)?([01]\d|2[0-3]):([0-5]\d)(?::([0-5]\d))?")
+
+
+_frozen_today: date | None = None
+
+
+def today() -> date:
+    """
+    today's date, or the date resolved by an enclosing `frozen_today`
+    """
+    return date.today() if _frozen_today is None else _frozen_today
+
+
+@contextmanager
+def frozen_today() -> Iterator[date]:
+    """
+    resolve today's date once for the duration of the block, such that all relative dates of one
+    CLI invocation agree even if it runs past midnight
+    """
+    global _frozen_today
+    previous = _frozen_today
+    _frozen_today = date.today() if previous is None else previous
+    try:
+        yield _frozen_today
+    finally:
+        _frozen_today = previous
 
 
 def unstructure_datetime(dt: datetime) -> str:
@@ -22,6 +55,13 @@ def unstructure_datetime(dt: datetime) -> str:
     return dt.isoformat()
 
 
+def _from_time(time_str: str) -> datetime:
+    """
+    datetime from isoformat time, with min. date prepended
+    """
+    return datetime.combine(datetime.min.date(), time.fromisoformat(time_str))
+
+
 def structure_datetime(dt: str | datetime, _: type[datetime] = datetime) -> datetime:
     """
     structure from isoformat <year>-<month>-<day>T<hour>:<minute>:<second>
@@ -30,16 +70,16 @@ def structure_datetime(dt: str | datetime, _: type[datetime] = datetime) -> date
     if isinstance(dt, datetime):
         return dt
 
-    try:
-        return datetime.fromisoformat(dt)
-    except ValueError:
-        pass
-
-    try:
-        # try if only time is given and prepend min. date
-        return datetime.combine(datetime.min.date(), time.fromisoformat(dt))
-    except ValueError:
-        raise ValueError(f"could not convert {dt} to datetime")
+    # try the more likely format first, which saves raising an exception
+    parsers = (
+        (datetime.fromisoformat, _from_time) if "-" in dt else (_from_time, datetime.fromisoformat)
+    )
+    for parse in parsers:
+        try:
+            return parse(dt)
+        except ValueError:
+            pass
+    raise ValueError(f"could not convert {dt} to datetime")
 
 
 def unstructure_timedelta(td: timedelta) -> str:
@@ -49,7 +89,7 @@ def unstructure_timedelta(td: timedelta) -> str:
     return f"{td.days}T{str(timedelta(seconds=td.seconds)):>08}"
 
 
-def structure_timedelta(td_str: str, _: type[timedelta] = timedelta) -> timedelta:
+def structure_timedelta(td_str: str | timedelta, _: type[timedelta] = timedelta) -> timedelta:
     """
     structure from <days>T<hours>:<minutes>:<seconds> isoformat or special pattern
 
@@ -66,6 +106,26 @@ def structure_timedelta(td_str: str, _: type[timedelta] = timedelta) -> timedelt
         >>> structure_timedelta("1d30m", timedelta)
         datetime.timedelta(days=1, seconds=1800)
     """
+    if isinstance(td_str, timedelta):
+        return td_str
+    if not isinstance(td_str, str):
+        # e.g. `duration: 90` in yaml, which is ambiguous
+        raise ValueError(f"could not convert {td_str!r} to timedelta, expected a string")
+    return _parse_timedelta(td_str)
+
+
+@lru_cache(maxsize=4096)
+def _parse_timedelta(td_str: str) -> timedelta:
+    """
+    parse a timedelta string, see `structure_timedelta`. Worklogs mostly share a few durations,
+    so results are cached.
+    """
+    # fast path for the unstructured format
+    iso_match = ISO_TIME_DELTA_REGEX.fullmatch(td_str)
+    if iso_match:
+        days, hours, minutes, seconds = iso_match.groups()
+        return timedelta(int(days or 0), int(hours) * 3600 + int(minutes) * 60 + int(seconds or 0))
+
     td_match = TIME_DELTA_REGEX.match(td_str)
     if td_match and any(td_match.groups()):
         (days, hours, minutes, seconds) = td_match.groups()
@@ -97,7 +157,7 @@ def unstructure_date(d: date) -> str:
     return d.isoformat()
 
 
-def structure_date(date_str: str, _: type[date] = date) -> date:
+def structure_date(date_str: str | date, _: type[date] = date) -> date:
     """
     unstructure from isoformat YYYY-MM-DD or special form
 
@@ -123,15 +183,19 @@ def structure_date(date_str: str, _: type[date] = date) -> date:
     :param _:
     :return:
     """
+    # yaml structures dates automatically
+    if isinstance(date_str, date):
+        return date_str.date() if isinstance(date_str, datetime) else date_str
+
     m = DAY_REGEX.match(date_str)
     if m is not None:
-        today = date.today()
+        today_ = today()
         if m.group(1) == TODAY:
-            day = today
+            day = today_
         elif m.group(1) == WEEK_START:
-            day = date.today() - timedelta(days=today.weekday())
+            day = today_ - timedelta(days=today_.weekday())
         elif m.group(1) == WEEK_END:
-            day = date.today() + timedelta(days=4 - today.weekday())
+            day = today_ + timedelta(days=4 - today_.weekday())
         else:
             raise ValueError(f"'{m.group(0)}' not recognized")
 
@@ -148,3 +212,19 @@ converter.register_unstructure_hook(timedelta, unstructure_timedelta)
 converter.register_structure_hook(date, structure_date)
 converter.register_structure_hook(datetime, structure_datetime)
 converter.register_structure_hook(timedelta, structure_timedelta)
+
+
+def register_dataclass_hooks(cls: type[T]) -> type[T]:
+    """
+    class decorator which generates specialised structure and unstructure functions for a
+    dataclass up front. Structuring skips cattrs' detailed validation, which collects errors of
+    all fields instead of failing on the first one, but is considerably slower.
+    """
+    converter.register_structure_hook(
+        cls,
+        make_dict_structure_fn(
+            cls, converter, _cattrs_forbid_extra_keys=True, _cattrs_detailed_validation=False
+        ),
+    )
+    converter.register_unstructure_hook(cls, make_dict_unstructure_fn(cls, converter))
+    return cls
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlsplit
+
+# path segments with a digit are ids or keys, e.g. /worklogs/123 or /issue/PP-1
+ID_SEGMENT = re.compile(r"/[^/]*\d[^/]*")
+
+
+def percentile(values: list[float], p: float) -> float:
+    """
+    nearest-rank percentile of `values`, 0 if there are none
+
+    :param values: sorted values
+    :param p: percentile in [0, 100]
+    """
+    if not values:
+        return 0.0
+    return values[max(math.ceil(p / 100 * len(values)) - 1, 0)]
+
+
+@dataclass
+class EndpointStats:
+    """
+    requests to one endpoint, each with all of its attempts
+    """
+
+    requests: int = 0
+    retries: int = 0
+    errors: int = 0  # requests that failed or returned an error status after all attempts
+    bytes: int = 0  # request and response bodies of all attempts
+    latencies: list[float] = field(default_factory=list)  # seconds per request, retries included
+
+    def as_dict(self) -> dict[str, Any]:
+        latencies = sorted(self.latencies)
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "p50_s": percentile(latencies, 50),
+            "p95_s": percentile(latencies, 95),
+            "total_s": sum(latencies),
+        }
+
+
+@dataclass
+class PhaseStats:
+    calls: int = 0
+    seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"calls": self.calls, "seconds": self.seconds}
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float | None:
+        total = self.hits + self.misses
+        return self.hits / total if total else None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate}
+
+
+class RunStats:
+    """
+    thread-safe counters of a WorkLogCreator: HTTP requests per endpoint (e.g. "GET /worklogs"),
+    time spent per phase of an operation and cache hits and misses.
+
+    Endpoints are the request paths without the API prefix (e.g. /rest/api/2 for Jira) and with
+    ids and issue keys replaced by {id}.
+    """
+
+    def __init__(self, base_paths: Iterable[str] = ()) -> None:
+        """
+        :param base_paths: API prefixes to strip from request paths, the longest matching one is
+                           stripped
+        """
+        self._base_paths: list[str] = sorted(
+            {path.rstrip("/") for path in base_paths if path.strip("/")}, key=len, reverse=True
+        )
+        self._lock: threading.Lock = threading.Lock()
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.phases: dict[str, PhaseStats] = {}
+        self.caches: dict[str, CacheStats] = {}
+
+    def endpoint(self, method: str, url: str) -> str:
+        path = urlsplit(url).path
+        for base_path in self._base_paths:
+            if path == base_path or path.startswith(base_path + "/"):
+                path = path[len(base_path) :]
+                break
+        return f"{method.upper()} {ID_SEGMENT.sub('/{id}', path) or '/'}"
+
+    def record_request(
+        self,
+        method: str,
+        url: str,
+        seconds: float,
+        num_bytes: int = 0,
+        retries: int = 0,
+        error: bool = False,
+    ) -> None:
+        """
+        count a request with all of its attempts
+
+        :param method:
+        :param url:
+        :param seconds: time until the final response, including backoff between attempts
+        :param num_bytes: size of the request and response bodies of all attempts
+        :param retries: number of attempts after the first
+        :param error: whether the request finally failed
+        """
+        endpoint = self.endpoint(method, url)
+        with self._lock:
+            stats = self.endpoints.setdefault(endpoint, EndpointStats())
+            stats.requests += 1
+            stats.retries += retries
+            stats.errors += error
+            stats.bytes += num_bytes
+            stats.latencies.append(seconds)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        add the time spent in the `with` block to phase `name`
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            with self._lock:
+                stats = self.phases.setdefault(name, PhaseStats())
+                stats.calls += 1
+                stats.seconds += seconds
+
+    def count_cache(self, name: str, hits: int = 0, misses: int = 0) -> None:
+        with self._lock:
+            stats = self.caches.setdefault(name, CacheStats())
+            stats.hits += hits
+            stats.misses += misses
+
+    def reset(self) -> None:
+        with self._lock:
+            self.endpoints.clear()
+            self.phases.clear()
+            self.caches.clear()
+
+    def as_dict(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """
+        all counters as plain data, e.g. for exporting them as JSON
+        """
+        with self._lock:
+            return {
+                "requests": {name: stats.as_dict() for name, stats in self.endpoints.items()},
+                "phases": {name: stats.as_dict() for name, stats in self.phases.items()},
+                "caches": {name: stats.as_dict() for name, stats in self.caches.items()},
+            }
+
+    def format(self) -> str:
+        """
+        aligned tables of the requests per endpoint (busiest first), the phases and the caches
+        """
+        data = self.as_dict()
+        requests = sorted(data["requests"].items(), key=lambda item: -item[1]["total_s"])
+        tables = [
+            [
+                ["endpoint", "requests", "retries", "errors", "p50_ms", "p95_ms", "bytes"],
+                *(
+                    [
+                        name,
+                        str(stats["requests"]),
+                        str(stats["retries"]),
+                        str(stats["errors"]),
+                        f"{stats['p50_s'] * 1000:.1f}",
+                        f"{stats['p95_s'] * 1000:.1f}",
+                        str(stats["bytes"]),
+                    ]
+                    for name, stats in requests
+                ),
+            ],
+            [
+                ["phase", "calls", "seconds"],
+                *(
+                    [name, str(stats["calls"]), f"{stats['seconds']:.3f}"]
+                    for name, stats in data["phases"].items()
+                ),
+            ],
+            [
+                ["cache", "hits", "misses", "hit_rate"],
+                *(
+                    [
+                        name,
+                        str(stats["hits"]),
+                        str(stats["misses"]),
+                        "-" if stats["hit_rate"] is None else f"{stats['hit_rate']:.1%}",
+                    ]
+                    for name, stats in data["caches"].items()
+                ),
+            ],
+        ]
+        return "\n\n".join(_format_table(table) for table in tables if len(table) > 1)
+
+
+def _format_table(lines: list[list[str]]) -> str:
+    """
+    first column left-aligned, all others right-aligned
+    """
+    widths = [max(len(line[i]) for line in lines) for i in range(len(lines[0]))]
+    return "\n".join(
+        "  ".join(
+            value.ljust(width) if i == 0 else value.rjust(width)
+            for i, (value, width) in enumerate(zip(line, widths))
+        )
+        for line in lines
+    )
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+class TokenBucket:
+    """
+    thread-safe token bucket limiting the request rate to `rate` requests per second with bursts
+    of up to `capacity` requests. If `rate` is None, requests are only delayed by `pause`.
+    """
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._rate: float | None = rate
+        self._capacity: float = capacity or max(rate or 1.0, 1.0)
+        self._tokens: float = self._capacity
+        self._clock: Callable[[], float] = clock
+        self._sleep: Callable[[float], None] = sleep
+        self._updated: float = clock()
+        self._paused_until: float = 0.0
+        self._lock: threading.Lock = threading.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """
+        hold back all requests for `seconds`, e.g. as requested by a Retry-After header
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    def _reserve(self) -> tuple[float, bool]:
+        """
+        time to wait and whether a token was reserved. Tokens are reserved even if the bucket is
+        empty, in which case the caller has to wait until the token would have been available.
+        """
+        now = self._clock()
+        if now < self._paused_until:
+            return self._paused_until - now, False
+        if self._rate is None:
+            return 0.0, True
+
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+        self._tokens -= 1
+        return max(-self._tokens / self._rate, 0.0), True
+
+    def acquire(self) -> None:
+        """
+        block until a request may be sent
+        """
+        while True:
+            with self._lock:
+                wait_time, reserved = self._reserve()
+            if wait_time > 0:
+                self._sleep(wait_time)
+            if reserved:
+                return
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    bounds the number of concurrent requests and adapts the bound to throttling responses:
+    the limit is halved whenever the server throttles and grows by one again after `limit`
+    consecutive successful requests (additive increase, multiplicative decrease).
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1) -> None:
+        self._max_limit: int = max_limit
+        self._min_limit: int = min_limit
+        self._limit: int = max_limit
+        self._in_flight: int = 0
+        self._successes: int = 0
+        self._condition: threading.Condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def __enter__(self):
+        with self._condition:
+            self._condition.wait_for(lambda: self._in_flight < self._limit)
+            self._in_flight += 1
+        return self
+
+    def __exit__(self, *_):
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self) -> None:
+        with self._condition:
+            self._successes += 1
+            if self._successes >= self._limit and self._limit < self._max_limit:
+                self._limit += 1
+                self._successes = 0
+                self._condition.notify_all()
+
+    def on_throttle(self) -> None:
+        with self._condition:
+            self._limit = max(self._min_limit, self._limit // 2)
+            self._successes = 0
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    retry failed requests up to `max_retries` times with jittered exponential backoff
+    """
+
+    max_retries: int = 5
+    backoff_base: float = 0.5  # seconds
+    backoff_max: float = 60.0  # seconds
+
+    def backoff(self, attempt: int) -> float:
+        """
+        randomized delay in seconds before retry number `attempt` (starting at 0)
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    parse a Retry-After header given either in seconds or as an HTTP date
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
@@ -1,13 +1,12 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable, Iterator
 from dataclasses import dataclass, replace
 from datetime import date, datetime, time, timedelta
-from itertools import combinations
-from typing import Any
-
-from jira import JIRA
+from heapq import heappop, heappush
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from tempo_worklog_cli.constants import (
     ACCOUNT_ID,
@@ -22,23 +21,58 @@ from tempo_worklog_cli.constants import (
     TIME_SPENT_SECONDS,
 )
 from tempo_worklog_cli.time_span import TimeSpan
-from tempo_worklog_cli.util.io_util import SaveLoad
+from tempo_worklog_cli.util.io_util import SaveLoad, iter_yaml
+from tempo_worklog_cli.util.serialization import converter, register_dataclass_hooks
+
+if TYPE_CHECKING:
+    from jira import JIRA
+
+    from tempo_worklog_cli.issue_cache import IssueCache
+
 
+def tempo_time_span(log_dict: dict[str, Any]) -> TimeSpan:
+    """
+    time span of a worklog in TEMPO API dict representation, without any Jira lookups
+    """
+    return TimeSpan(
+        start=datetime.combine(
+            date.fromisoformat(log_dict[START_DATE]),
+            time.fromisoformat(log_dict[START_TIME]),
+        ),
+        duration=timedelta(seconds=log_dict[TIME_SPENT_SECONDS]),
+    )
 
-@dataclass(frozen=True)
+
+@register_dataclass_hooks
+@dataclass(frozen=True, slots=True)
 class WorkLog(SaveLoad):
     issue: str  # str-int (like e.g. PP-1)
     time_span: TimeSpan
     description: str
     worklog_id: int | None = None
 
-    def as_tempo_dict(self, jira: JIRA) -> dict[str, Any]:
+    def as_tempo_dict(
+        self,
+        jira: JIRA,
+        issue_cache: IssueCache | None = None,
+        author_account_id: str | None = None,
+    ) -> dict[str, Any]:
         """
         dict representation for TEMPO API
+
+        :param jira:
+        :param issue_cache: if given, the issue id is looked up in the cache instead of Jira
+        :param author_account_id: Jira account id of the author, defaults to the Jira user
         """
         return {
-            AUTHOR_ACCOUNT_ID: jira.myself()[ACCOUNT_ID],
-            ISSUE_ID: jira.issue(self.issue).id,
+            AUTHOR_ACCOUNT_ID: (
+                jira.myself()[ACCOUNT_ID] if author_account_id is None else author_account_id
+            ),
+            ISSUE_ID: (
+                jira.issue(self.issue).id
+                if issue_cache is None
+                else issue_cache.issue_id(self.issue)
+            ),
             START_DATE: self.time_span.start.date().isoformat(),
             START_TIME: self.time_span.start.time().isoformat(),
             TIME_SPENT_SECONDS: int(self.time_span.duration.total_seconds()),
@@ -47,24 +81,28 @@ class WorkLog(SaveLoad):
         }
 
     @classmethod
-    def from_tempo_dict(cls, log_dict: dict[str, Any], jira: JIRA):
+    def from_tempo_dict(
+        cls, log_dict: dict[str, Any], jira: JIRA, issue_cache: IssueCache | None = None
+    ):
         """
         create from TEMPO API dict representation
+
+        :param log_dict:
+        :param jira:
+        :param issue_cache: if given, the issue key is looked up in the cache instead of Jira
         """
+        issue_id = log_dict[ISSUE][ID]
         return cls(
-            issue=jira.issue(log_dict[ISSUE][ID]).key,
-            time_span=TimeSpan(
-                start=datetime.combine(
-                    date.fromisoformat(log_dict[START_DATE]),
-                    time.fromisoformat(log_dict[START_TIME]),
-                ),
-                duration=timedelta(seconds=log_dict[TIME_SPENT_SECONDS]),
+            issue=(
+                jira.issue(issue_id).key if issue_cache is None else issue_cache.issue_key(issue_id)
             ),
+            time_span=tempo_time_span(log_dict),
             description=log_dict[DESCRIPTION],
             worklog_id=log_dict.get(TEMPO_WORKLOG_ID),
         )
 
 
+@register_dataclass_hooks
 @dataclass
 class WorkLogSequence(SaveLoad):
     start_date: date
@@ -76,24 +114,14 @@ class WorkLogSequence(SaveLoad):
         day_to_logs = defaultdict(list)
         for log in work_logs:
             day = (log.time_span.start.date() - start_date).days
-            time_span = replace(
-                log.time_span, start=log.time_span.start.replace(year=1, month=1, day=1)
-            )
+            time_span = log.time_span.change_date(date.min)
             day_to_logs[day].append(replace(log, time_span=time_span))
         return cls(start_date=start_date, day_to_logs=day_to_logs)
 
     @property
     def worklogs(self) -> list[WorkLog]:
         return [
-            replace(
-                log,
-                time_span=replace(
-                    log.time_span,
-                    start=datetime.combine(
-                        self.start_date + timedelta(days=day), log.time_span.start.time()
-                    ),
-                ),
-            )
+            replace(log, time_span=log.time_span.change_date(self.start_date + timedelta(days=day)))
             for day, logs in self.day_to_logs.items()
             for log in logs
         ]
@@ -101,8 +129,86 @@ class WorkLogSequence(SaveLoad):
 
 def overlapping(logs: Iterable[WorkLog]) -> list[tuple[WorkLog, WorkLog]]:
     """
-    return pairs of overlapping WorkLogs from a given iterable of WorkLogs
+    return pairs of overlapping WorkLogs from a given iterable of WorkLogs.
+
+    Pairs are returned in the same order as by checking all `itertools.combinations(logs, 2)`
+    with `&`, but found with a sweep line over the logs sorted by start time, which takes
+    O(n log n + number of overlapping pairs) instead of O(n^2).
     :param logs:
     :return:
     """
-    return [(log1, log2) for log1, log2 in combinations(logs, 2) if log1.time_span & log2.time_span]
+    logs = list(logs)
+    spans = [(log.time_span.start_seconds, log.time_span.end_seconds) for log in logs]
+
+    pairs = []
+    active: list[tuple[int, int]] = []  # min-heap of (end, index) of logs that started
+    for j in sorted(range(len(logs)), key=lambda i: spans[i][0]):
+        start, end = spans[j]
+        if start >= end:
+            continue  # empty spans don't overlap with anything, like with `TimeSpan.__and__`
+        while active and active[0][0] <= start:
+            heappop(active)
+        # all remaining active logs started before and end after `start`
+        pairs.extend((i, j) if i < j else (j, i) for _, i in active)
+        heappush(active, (end, j))
+
+    pairs.sort()
+    return [(logs[i], logs[j]) for i, j in pairs]
+
+
+def iter_worklogs_from_yaml(
+    filepath: Path | str, on_error: Callable[[ValueError], None] | None = None
+) -> Iterator[WorkLog]:
+    """
+    lazily load WorkLogs from a yaml file, which may contain multiple `---` separated documents.
+    Supported document formats:
+      - dict representation of WorkLogSequence
+      - list of dict representation of WorkLog
+
+    Lists are structured and validated record by record, such that the first WorkLogs are
+    available before the whole file has been processed.
+
+    :param filepath:
+    :param on_error: if given, invalid records and documents are passed to it as ValueErrors and
+                     skipped, otherwise the ValueError is raised
+    :return:
+    """
+    filepath = Path(filepath)
+    if not filepath.is_file():
+        raise FileNotFoundError(f"{filepath} not found")
+
+    def handle(error: ValueError) -> None:
+        if on_error is None:
+            raise error
+        on_error(error)
+
+    for document, data in enumerate(iter_yaml(filepath)):
+        if data is None:  # empty document
+            continue
+        if isinstance(data, dict):
+            try:
+                worklogs = WorkLogSequence.from_dict(data).worklogs
+            except Exception as e:
+                handle(ValueError(f"invalid worklog sequence in document {document}: {e}"))
+                continue
+            yield from worklogs
+        elif isinstance(data, list):
+            for record, dct in enumerate(data):
+                try:
+                    worklog = converter.structure(dct, WorkLog)
+                except Exception as e:
+                    handle(ValueError(f"invalid worklog {record} in document {document}: {e}"))
+                    continue
+                yield worklog
+        else:
+            handle(ValueError(f"data format of document {document} not supported."))
+
+
+def load_worklogs_from_yaml(filepath: Path | str) -> list[WorkLog]:
+    """
+    load WorkLogs from a yaml file, see `iter_worklogs_from_yaml`
+
+    :param filepath:
+    :return:
+    """
+    return list(iter_worklogs_from_yaml(filepath))
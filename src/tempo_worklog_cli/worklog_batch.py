@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable, Iterable, Sequence
+from datetime import date, time
+from functools import lru_cache
+from typing import Any, Literal
+
+from tempo_worklog_cli.constants import (
+    DESCRIPTION,
+    ID,
+    ISSUE,
+    START_DATE,
+    START_TIME,
+    TEMPO_WORKLOG_ID,
+    TIME_SPENT_SECONDS,
+)
+from tempo_worklog_cli.time_span import SECONDS_PER_DAY, TimeSpan
+from tempo_worklog_cli.work_log import WorkLog
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, columns fall back to `array.array`
+    np = None
+
+GroupKey = Literal["date", "week", "issue"]
+
+NO_ID = -1  # placeholder for worklogs without worklog id
+
+
+@lru_cache(maxsize=4096)
+def _day_seconds(date_str: str) -> int:
+    return (date.fromisoformat(date_str).toordinal() - 1) * SECONDS_PER_DAY
+
+
+@lru_cache(maxsize=4096)
+def _time_seconds(time_str: str) -> int:
+    t = time.fromisoformat(time_str)
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+def _int_column(values: Iterable[int], typecode: str = "q"):
+    if np is not None:
+        return np.fromiter(values, dtype=np.int64 if typecode == "q" else np.int32)
+    return array(typecode, values)
+
+
+class WorkLogBatch:
+    """
+    column-oriented collection of worklogs for analysing large histories.
+
+    Start and duration are stored in seconds (see `time_span.to_seconds`), issues as integer codes
+    into `issues`. Columns are numpy arrays if numpy is installed, and `array.array`s otherwise,
+    in which case the vectorized operations fall back to plain loops.
+
+    Masks are sequences of booleans with one entry per worklog, as returned e.g. by
+    `overlap_mask`, and can be passed to `filter`.
+    """
+
+    __slots__ = ("starts", "durations", "issue_codes", "issues", "descriptions", "worklog_ids")
+
+    def __init__(
+        self,
+        starts: Sequence[int],
+        durations: Sequence[int],
+        issue_codes: Sequence[int],
+        issues: list[str],
+        descriptions: list[str],
+        worklog_ids: Sequence[int],
+    ) -> None:
+        if not (
+            len(starts) == len(durations) == len(issue_codes) == len(descriptions)
+            and len(starts) == len(worklog_ids)
+        ):
+            raise ValueError("all columns must have the same length")
+        self.starts = starts
+        self.durations = durations
+        self.issue_codes = issue_codes
+        self.issues: list[str] = issues
+        self.descriptions: list[str] = descriptions
+        self.worklog_ids = worklog_ids
+
+    @classmethod
+    def from_worklogs(cls, worklogs: Iterable[WorkLog]) -> WorkLogBatch:
+        worklogs = list(worklogs)
+        issue_to_code: dict[str, int] = {}
+        return cls(
+            starts=_int_column(log.time_span.start_seconds for log in worklogs),
+            durations=_int_column(log.time_span.duration_seconds for log in worklogs),
+            issue_codes=_int_column(
+                (issue_to_code.setdefault(log.issue, len(issue_to_code)) for log in worklogs),
+                "i",
+            ),
+            issues=list(issue_to_code),
+            descriptions=[log.description for log in worklogs],
+            worklog_ids=_int_column(
+                NO_ID if log.worklog_id is None else log.worklog_id for log in worklogs
+            ),
+        )
+
+    @classmethod
+    def from_tempo_dicts(
+        cls,
+        log_dicts: Iterable[dict[str, Any]],
+        issue_key: Callable[[str], str] | None = None,
+    ) -> WorkLogBatch:
+        """
+        create from TEMPO API dict representations without building WorkLogs.
+
+        :param log_dicts:
+        :param issue_key: maps issue ids to issue keys (e.g. `IssueCache.issue_key`), it is only
+                          called once per distinct issue. If None, issues are kept as ids.
+        :return:
+        """
+        log_dicts = list(log_dicts)
+        issue_to_code: dict[str, int] = {}
+        batch = cls(
+            starts=_int_column(
+                _day_seconds(log[START_DATE]) + _time_seconds(log[START_TIME]) for log in log_dicts
+            ),
+            durations=_int_column(log[TIME_SPENT_SECONDS] for log in log_dicts),
+            issue_codes=_int_column(
+                (
+                    issue_to_code.setdefault(str(log[ISSUE][ID]), len(issue_to_code))
+                    for log in log_dicts
+                ),
+                "i",
+            ),
+            issues=list(issue_to_code),
+            descriptions=[log[DESCRIPTION] for log in log_dicts],
+            worklog_ids=_int_column(log.get(TEMPO_WORKLOG_ID) or NO_ID for log in log_dicts),
+        )
+        if issue_key is not None:
+            batch.issues = [issue_key(issue) for issue in batch.issues]
+        return batch
+
+    def to_worklogs(self) -> list[WorkLog]:
+        return [
+            WorkLog(
+                issue=self.issues[code],
+                time_span=TimeSpan.from_seconds(start, duration),
+                description=description,
+                worklog_id=None if worklog_id == NO_ID else worklog_id,
+            )
+            for start, duration, code, description, worklog_id in zip(
+                self._as_ints(self.starts),
+                self._as_ints(self.durations),
+                self._as_ints(self.issue_codes),
+                self.descriptions,
+                self._as_ints(self.worklog_ids),
+            )
+        ]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @staticmethod
+    def _as_ints(column) -> Sequence[int]:
+        return column.tolist() if np is not None else column
+
+    @property
+    def ends(self):
+        if np is not None:
+            return self.starts + self.durations
+        return array("q", map(int.__add__, self.starts, self.durations))
+
+    @property
+    def total_duration(self) -> int:
+        """
+        sum of all durations in seconds
+        """
+        if np is not None:
+            return int(self.durations.sum())
+        return sum(self.durations)
+
+    def filter(self, mask: Sequence[bool]) -> WorkLogBatch:
+        """
+        worklogs for which `mask` is True
+        """
+        if np is not None:
+            mask = np.asarray(mask, dtype=bool)
+            indices = np.flatnonzero(mask).tolist()
+            columns = (self.starts[mask], self.durations[mask], self.issue_codes[mask])
+            worklog_ids = self.worklog_ids[mask]
+        else:
+            indices = [i for i, keep in enumerate(mask) if keep]
+            columns = tuple(
+                array(column.typecode, (column[i] for i in indices))
+                for column in (self.starts, self.durations, self.issue_codes)
+            )
+            worklog_ids = array("q", (self.worklog_ids[i] for i in indices))
+        return WorkLogBatch(
+            *columns,
+            issues=self.issues,
+            descriptions=[self.descriptions[i] for i in indices],
+            worklog_ids=worklog_ids,
+        )
+
+    def overlap_mask(self, time_span: TimeSpan) -> Sequence[bool]:
+        """
+        mask of worklogs which overlap with `time_span`
+        """
+        start, end = time_span.start_seconds, time_span.end_seconds
+        if np is not None:
+            return (self.starts < end) & (self.ends > start)
+        return [s < end and e > start for s, e in zip(self.starts, self.ends)]
+
+    def in_time_span(self, time_span: TimeSpan) -> WorkLogBatch:
+        """
+        worklogs which overlap with `time_span`
+        """
+        return self.filter(self.overlap_mask(time_span))
+
+    def issue_mask(self, issue: str) -> Sequence[bool]:
+        """
+        mask of worklogs booked on `issue`
+        """
+        if issue not in self.issues:
+            return [False] * len(self)
+        code = self.issues.index(issue)
+        if np is not None:
+            return self.issue_codes == code
+        return [c == code for c in self.issue_codes]
+
+    def overlapping_mask(self) -> Sequence[bool]:
+        """
+        mask of worklogs which overlap with any other worklog of the batch.
+
+        In order of start times, a worklog overlaps with an earlier one iff it starts before the
+        latest end so far, and with a later one iff it ends after the next start.
+        """
+        n = len(self)
+        if np is not None:
+            order = np.argsort(self.starts, kind="stable")
+            starts, ends = self.starts[order], self.ends[order]
+            sorted_mask = np.zeros(n, dtype=bool)
+            if n > 1:
+                sorted_mask[1:] = starts[1:] < np.maximum.accumulate(ends)[:-1]
+                sorted_mask[:-1] |= ends[:-1] > starts[1:]
+            mask = np.empty(n, dtype=bool)
+            mask[order] = sorted_mask
+            return mask
+
+        order = sorted(range(n), key=self.starts.__getitem__)
+        ends = self.ends
+        mask = [False] * n
+        latest_end = None
+        for i, j in zip(order, order[1:] + [None]):
+            if latest_end is not None and self.starts[i] < latest_end:
+                mask[i] = True
+            if j is not None and ends[i] > self.starts[j]:
+                mask[i] = True
+            latest_end = ends[i] if latest_end is None else max(latest_end, ends[i])
+        return mask
+
+    def durations_by(self, *keys: GroupKey) -> dict[tuple[Any, ...], int]:
+        """
+        total duration in seconds per group of worklogs with the same `keys`, e.g.
+        `durations_by("date", "issue")` maps (date, issue) to the time booked on that issue and
+        day. "week" groups by (ISO year, ISO week). Worklogs count towards their start date.
+        """
+        if not keys:
+            raise ValueError("at least one group key is required")
+
+        days = self.starts // SECONDS_PER_DAY if np is not None else None
+        columns = []
+        for key in keys:
+            if key == "issue":
+                columns.append(self.issue_codes)
+            elif key in ("date", "week"):
+                if days is None:
+                    days = array("q", (start // SECONDS_PER_DAY for start in self.starts))
+                # 0001-01-01 is a monday, so days % 7 is the weekday
+                if key == "date":
+                    columns.append(days)
+                elif np is not None:
+                    columns.append(days - days % 7)
+                else:
+                    columns.append(array("q", (day - day % 7 for day in days)))
+            else:
+                raise ValueError(f"unknown group key '{key}'")
+
+        if np is not None and len(self):
+            groups, inverse = np.unique(np.stack(columns, axis=1), axis=0, return_inverse=True)
+            totals = np.bincount(inverse.reshape(-1), weights=self.durations)
+            codes = (tuple(group) for group in groups.tolist())
+            code_totals = zip(codes, (int(total) for total in totals))
+        else:
+            group_totals: dict[tuple[int, ...], int] = {}
+            for group, duration in zip(zip(*columns), self.durations):
+                group_totals[group] = group_totals.get(group, 0) + duration
+            code_totals = group_totals.items()
+
+        converters = {
+            "issue": self.issues.__getitem__,
+            "date": lambda day: date.fromordinal(day + 1),
+            "week": lambda day: tuple(date.fromordinal(day + 1).isocalendar()[:2]),
+        }
+        return {
+            tuple(converters[key](code) for key, code in zip(keys, group)): total
+            for group, total in sorted(code_totals)
+        }
@@ -2,31 +2,89 @@ from __future__ import annotations
 
 import datetime
 import logging
-import os
 import warnings
-from collections.abc import Collection, Iterable, Iterator
+from collections.abc import Collection, Iterable
 from concurrent.futures import ThreadPoolExecutor
-from dataclasses import replace
-from itertools import chain, product
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any, Callable, TypeVar
-
-from jira import JIRA, Issue
-from tempoapiclient.client_v4 import Tempo
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+from urllib.parse import urlsplit
 
 from tempo_worklog_cli.constants import (
     ACCOUNT_ID,
     HOLIDAYS_ISSUE,
+    ID,
+    ISSUE,
     ISSUE_ID,
+    TEMPO_API_URL,
+    TEMPO_DIR,
     TEMPO_WORKLOG_ID,
 )
-from tempo_worklog_cli.time_span import AFTERNOON, FULL_DAY, MORNING, TimeSpan
-from tempo_worklog_cli.util.io_util import load_yaml
-from tempo_worklog_cli.util.serialization import converter
-from tempo_worklog_cli.work_log import WorkLog, WorkLogSequence, overlapping
+from tempo_worklog_cli.issue_cache import ISSUE_CACHE_PATH, IssueCache
+from tempo_worklog_cli.reconciliation import plan_reconciliation
+from tempo_worklog_cli.time_span import AFTERNOON, FULL_DAY, MORNING, IntervalSet, TimeSpan
+from tempo_worklog_cli.util.persistent_cache import PersistentCache
+from tempo_worklog_cli.util.stats import RunStats
+from tempo_worklog_cli.work_log import (
+    WorkLog,
+    iter_worklogs_from_yaml,
+    overlapping,
+    tempo_time_span,
+)
+from tempo_worklog_cli.worklog_mirror import WORKLOG_MIRROR_PATH, WorkLogMirror
+
+if TYPE_CHECKING:
+    from jira import JIRA, Issue
+    from tempoapiclient.client_v4 import Tempo
+
+    from tempo_worklog_cli.util.cassette import Cassette
+    from tempo_worklog_cli.worklog_batch import WorkLogBatch
 
 T = TypeVar("T")
 
+ACCOUNT_CACHE_PATH = TEMPO_DIR / "accounts.json"
+ACCOUNT_CACHE_TTL = datetime.timedelta(days=365)
+MIRROR_REFRESH_INTERVAL = datetime.timedelta(minutes=1)
+MIRROR_MAX_AGE = datetime.timedelta(days=1)
+MAX_FETCH_GAP = datetime.timedelta(days=3)  # bridges weekends between workdays
+YAML_CHUNK_SIZE = 500
+# requests are I/O bound, so the number of CPUs doesn't matter. Throttling by the servers is
+# handled by the adaptive concurrency limit of the HTTP adapters.
+DEFAULT_NUM_THREADS = 16
+JIRA_API_PATH = "/rest/api/2"
+
+# phases of create_logs in RunStats
+FETCH_PHASE = "fetch existing"
+RECONCILE_PHASE = "reconcile"
+UPDATE_PHASE = "update"
+DELETE_PHASE = "delete"
+CREATE_PHASE = "create"
+
+
+def _date_ranges(
+    dates: Iterable[datetime.date], max_gap: datetime.timedelta = MAX_FETCH_GAP
+) -> list[tuple[datetime.date, datetime.date]]:
+    """
+    collapse `dates` into sorted (first, last) ranges, merging dates that are at most `max_gap`
+    apart
+    """
+    ranges: list[tuple[datetime.date, datetime.date]] = []
+    for date in sorted(set(dates)):
+        if ranges and date - ranges[-1][1] <= max_gap:
+            ranges[-1] = (ranges[-1][0], date)
+        else:
+            ranges.append((date, date))
+    return ranges
+
+
+def _apply_server_info(jira: JIRA, server_info: dict[str, Any]) -> None:
+    """
+    set the server version and deployment type of a client created with `get_server_info=False`
+    the way `JIRA.__init__` would, e.g. `search_issues` picks the Cloud endpoint by them
+    """
+    jira._version = tuple(server_info["versionNumbers"])
+    jira.deploymentType = server_info.get("deploymentType")
+
 
 class WorkLogCreatorError(ValueError):
     pass
@@ -39,18 +97,101 @@ class WorkLogCreator:
         user: str,
         jira_token: str,
         tempo_token: str,
-        num_threads: int = min(os.cpu_count() or 1, 4),
+        num_threads: int = DEFAULT_NUM_THREADS,
+        cache_dir: Path | None = TEMPO_DIR,
+        rate_limit: float | None = None,
+        max_retries: int = 5,
+        mirror: bool = False,
+        mirror_refresh_interval: datetime.timedelta = MIRROR_REFRESH_INTERVAL,
+        tempo_url: str = TEMPO_API_URL,
+        cassette: Cassette | None = None,
     ) -> None:
+        """
+        :param url: Jira URL
+        :param user: Jira user email
+        :param jira_token:
+        :param tempo_token:
+        :param num_threads: number of concurrent requests in batch operations
+        :param cache_dir: directory for persistent caches, None disables persistence
+        :param rate_limit: maximum number of requests per second to each of Jira and Tempo,
+                           None only slows down when throttled by the server
+        :param max_retries: maximum number of retries of throttled or failed requests
+        :param mirror: whether to keep a local SQLite mirror of the user's worklogs, which is
+                       synced incrementally with Tempo
+        :param mirror_refresh_interval: how long worklogs in the mirror are used without
+                                        fetching updates from Tempo
+        :param tempo_url: base URL of the Tempo REST API (v4)
+        :param cassette: if given, all Jira and Tempo exchanges are recorded to it or replayed
+                         from it, with the tokens and the user scrubbed from recordings
+        """
+        # heavy client libraries are imported here rather than at module level, to keep
+        # CLI startup fast for commands that don't need them
+        from jira import JIRA
+        from tempoapiclient.client_v4 import Tempo
+
+        from tempo_worklog_cli.util.http import ThrottledHTTPAdapter, mount_adapter
+        from tempo_worklog_cli.util.throttle import RetryPolicy
+
         self._url: str = url
         self._user: str = user
+        self._num_threads: int = num_threads
+        # created on first use and shared by all batch operations
+        self._executor: ThreadPoolExecutor | None = None
+        self._stats: RunStats = RunStats(
+            base_paths=[urlsplit(url).path.rstrip("/") + JIRA_API_PATH, urlsplit(tempo_url).path]
+        )
 
-        self._jira: JIRA = JIRA(self._url, basic_auth=(self._user, jira_token))
-        self._user_id: str = self._jira.myself()[ACCOUNT_ID]
+        # both clients are used from all worker threads and share one adapter each, which sizes
+        # the connection pool to the number of workers, limits the request rate and retries
+        # throttled requests
+        retry_policy = RetryPolicy(max_retries=max_retries)
+        adapter_kwargs = dict(
+            rate=rate_limit, retry_policy=retry_policy, cassette=cassette, stats=self._stats
+        )
+        if cassette is not None:
+            cassette.add_secrets(jira_token, tempo_token, user)
+        # the server info is only fetched once the adapter is mounted, such that it is retried
+        # and recorded like any other request
+        self._jira: JIRA = JIRA(
+            self._url, basic_auth=(self._user, jira_token), max_retries=0, get_server_info=False
+        )
+        mount_adapter(self._jira._session, ThrottledHTTPAdapter(num_threads, **adapter_kwargs))
+        _apply_server_info(self._jira, self._jira.server_info())
+        self._account_cache: PersistentCache = PersistentCache(
+            None if cache_dir is None else cache_dir / ACCOUNT_CACHE_PATH.name,
+            ttl=ACCOUNT_CACHE_TTL,
+        )
+        self._user_id: str = self._get_account_id()
+        self._issue_cache: IssueCache = IssueCache(
+            self._jira,
+            filepath=None if cache_dir is None else cache_dir / ISSUE_CACHE_PATH.name,
+            stats=self._stats,
+        )
 
-        self._tempo: Tempo = Tempo(auth_token=tempo_token)
-        self._num_threads: int = num_threads
+        self._tempo: Tempo = Tempo(auth_token=tempo_token, base_url=tempo_url)
+        mount_adapter(self._tempo._session, ThrottledHTTPAdapter(num_threads, **adapter_kwargs))
+        self._mirror: WorkLogMirror | None = None
+        if mirror:
+            self._mirror = WorkLogMirror(
+                None
+                if cache_dir is None
+                else cache_dir / f"{WORKLOG_MIRROR_PATH.stem}-{self._user_id}.sqlite"
+            )
+        self._mirror_refresh_interval: datetime.timedelta = mirror_refresh_interval
         self.logger: logging.Logger = logging.getLogger(self.__class__.__name__)
 
+    def _get_account_id(self) -> str:
+        """
+        Jira account id of the user, cached on disk per Jira URL and user
+        """
+        key = f"{self._url}|{self._user}"
+        account_id = self._account_cache.get(key)
+        self._stats.count_cache("accounts", hits=account_id is not None, misses=account_id is None)
+        if account_id is None:
+            account_id = self._jira.myself()[ACCOUNT_ID]
+            self._account_cache.set(key, account_id)
+        return account_id
+
     @property
     def user(self) -> str:
         return self._user
@@ -67,22 +208,142 @@ class WorkLogCreator:
     def jira(self) -> JIRA:
         return self._jira
 
+    @property
+    def issue_cache(self) -> IssueCache:
+        return self._issue_cache
+
+    @property
+    def stats(self) -> RunStats:
+        """
+        requests per endpoint, time per phase of `create_logs` and cache hits since construction
+        """
+        return self._stats
+
     def jira_issue(self, issue: str | int) -> Issue:
         """
         get unique JIRA integer id from issue identifier (
         """
         return self._jira.issue(str(issue))
 
+    def resolve_issues(self, issues: Iterable[str | int]) -> None:
+        """
+        resolve key <-> id mappings of all given issues in bulk, such that subsequent conversions
+        from and to tempo dicts don't need a Jira request per work log.
+
+        :param issues: issue keys or ids
+        :return:
+        """
+        self._issue_cache.resolve(issues)
+
+    @property
+    def mirror(self) -> WorkLogMirror | None:
+        return self._mirror
+
+    def _sync_mirror(self, start_date: datetime.date, end_date: datetime.date) -> None:
+        """
+        bring the mirror up to date for all dates from `start_date` to `end_date` (inclusive).
+
+        Dates that have never been synced or not within MIRROR_MAX_AGE are downloaded in full,
+        such that worklogs deleted elsewhere eventually disappear from the mirror. Otherwise only
+        the worklogs updated since the last sync are fetched, unless it happened within the
+        refresh interval. Sync times are in UTC, like the `updatedFrom` filter of Tempo.
+        """
+        assert self._mirror is not None
+        now = datetime.datetime.now(datetime.timezone.utc)
+        synced_at = self._mirror.synced_at(start_date, end_date)
+        if synced_at is None or now - synced_at > MIRROR_MAX_AGE:
+            self._refresh_mirror(start_date, end_date)
+        elif now - synced_at > self._mirror_refresh_interval:
+            log_dicts = self._tempo.get_worklogs(
+                start_date, end_date, updatedFrom=synced_at, accountId=self._user_id
+            )
+            self._mirror.update(start_date, end_date, log_dicts, synced_at=now)
+
+    def _refresh_mirror(
+        self, start_date: datetime.date, end_date: datetime.date
+    ) -> list[dict[str, Any]]:
+        """
+        download all worklogs from `start_date` to `end_date` (inclusive) into the mirror
+        """
+        assert self._mirror is not None
+        now = datetime.datetime.now(datetime.timezone.utc)
+        log_dicts = self._tempo.get_worklogs(start_date, end_date, accountId=self._user_id)
+        self._mirror.replace(start_date, end_date, log_dicts, synced_at=now)
+        return log_dicts
+
+    def _get_tempo_worklogs(
+        self, start_date: datetime.date, end_date: datetime.date, fresh: bool = False
+    ) -> list[dict[str, Any]]:
+        """
+        tempo dicts of the user's worklogs from `start_date` to `end_date` (inclusive), from the
+        mirror if enabled
+
+        :param start_date:
+        :param end_date:
+        :param fresh: whether to bypass the mirror and download all worklogs of the range. The
+                      incremental sync misses worklogs deleted or moved elsewhere, so writes must
+                      be planned from fresh worklogs.
+        :return:
+        """
+        if self._mirror is None:
+            return self._tempo.get_worklogs(start_date, end_date, accountId=self._user_id)
+        if fresh:
+            return self._refresh_mirror(start_date, end_date)
+
+        self._sync_mirror(start_date, end_date)
+        return self._mirror.get(start_date, end_date)
+
+    def _from_tempo_dicts(
+        self, log_dicts: Iterable[dict[str, Any]], time_span: TimeSpan | None = None
+    ) -> list[WorkLog]:
+        """
+        convert a page of tempo API results to WorkLogs, resolving all issues at once
+
+        :param log_dicts:
+        :param time_span: if given, only worklogs overlapping with it are converted
+        :return:
+        """
+        if time_span is None:
+            log_dicts = list(log_dicts)
+        else:
+            log_dicts = [log for log in log_dicts if tempo_time_span(log) & time_span]
+        self.resolve_issues(log[ISSUE][ID] for log in log_dicts)
+        return [WorkLog.from_tempo_dict(log, self.jira, self._issue_cache) for log in log_dicts]
+
     def get_logs_on_date(self, date: datetime.date) -> list[WorkLog]:
         """
         get all worklogs on a specific date
         :param date:
         :return:
         """
-        worklogs = [
-            WorkLog.from_tempo_dict(log, self.jira) for log in self._tempo.get_worklogs(date, date)
-        ]
-        return worklogs
+        return self.get_logs_in_date_range(date, date)
+
+    def get_logs_in_date_range(
+        self, start_date: datetime.date, end_date: datetime.date
+    ) -> list[WorkLog]:
+        """
+        get all worklogs from `start_date` to `end_date` (inclusive) with a single ranged query
+        :param start_date:
+        :param end_date:
+        :return:
+        """
+        return self._from_tempo_dicts(self._get_tempo_worklogs(start_date, end_date))
+
+    def get_batch_in_date_range(
+        self, start_date: datetime.date, end_date: datetime.date
+    ) -> WorkLogBatch:
+        """
+        get all worklogs from `start_date` to `end_date` (inclusive) as columns, without building
+        a WorkLog per entry
+        :param start_date:
+        :param end_date:
+        :return:
+        """
+        from tempo_worklog_cli.worklog_batch import WorkLogBatch
+
+        log_dicts = self._get_tempo_worklogs(start_date, end_date)
+        self.resolve_issues(log[ISSUE][ID] for log in log_dicts)
+        return WorkLogBatch.from_tempo_dicts(log_dicts, issue_key=self._issue_cache.issue_key)
 
     def get_logs_in_timespan(self, time_span: TimeSpan) -> list[WorkLog]:
         """
@@ -91,14 +352,11 @@ class WorkLogCreator:
         :param time_span:
         :return:
         """
-        # this gets all logs on all DAYS that have an overlap with `time_span`
-        worklogs = [
-            WorkLog.from_tempo_dict(log, self.jira)
-            for log in self._tempo.get_worklogs(time_span.start, time_span.end)
-        ]
-        # filter out logs that actually overlap with time_spane
-        worklogs = [worklog for worklog in worklogs if worklog.time_span & time_span]
-        return worklogs
+        # this gets all logs on all DAYS that have an overlap with `time_span`, of which only
+        # those that actually overlap with `time_span` are converted
+        return self._from_tempo_dicts(
+            self._get_tempo_worklogs(time_span.start.date(), time_span.end.date()), time_span
+        )
 
     def get_overlapping_logs(self, time_span: TimeSpan) -> list[tuple[WorkLog, WorkLog]]:
         """
@@ -118,32 +376,61 @@ class WorkLogCreator:
         :param skip_weekend: whether to create the log if its start or end date fall on a weekend
         :return:
         """
-        if work_log.time_span.start.weekday() > 4 or work_log.time_span.end.weekday() > 4:
+        if work_log.time_span.on_weekend:
             self.logger.warning("%s is on a weekend", work_log.time_span)
             if skip_weekend:
                 return
 
         # self._adapt_existing_logs(work_log)
         new_log = None
-        data = work_log.as_tempo_dict(self.jira)
+        data = work_log.as_tempo_dict(self.jira, self._issue_cache, self._user_id)
         data.pop(TEMPO_WORKLOG_ID, None)  # payload can't contain existing worklog id
         try:
-            new_log = WorkLog.from_tempo_dict(self._tempo.post("worklogs", data=data), self.jira)
+            result = self._tempo.post("worklogs", data=data)
+            if self._mirror is not None:
+                self._mirror.upsert([result])
+            new_log = WorkLog.from_tempo_dict(result, self.jira, self._issue_cache)
             self.logger.info(f"created {new_log}")
         except (Exception, SystemExit) as e:
             self.logger.error(e)
             self.logger.error(f"payload: {data}")
         return new_log
 
-    def _batch_perform_action(self, fun: Callable[[T], Any], data: Iterable[T]) -> Iterator[Any]:
-        with ThreadPoolExecutor(max_workers=self._num_threads) as pool:
-            results = pool.map(fun, data)
-        return results
+    def close(self) -> None:
+        """
+        shut down the worker threads of batch operations, they are restarted on demand, and close
+        the mirror, which can't be used afterwards
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._mirror is not None:
+            self._mirror.close()
+
+    def __enter__(self) -> WorkLogCreator:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def _batch_perform_action(self, fun: Callable[[T], Any], data: Iterable[T]) -> list[Any]:
+        """
+        apply `fun` to all `data` on the worker threads and wait for all results. `fun` must not
+        start batch operations itself, which could wait for workers that are all busy.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._num_threads, thread_name_prefix=self.__class__.__name__
+            )
+        return list(self._executor.map(fun, data))
 
-    def create_logs(self, worklogs: Iterable[WorkLog]) -> list[WorkLog]:
+    def create_logs(self, worklogs: Iterable[WorkLog], sync: bool = False) -> list[WorkLog]:
         """
-        create a batch of worklogs asynchronously
+        create a batch of worklogs concurrently
         :param worklogs:
+        :param sync: if True, existing logs that are identical to any of `worklogs` are kept as
+                     they are instead of being replaced, which makes re-applying the same
+                     worklogs free of writes
         :return:
         """
         worklogs = list(worklogs)
@@ -153,51 +440,35 @@ class WorkLogCreator:
         if overlapping_logs:
             raise WorkLogCreatorError(f"overlapping worklogs: {overlapping_logs}")
 
-        # fetch existing logs on the dates of the passed work logs
-        # and create mapping from existing logs to overlapping passed logs
-        date_to_logs = {}
-        for log in worklogs:
-            for date in log.time_span.dates:
-                date_to_logs.setdefault(date, []).append(log)
-
-        date_to_existing_logs: dict[datetime.date, list[WorkLog]] = dict(
-            zip(date_to_logs, self._batch_perform_action(self.get_logs_on_date, date_to_logs))
-        )
-
-        existing_log_to_new_logs = {}
-        for date, logs in date_to_logs.items():
-            existing_logs = date_to_existing_logs[date]
-            if not existing_logs:
-                continue
-
-            for log, existing_log in product(logs, existing_logs):
-                if log.time_span & existing_log.time_span:
-                    existing_log_to_new_logs.setdefault(existing_log, []).append(log)
-
-        # subtract time spans of new logs from overlapping existing logs and divide into
-        # existing logs to update or to delete, and potentially split existing logs
-        to_update = []
-        to_delete = []
-        for existing_log, new_logs in existing_log_to_new_logs.items():
-            adapted_spans = [existing_log.time_span]
-            for new_log in new_logs:
-                adapted_spans = list(
-                    chain.from_iterable([span - new_log.time_span for span in adapted_spans])
+        # fetch existing logs on the dates of the passed work logs, with one request per range of
+        # (almost) contiguous dates instead of one per date
+        date_ranges = _date_ranges(date for log in worklogs for date in log.time_span.dates)
+
+        with self._stats.phase(FETCH_PHASE):
+            self.resolve_issues(log.issue for log in worklogs)
+            # with a mirror, each range is refreshed on its own, such that sparse dates don't
+            # download everything in between
+            existing_logs = chain.from_iterable(
+                self._batch_perform_action(
+                    lambda date_range: self._from_tempo_dicts(
+                        self._get_tempo_worklogs(*date_range, fresh=True)
+                    ),
+                    date_ranges,
                 )
+            )
 
-            if not adapted_spans:
-                to_delete.append(existing_log)
-                continue
-
-            span_it = iter(adapted_spans)
-            span = next(span_it)
-            to_update.append(replace(existing_log, time_span=span))
-            for span in span_it:
-                worklogs.append(replace(existing_log, time_span=span))
+        # trim, split or delete existing logs that overlap with the new logs
+        with self._stats.phase(RECONCILE_PHASE):
+            plan = plan_reconciliation(worklogs, existing_logs, sync=sync)
 
-        self._batch_perform_action(self.update_log, to_update)
-        self._batch_perform_action(self.delete_log, [log.worklog_id for log in to_delete])
-        return list(self._batch_perform_action(self._force_create_log, worklogs))
+        with self._stats.phase(UPDATE_PHASE):
+            moved = self._batch_perform_action(self.update_log, plan.to_update + plan.to_move)
+            moved = moved[len(plan.to_update) :]
+        with self._stats.phase(DELETE_PHASE):
+            self._batch_perform_action(self.delete_log, plan.to_delete)
+        with self._stats.phase(CREATE_PHASE):
+            created = self._batch_perform_action(self._force_create_log, plan.to_create)
+        return plan.unchanged + moved + created
 
     def update_log(self, work_log: WorkLog) -> WorkLog | None:
         """
@@ -211,31 +482,47 @@ class WorkLogCreator:
         if work_log.worklog_id is None:
             raise ValueError(f"{work_log} has no work log id.")
 
-        data = work_log.as_tempo_dict(self.jira)
+        data = work_log.as_tempo_dict(self.jira, self._issue_cache, self._user_id)
         worklog_id = data.pop(TEMPO_WORKLOG_ID)  # payload can't contain existing worklog id
         data.pop(ISSUE_ID, None)  # payload can't contain issue id (must remain fixed)
 
         updated_log = None
         try:
-            updated_log = WorkLog.from_tempo_dict(
-                self._tempo.put(f"worklogs/{worklog_id}", data=data), self.jira
-            )
+            result = self._tempo.put(f"worklogs/{worklog_id}", data=data)
+            if self._mirror is not None:
+                self._mirror.upsert([result])
+            updated_log = WorkLog.from_tempo_dict(result, self.jira, self._issue_cache)
             self.logger.info(f"updated {updated_log}")
         except (Exception, SystemExit) as e:
             self.logger.error(e)
             self.logger.error(f"payload: {data}")
         return updated_log
 
-    def delete_log(self, work_log_id: int):
+    def delete_log(self, work_log: WorkLog | int):
         """
-        delete a work log by its id
+        delete a work log. If only its id is passed, the work log is fetched first in order to log
+        what has been deleted, which costs an additional request.
 
-        :param work_log_id:
+        :param work_log: work log to delete, or its id
         :return:
         """
+        if isinstance(work_log, WorkLog):
+            if work_log.worklog_id is None:
+                raise ValueError(f"{work_log} has no work log id.")
+            work_log_id = work_log.worklog_id
+        else:
+            work_log_id = work_log
+
         try:
-            log = WorkLog.from_tempo_dict(self._tempo.get(f"worklogs/{work_log_id}"), self.jira)
+            if isinstance(work_log, WorkLog):
+                log = work_log
+            else:
+                log = WorkLog.from_tempo_dict(
+                    self._tempo.get(f"worklogs/{work_log_id}"), self.jira, self._issue_cache
+                )
             self._tempo.delete(f"worklogs/{work_log_id}")
+            if self._mirror is not None:
+                self._mirror.delete([work_log_id])
             self.logger.info(f"deleted {log}")
         except (Exception, SystemExit) as e:
             self.logger.error(e)
@@ -247,12 +534,15 @@ class WorkLogCreator:
         :param time_span:
         :return:
         """
-        worklog_ids = [
-            log.worklog_id
-            for log in self.get_logs_in_timespan(time_span)
+        log_dicts = self._get_tempo_worklogs(
+            time_span.start.date(), time_span.end.date(), fresh=True
+        )
+        worklogs = [
+            log
+            for log in self._from_tempo_dicts(log_dicts, time_span)
             if log.worklog_id is not None
         ]
-        self._batch_perform_action(self.delete_log, worklog_ids)
+        self._batch_perform_action(self.delete_log, worklogs)
 
     def _create_log_collection(
         self,
@@ -349,29 +639,85 @@ class WorkLogCreator:
             descriptions=descriptions,
         )
 
-    def create_logs_from_yaml(self, filepath: Path | str):
+    def fill_gaps(
+        self,
+        start_date: datetime.date,
+        end_date: datetime.date,
+        issue: str,
+        description: str,
+    ) -> list[WorkLog]:
+        """
+        creates entries for all parts of the workdays (see `create_workdays`) from `start_date` to
+        `end_date` that are not covered by existing worklogs yet, in a single batch.
+        Weekend days are skipped.
+
+        :param start_date:
+        :param end_date:
+        :param issue:
+        :param description:
+        :return: list of created WorkLogs
+        """
+        days = (
+            start_date + datetime.timedelta(days=d) for d in range((end_date - start_date).days + 1)
+        )
+        workdays = IntervalSet(
+            time_span.change_date(day)
+            for day in days
+            if day.weekday() < 5
+            for time_span in (MORNING, AFTERNOON)
+        )
+        with self._stats.phase(FETCH_PHASE):
+            # existing logs only matter for their time spans, so their issues aren't resolved
+            covered = IntervalSet(
+                tempo_time_span(log)
+                for log in self._get_tempo_worklogs(start_date, end_date, fresh=True)
+            )
+        worklogs = [
+            WorkLog(issue=issue, time_span=time_span, description=description)
+            for time_span in workdays - covered
+        ]
+        if not worklogs:
+            self.logger.info("no gaps from %s to %s", start_date, end_date)
+            return []
+        # the gaps overlap neither each other nor existing logs, so unlike `create_logs` there is
+        # nothing to reconcile and they are created without fetching the existing logs again
+        self.resolve_issues([issue])
+        with self._stats.phase(CREATE_PHASE):
+            return self._batch_perform_action(self._force_create_log, worklogs)
+
+    def create_logs_from_yaml(
+        self, filepath: Path | str, sync: bool = False, chunk_size: int = YAML_CHUNK_SIZE
+    ):
         """
-        loads logs from a yaml file and creates them.
-        Supported yaml formats:
+        streams logs from a yaml file and creates them in chunks of `chunk_size` logs, such that
+        creation starts before the whole file has been read. Invalid records are logged and
+        skipped.
+        Supported yaml formats (multiple `---` separated documents are supported):
           - dict representation of WorkLogSequence
           - list of dict representation of WorkLog
 
         :param filepath:
+        :param sync: keep existing logs that are identical to logs in the file, see `create_logs`
+        :param chunk_size: maximum number of logs passed to `create_logs` at once
         :return:
+        :raises WorkLogCreatorError: if logs in the file overlap, before the chunk with the later
+                                     log is sent. Earlier chunks have been created by then, use
+                                     `tempo validate` to check a whole file up front.
         """
         filepath = Path(filepath)
         if not filepath.is_file():
             raise FileNotFoundError(f"{filepath} not found")
 
-        data = load_yaml(filepath)
-        try:
-            if isinstance(data, dict):
-                sequence = WorkLogSequence.from_dict(data)
-                worklogs = sequence.worklogs
-            elif isinstance(data, list):
-                worklogs = converter.structure(data, list[WorkLog])
-            else:
-                raise ValueError(f"data format in {filepath} not supported.")
-            self.create_logs(worklogs)
-        except Exception as e:
-            self.logger.exception("log creation failed: %s", e, exc_info=True)
+        worklogs = iter_worklogs_from_yaml(
+            filepath, on_error=lambda e: self.logger.error("skipping %s", e)
+        )
+        # time covered by earlier chunks, `create_logs` rejects overlaps within a chunk
+        covered = IntervalSet()
+        while chunk := list(islice(worklogs, chunk_size)):
+            for log in chunk:
+                if covered.overlaps(log.time_span):
+                    raise WorkLogCreatorError(
+                        f"{log} in {filepath} overlaps with a worklog of an earlier chunk"
+                    )
+            self.create_logs(chunk, sync=sync)
+            covered |= IntervalSet(log.time_span for log in chunk)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from tempo_worklog_cli.constants import START_DATE, TEMPO_DIR, TEMPO_WORKLOG_ID
+
+WORKLOG_MIRROR_PATH = TEMPO_DIR / "worklogs.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS worklogs (
+    worklog_id INTEGER PRIMARY KEY,
+    start_date TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS worklogs_start_date ON worklogs (start_date);
+CREATE TABLE IF NOT EXISTS synced_dates (
+    date TEXT PRIMARY KEY,
+    synced_at TEXT NOT NULL
+);
+"""
+
+
+def _dates(start_date: date, end_date: date) -> list[str]:
+    return [
+        (start_date + timedelta(days=d)).isoformat()
+        for d in range((end_date - start_date).days + 1)
+    ]
+
+
+class WorkLogMirror:
+    """
+    local SQLite mirror of tempo worklog dicts, indexed by date and worklog id.
+
+    Besides the worklogs, the mirror keeps track of when each date was last synced with Tempo, so
+    callers can decide between answering from the mirror, fetching only the worklogs updated
+    since the last sync, or re-downloading a date range. If `filepath` is None, the mirror only
+    lives in memory.
+    """
+
+    def __init__(self, filepath: Path | str | None = WORKLOG_MIRROR_PATH) -> None:
+        if filepath is not None:
+            Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+        self._filepath: Path | None = None if filepath is None else Path(filepath)
+        self._lock: threading.Lock = threading.Lock()
+        self._connection: sqlite3.Connection = sqlite3.connect(
+            ":memory:" if filepath is None else str(filepath), check_same_thread=False
+        )
+        with self._lock, self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    @property
+    def filepath(self) -> Path | None:
+        return self._filepath
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def synced_at(self, start_date: date, end_date: date) -> datetime | None:
+        """
+        time of the oldest sync of any date from `start_date` to `end_date` (inclusive) in UTC,
+        or None if any of these dates has never been synced
+        """
+        dates = _dates(start_date, end_date)
+        with self._lock:
+            count, oldest = self._connection.execute(
+                "SELECT COUNT(*), MIN(synced_at) FROM synced_dates WHERE date BETWEEN ? AND ?",
+                (dates[0], dates[-1]),
+            ).fetchone()
+        if count < len(dates):
+            return None
+        return datetime.fromisoformat(oldest)
+
+    def get(self, start_date: date, end_date: date) -> list[dict[str, Any]]:
+        """
+        all mirrored worklog dicts from `start_date` to `end_date` (inclusive)
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT data FROM worklogs WHERE start_date BETWEEN ? AND ? "
+                "ORDER BY start_date, worklog_id",
+                (start_date.isoformat(), end_date.isoformat()),
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def replace(
+        self,
+        start_date: date,
+        end_date: date,
+        log_dicts: Iterable[dict[str, Any]],
+        synced_at: datetime,
+    ) -> None:
+        """
+        replace all mirrored worklogs from `start_date` to `end_date` (inclusive) by a full
+        download of that range
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM worklogs WHERE start_date BETWEEN ? AND ?",
+                (start_date.isoformat(), end_date.isoformat()),
+            )
+            self._upsert(log_dicts)
+            self._mark_synced(start_date, end_date, synced_at)
+
+    def update(
+        self,
+        start_date: date,
+        end_date: date,
+        log_dicts: Iterable[dict[str, Any]],
+        synced_at: datetime,
+    ) -> None:
+        """
+        store worklogs that were updated since the last sync of `start_date` to `end_date`
+        """
+        with self._lock, self._connection:
+            self._upsert(log_dicts)
+            self._mark_synced(start_date, end_date, synced_at)
+
+    def upsert(self, log_dicts: Iterable[dict[str, Any]]) -> None:
+        """
+        insert or overwrite worklogs, e.g. with the results of creating or updating them
+        """
+        with self._lock, self._connection:
+            self._upsert(log_dicts)
+
+    def delete(self, worklog_ids: Iterable[int]) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM worklogs WHERE worklog_id = ?",
+                [(worklog_id,) for worklog_id in worklog_ids],
+            )
+
+    def _upsert(self, log_dicts: Iterable[dict[str, Any]]) -> None:
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO worklogs (worklog_id, start_date, data) VALUES (?, ?, ?)",
+            [(log[TEMPO_WORKLOG_ID], log[START_DATE], json.dumps(log)) for log in log_dicts],
+        )
+
+    def _mark_synced(self, start_date: date, end_date: date, synced_at: datetime) -> None:
+        # always in UTC, such that MIN(synced_at) can compare the isoformat strings
+        synced_at_utc = synced_at.astimezone(timezone.utc).isoformat()
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO synced_dates (date, synced_at) VALUES (?, ?)",
+            [(day, synced_at_utc) for day in _dates(start_date, end_date)],
+        )
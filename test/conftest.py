@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import jira
+import pytest
+from tempoapiclient import client_v4
+
+from tempo_worklog_cli import worklog_batch
+from tempo_worklog_cli.worklog_creator import WorkLogCreator
+
+from .fakes import FakeJira, FakeTempo
+
+
+@pytest.fixture
+def fake_clients(monkeypatch: pytest.MonkeyPatch):
+    """
+    replace the Jira and Tempo clients by in-memory fakes
+    """
+    monkeypatch.setattr(jira, "JIRA", FakeJira)
+    monkeypatch.setattr(client_v4, "Tempo", FakeTempo)
+
+
+@pytest.fixture(params=["numpy", "array"])
+def batch_backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """
+    run a test with numpy columns in WorkLogBatch and with the `array.array` fallback
+    """
+    np = pytest.importorskip("numpy") if request.param == "numpy" else None
+    monkeypatch.setattr(worklog_batch, "np", np)
+    return request.param
+
+
+@pytest.fixture
+def creator_kwargs(fake_clients, tmp_path: Path) -> dict[str, Any]:
+    """
+    constructor arguments for a WorkLogCreator backed by fake clients
+    """
+    return dict(
+        url="https://example.atlassian.net",
+        user="user@example.com",
+        jira_token="jira-token",
+        tempo_token="tempo-token",
+        cache_dir=tmp_path,
+    )
+
+
+@pytest.fixture
+def creator(creator_kwargs: dict[str, Any]) -> WorkLogCreator:
+    """
+    WorkLogCreator backed by in-memory fakes of the Jira and Tempo clients
+    """
+    return WorkLogCreator(**creator_kwargs)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime
+from types import SimpleNamespace
+from typing import Any
+
+import requests
+
+ACCOUNT_ID = "account-1"
+ISSUES = {"PP-1": 10001, "PP-2": 10002, "PP-7": 10007, "CORE-24": 10024}
+
+
+class FakeJira:
+    """
+    in-memory stand-in for `jira.JIRA` which counts the requests made against it
+    """
+
+    def __init__(self, *args, delay: float = 0.0, **kwargs):
+        """
+        :param delay: seconds each single issue lookup takes
+        """
+        self.calls: Counter[str] = Counter()
+        self.delay: float = delay
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+
+    def _count(self, endpoint: str):
+        with self._lock:
+            self.calls[endpoint] += 1
+
+    def server_info(self) -> dict[str, Any]:
+        self._count("serverInfo")
+        return {"versionNumbers": [1001, 0, 0], "deploymentType": "Cloud"}
+
+    def myself(self) -> dict[str, Any]:
+        self._count("myself")
+        return {"accountId": ACCOUNT_ID}
+
+    def issue(self, id: str, fields: str | None = None):
+        self._count("issue")
+        time.sleep(self.delay)
+        key = next(key for key, issue_id in ISSUES.items() if str(id) in (key, str(issue_id)))
+        return SimpleNamespace(key=key, id=str(ISSUES[key]))
+
+    def search_issues(self, jql_str: str, **kwargs):
+        self._count("search")
+        identifiers = jql_str[jql_str.index("(") + 1 : jql_str.rindex(")")].split(", ")
+        return [
+            SimpleNamespace(key=key, id=str(issue_id))
+            for key, issue_id in ISSUES.items()
+            if key in identifiers or str(issue_id) in identifiers
+        ]
+
+
+class FakeTempo:
+    """
+    in-memory stand-in for `tempoapiclient.client_v4.Tempo` which counts the requests made
+    against it
+    """
+
+    def __init__(self, *args, base_url: str = "https://api.tempo.io/4", **kwargs):
+        self.base_url: str = base_url
+        self.worklogs: dict[int, dict[str, Any]] = {}
+        self.updated: dict[int, datetime] = {}
+        self.calls: Counter[str] = Counter()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+
+    def _count(self, endpoint: str):
+        with self._lock:
+            self.calls[endpoint] += 1
+
+    def add(self, data: dict[str, Any]) -> dict[str, Any]:
+        with self._lock:
+            worklog_id = next(self._ids)
+            log = self._to_result(worklog_id, data)
+            self.worklogs[worklog_id] = log
+            self.updated[worklog_id] = datetime.now()
+        return dict(log)
+
+    @staticmethod
+    def _to_result(worklog_id: int, data: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "tempoWorklogId": worklog_id,
+            "issue": {"id": int(data["issueId"])},
+            "author": {"accountId": data.get("authorAccountId", ACCOUNT_ID)},
+            "startDate": data["startDate"],
+            "startTime": data["startTime"],
+            "timeSpentSeconds": data["timeSpentSeconds"],
+            "description": data["description"],
+        }
+
+    def get_worklogs(
+        self, dateFrom, dateTo, updatedFrom=None, accountId=None, **kwargs
+    ) -> list[dict[str, Any]]:
+        self._count("get_worklogs")
+        date_from = dateFrom.date() if isinstance(dateFrom, datetime) else dateFrom
+        date_to = dateTo.date() if isinstance(dateTo, datetime) else dateTo
+        # like the Tempo API, updatedFrom only has a resolution of days
+        updated_from = updatedFrom.date() if isinstance(updatedFrom, datetime) else updatedFrom
+        return [
+            dict(log)
+            for worklog_id, log in self.worklogs.items()
+            if date_from <= date.fromisoformat(log["startDate"]) <= date_to
+            and accountId in (None, log["author"]["accountId"])
+            and (updated_from is None or self.updated[worklog_id].date() >= updated_from)
+        ]
+
+    def get(self, path: str, **kwargs) -> dict[str, Any]:
+        self._count("get")
+        return dict(self.worklogs[int(path.rsplit("/", 1)[1])])
+
+    def post(self, path: str, data: dict[str, Any], **kwargs) -> dict[str, Any]:
+        self._count("post")
+        return self.add(data)
+
+    def put(self, path: str, data: dict[str, Any], **kwargs) -> dict[str, Any]:
+        self._count("put")
+        worklog_id = int(path.rsplit("/", 1)[1])
+        old = self.worklogs[worklog_id]
+        log = self._to_result(worklog_id, {"issueId": old["issue"]["id"], **data})
+        self.worklogs[worklog_id] = log
+        self.updated[worklog_id] = datetime.now()
+        return dict(log)
+
+    def delete(self, path: str, **kwargs) -> dict[str, Any]:
+        self._count("delete")
+        worklog_id = int(path.rsplit("/", 1)[1])
+        del self.worklogs[worklog_id]
+        del self.updated[worklog_id]
+        return {}
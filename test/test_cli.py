@@ -0,0 +1,117 @@
+import socket
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from tempo_worklog_cli import cli as cli_module
+from tempo_worklog_cli.cli import cli
+from tempo_worklog_cli.time_span import TimeSpan
+from tempo_worklog_cli.util.io_util import save_yaml
+from tempo_worklog_cli.util.serialization import converter
+from tempo_worklog_cli.work_log import WorkLog
+from tempo_worklog_cli.worklog_creator import WorkLogCreator
+
+
+@pytest.fixture
+def offline(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    """
+    fail on any attempt to open a network connection or to construct a WorkLogCreator
+    """
+
+    def connect(*args, **kwargs):
+        raise AssertionError("socket opened")
+
+    def creator(*args, **kwargs):
+        raise AssertionError("WorkLogCreator constructed")
+
+    monkeypatch.setattr(socket.socket, "connect", connect)
+    monkeypatch.setattr(socket, "create_connection", connect)
+    monkeypatch.setattr(cli_module, "WorkLogCreator", creator)
+    monkeypatch.setattr(cli_module, "DOTENV_PATH", tmp_path / ".env")
+    for name in ("URL", "USER_EMAIL", "JIRA_TOKEN", "TEMPO_TOKEN"):
+        monkeypatch.delenv(name, raising=False)
+
+
+@pytest.mark.parametrize(
+    "args, exit_code",
+    [
+        (["--help"], 0),
+        (["get", "--help"], 0),
+        (["report", "--help"], 0),
+        (["report", "today", "today", "--format", "xml"], 2),  # invalid format
+        (["create", "--help"], 0),
+        (["create", "workdays", "--help"], 0),
+        (["create", "fill-gaps", "--help"], 0),
+        (["create", "fill-gaps", "today", "today", "PP-1"], 2),  # missing description
+        (["-c", "32", "create", "--help"], 0),
+        (["-c", "0", "get", "today", "today"], 2),  # invalid concurrency
+        (["get", "today"], 2),  # missing argument
+        (["create", "entry", "2024-01-01T09:00:00"], 2),  # missing arguments
+        (["create", "workdays", "today", "today", "PP-1"], 0),  # no descriptions: no-op
+        (["--record", "a.json", "--replay", "b.json", "get", "today", "today"], 2),
+        (["--stats", "create", "workdays", "today", "today", "PP-1"], 0),  # no creator, no stats
+    ],
+)
+def test_no_network_on_startup(offline, args: list[str], exit_code: int):
+    result = CliRunner().invoke(cli, args)
+    assert result.exit_code == exit_code, result.output
+
+
+def test_validate(offline, tmp_path: Path):
+    worklogs = [
+        WorkLog("PP-1", TimeSpan(datetime(2024, 1, 1, 9), timedelta(hours=2)), "first"),
+        WorkLog("PP-2", TimeSpan(datetime(2024, 1, 1, 11), timedelta(hours=2)), "second"),
+    ]
+    filepath = tmp_path / "worklogs.yaml"
+    save_yaml(converter.unstructure(worklogs), filepath)
+    result = CliRunner().invoke(cli, ["validate", str(filepath)])
+    assert result.exit_code == 0, result.output
+    assert "2 valid worklogs" in result.output
+
+    save_yaml(converter.unstructure(worklogs + worklogs[:1]), filepath)
+    result = CliRunner().invoke(cli, ["validate", str(filepath)])
+    assert result.exit_code == 1
+    assert "overlapping" in result.output
+
+
+def test_missing_credentials(offline):
+    result = CliRunner().invoke(cli, ["get", "today", "today"])
+    assert result.exit_code == 1
+    assert "missing environment variables" in result.output
+
+
+def test_heavy_imports_are_deferred():
+    code = (
+        "import sys, tempo_worklog_cli.cli; "
+        "print(*[m for m in ('jira', 'requests', 'tempoapiclient', 'ruamel.yaml') "
+        "if m in sys.modules])"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+def test_from_yaml_overlap_fails(fake_clients, monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    def creator(**kwargs):
+        return WorkLogCreator(**kwargs, cache_dir=tmp_path)
+
+    monkeypatch.setattr(cli_module, "WorkLogCreator", creator)
+    monkeypatch.setattr(cli_module, "DOTENV_PATH", tmp_path / ".env")
+    for name, value in [
+        ("URL", "https://example.atlassian.net"),
+        ("USER_EMAIL", "user@example.com"),
+        ("JIRA_TOKEN", "jira-token"),
+        ("TEMPO_TOKEN", "tempo-token"),
+    ]:
+        monkeypatch.setenv(name, value)
+    log = WorkLog("PP-1", TimeSpan(datetime(2024, 1, 1, 9), timedelta(hours=2)), "first")
+    filepath = tmp_path / "worklogs.yaml"
+    save_yaml(converter.unstructure([log, log]), filepath)
+
+    result = CliRunner().invoke(cli, ["create", "from-yaml", str(filepath)])
+    assert result.exit_code == 1
+    assert "overlapping worklogs" in result.output
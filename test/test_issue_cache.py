@@ -0,0 +1,58 @@
+import threading
+from pathlib import Path
+
+from tempo_worklog_cli.issue_cache import IssueCache
+
+from .fakes import FakeJira
+
+
+def test_bidirectional_lookup():
+    jira = FakeJira()
+    cache = IssueCache(jira, filepath=None)
+    assert cache.issue_id("PP-1") == "10001"
+    # reverse direction is served from the same entry
+    assert cache.issue_key(10001) == "PP-1"
+    assert cache.issue_key("10024") == "CORE-24"
+    assert cache.issue_id("CORE-24") == "10024"
+    assert jira.calls == {"issue": 2}
+
+
+def test_persistence(tmp_path: Path):
+    filepath = tmp_path / "issue_cache.json"
+    jira = FakeJira()
+    IssueCache(jira, filepath=filepath).issue_id("PP-1")
+    assert filepath.is_file()
+
+    assert IssueCache(jira, filepath=filepath).issue_key(10001) == "PP-1"
+    assert jira.calls == {"issue": 1}
+
+
+def test_concurrent_lookups_are_coalesced():
+    jira = FakeJira(delay=0.1)
+    cache = IssueCache(jira, filepath=None)
+    results = []
+
+    def lookup():
+        results.append(cache.issue_id("PP-1"))
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["10001"] * 8
+    assert jira.calls == {"issue": 1}
+
+
+def test_bulk_resolve():
+    jira = FakeJira()
+    cache = IssueCache(jira, filepath=None)
+    cache.resolve(["PP-1", 10024, "PP-1"])
+    assert jira.calls == {"search": 1}
+
+    assert cache.issue_key(10001) == "PP-1"
+    assert cache.issue_id("CORE-24") == "10024"
+    # nothing left to resolve
+    cache.resolve(["10001", "CORE-24"])
+    assert jira.calls == {"search": 1}
@@ -0,0 +1,182 @@
+import random
+from collections import Counter
+from dataclasses import replace
+from datetime import datetime, timedelta
+from itertools import chain, product
+
+import pytest
+
+from tempo_worklog_cli.reconciliation import ReconciliationPlan, plan_reconciliation
+from tempo_worklog_cli.time_span import TimeSpan
+from tempo_worklog_cli.work_log import WorkLog
+
+DAY = datetime(2024, 3, 4)
+
+
+def reference_plan(new_logs: list[WorkLog], existing_logs: list[WorkLog]) -> ReconciliationPlan:
+    """
+    pairwise subtraction of the new from all overlapping existing logs
+    """
+    existing_log_to_new_logs = {}
+    for log, existing_log in product(new_logs, existing_logs):
+        if log.time_span & existing_log.time_span:
+            existing_log_to_new_logs.setdefault(existing_log, []).append(log)
+
+    plan = ReconciliationPlan(to_create=list(new_logs))
+    for existing_log, logs in existing_log_to_new_logs.items():
+        spans = [existing_log.time_span]
+        for log in logs:
+            spans = list(chain.from_iterable(span - log.time_span for span in spans))
+        if not spans:
+            plan.to_delete.append(existing_log)
+            continue
+        plan.to_update.append(replace(existing_log, time_span=spans[0]))
+        plan.to_create.extend(replace(existing_log, time_span=span) for span in spans[1:])
+    return plan
+
+
+def random_logs(rng: random.Random, n: int, days: int, id_offset: int | None) -> list[WorkLog]:
+    logs = []
+    for i in range(n):
+        start = DAY + timedelta(days=rng.randrange(days), minutes=15 * rng.randrange(96))
+        duration = timedelta(minutes=15 * rng.randint(1, 16))
+        worklog_id = None if id_offset is None else id_offset + i
+        logs.append(WorkLog(f"PP-{rng.randint(1, 3)}", TimeSpan(start, duration), "", worklog_id))
+    return logs
+
+
+def non_overlapping(logs: list[WorkLog]) -> list[WorkLog]:
+    result = []
+    for log in logs:
+        if not any(log.time_span & other.time_span for other in result):
+            result.append(log)
+    return result
+
+
+def apply(plan: ReconciliationPlan, existing_logs: list[WorkLog]) -> list[WorkLog]:
+    """
+    worklogs after executing `plan` against `existing_logs`
+    """
+    changed = {log.worklog_id for log in plan.to_update + plan.to_delete + plan.to_move}
+    logs = [log for log in dict.fromkeys(existing_logs) if log.worklog_id not in changed]
+    return [
+        *logs,
+        *plan.to_update,
+        *plan.to_move,
+        *(replace(log, worklog_id=3000 + i) for i, log in enumerate(plan.to_create)),
+    ]
+
+
+def contents(logs: list[WorkLog]) -> Counter:
+    return Counter((log.issue, log.time_span, log.description) for log in logs)
+
+
+def writes(plan: ReconciliationPlan) -> int:
+    return len(plan.to_update) + len(plan.to_delete) + len(plan.to_create) + len(plan.to_move)
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_plan_reconciliation_matches_reference(seed: int):
+    rng = random.Random(seed)
+    days = rng.randint(1, 3)
+    new_logs = non_overlapping(random_logs(rng, rng.randint(0, 12), days, id_offset=None))
+    existing_logs = random_logs(rng, rng.randint(0, 12), days, id_offset=1000)
+
+    plan = plan_reconciliation(new_logs, existing_logs)
+    expected = reference_plan(new_logs, existing_logs)
+    result = apply(plan, existing_logs)
+    assert contents(result) == contents(apply(expected, existing_logs))
+    assert Counter(plan.to_update) == Counter(expected.to_update)
+    # every deleted log of the same issue as a log to create saves one request
+    assert writes(plan) == writes(expected) - len(plan.to_move)
+    assert not {log.issue for log in plan.to_delete} & {log.issue for log in plan.to_create}
+
+    # the remaining existing logs never overlap with any new log
+    assert contents(new_logs) <= contents(result)
+    for log, new_log in product(result, new_logs):
+        if log.time_span & new_log.time_span:
+            assert (log.issue, log.time_span, log.description) == (
+                new_log.issue,
+                new_log.time_span,
+                new_log.description,
+            )
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_plan_reconciliation_sync(seed: int):
+    rng = random.Random(seed)
+    new_logs = non_overlapping(random_logs(rng, rng.randint(0, 12), 2, id_offset=None))
+    existing_logs = random_logs(rng, rng.randint(0, 12), 2, id_offset=1000)
+    # some of the new logs already exist
+    existing_logs += [
+        replace(log, worklog_id=2000 + i) for i, log in enumerate(new_logs) if rng.random() < 0.5
+    ]
+
+    plan = plan_reconciliation(new_logs, existing_logs, sync=True)
+    assert contents(new_logs) <= contents(apply(plan, existing_logs))
+    assert contents(plan.unchanged) <= contents(new_logs)
+    assert not set(plan.unchanged) & set(plan.to_update + plan.to_delete)
+    assert writes(plan) <= writes(plan_reconciliation(new_logs, existing_logs))
+
+    # applying the same logs again doesn't change anything
+    replan = plan_reconciliation(new_logs, apply(plan, existing_logs), sync=True)
+    assert writes(replan) == 0
+    assert len(replan.unchanged) == len(new_logs)
+
+
+def test_plan_reconciliation_ignores_duplicates():
+    existing = WorkLog("PP-1", TimeSpan(DAY.replace(hour=8), timedelta(hours=4)), "", 1)
+    new = WorkLog("PP-2", TimeSpan(DAY.replace(hour=9), timedelta(hours=1)), "")
+
+    plan = plan_reconciliation([new], [existing, existing])
+    assert plan.to_update == [
+        replace(existing, time_span=TimeSpan(DAY.replace(hour=8), timedelta(hours=1)))
+    ]
+    assert plan.to_create == [
+        new,
+        replace(existing, time_span=TimeSpan(DAY.replace(hour=10), timedelta(hours=2))),
+    ]
+    assert plan.to_delete == []
+
+
+def test_plan_reconciliation_adjacent():
+    existing = WorkLog("PP-1", TimeSpan(DAY.replace(hour=8), timedelta(hours=1)), "", 1)
+    new = WorkLog("PP-2", TimeSpan(DAY.replace(hour=9), timedelta(hours=1)), "")
+
+    assert plan_reconciliation([new], [existing]) == ReconciliationPlan(to_create=[new])
+
+
+def test_plan_reconciliation_moves_deleted_logs():
+    existing = [
+        WorkLog("PP-1", TimeSpan(DAY.replace(hour=8), timedelta(hours=1)), "a", 1),
+        WorkLog("PP-2", TimeSpan(DAY.replace(hour=9), timedelta(hours=1)), "b", 2),
+    ]
+    new = [
+        WorkLog("PP-2", TimeSpan(DAY.replace(hour=8), timedelta(hours=2)), "c"),
+        WorkLog("PP-1", TimeSpan(DAY.replace(hour=10), timedelta(hours=1)), "d"),
+    ]
+
+    plan = plan_reconciliation(new, existing)
+    assert plan.to_move == [replace(new[0], worklog_id=2), replace(new[1], worklog_id=1)]
+    assert plan.to_update == plan.to_delete == plan.to_create == []
+
+
+def test_plan_reconciliation_does_not_move_logs_onto_weekends():
+    saturday = DAY - timedelta(days=2)
+    existing = WorkLog("PP-1", TimeSpan(DAY.replace(hour=9), timedelta(hours=1)), "a", 1)
+    new = [
+        WorkLog("PP-1", TimeSpan(saturday.replace(hour=9), timedelta(hours=1)), "weekend"),
+        WorkLog("PP-2", TimeSpan(DAY.replace(hour=8), timedelta(hours=3)), "b"),
+    ]
+
+    plan = plan_reconciliation(new, [existing])
+    assert plan.to_move == []
+    assert plan.to_delete == [existing]
+    assert plan.to_create == new
+
+
+def test_plan_reconciliation_ignores_empty_logs():
+    existing = WorkLog("PP-1", TimeSpan(DAY.replace(hour=9), timedelta(hours=2)), "", 1)
+    empty = WorkLog("PP-2", TimeSpan(DAY.replace(hour=10), timedelta(0)), "")
+
+    assert plan_reconciliation([empty], [existing]) == ReconciliationPlan(to_create=[empty])
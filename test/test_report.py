@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from tempo_worklog_cli.report import ReportRow, build_report, format_report
+from tempo_worklog_cli.time_span import TimeSpan
+from tempo_worklog_cli.work_log import WorkLog
+from tempo_worklog_cli.worklog_batch import WorkLogBatch
+
+START, END = date(2024, 3, 8), date(2024, 3, 12)  # FRI to TUE
+
+
+@pytest.fixture
+def batch(batch_backend: str) -> WorkLogBatch:
+    return WorkLogBatch.from_worklogs(
+        [
+            WorkLog("PP-1", TimeSpan(datetime(2024, 3, 8, 9), timedelta(hours=4)), ""),
+            WorkLog("PP-2", TimeSpan(datetime(2024, 3, 8, 14), timedelta(hours=3.7)), ""),
+            WorkLog("PP-1", TimeSpan(datetime(2024, 3, 9, 10), timedelta(hours=1)), ""),
+            WorkLog("PP-2", TimeSpan(datetime(2024, 3, 11, 9), timedelta(hours=8)), ""),
+        ]
+    )
+
+
+def test_report_by_day(batch: WorkLogBatch):
+    rows = build_report(batch, START, END, by="day")
+    assert rows == [
+        ReportRow("2024-03-08", 7.7, 7.7),
+        ReportRow("2024-03-09", 1.0, 0.0),  # weekend
+        ReportRow("2024-03-11", 8.0, 7.7),
+        ReportRow("2024-03-12", 0.0, 7.7),  # nothing booked
+    ]
+    assert [row.deviation for row in rows] == [0.0, 1.0, 0.3, -7.7]
+
+
+def test_report_by_week_and_issue(batch: WorkLogBatch):
+    assert build_report(batch, START, END, by="week") == [
+        ReportRow("2024-W10", 8.7, 7.7),
+        ReportRow("2024-W11", 8.0, 15.4),
+    ]
+    assert build_report(batch, START, END, by="issue") == [
+        ReportRow("PP-2", 11.7),
+        ReportRow("PP-1", 5.0),
+    ]
+    with pytest.raises(ValueError):
+        build_report(batch, START, END, by="month")
+
+
+def test_format_report(batch: WorkLogBatch):
+    rows = build_report(batch, START, END, by="day")
+
+    table = format_report(rows, by="day", fmt="table").splitlines()
+    assert table[0].split() == ["day", "hours", "expected_hours", "deviation"]
+    assert table[1].split() == ["2024-03-08", "7.70", "7.70", "+0.00"]
+    assert table[4].split() == ["2024-03-12", "0.00", "7.70", "-7.70", "!"]
+    assert table[-1].split() == ["total", "16.70"]
+
+    records = json.loads(format_report(rows, by="day", fmt="json"))
+    assert records[2] == {
+        "day": "2024-03-11",
+        "hours": 8.0,
+        "expected_hours": 7.7,
+        "deviation": 0.3,
+    }
+
+    issue_rows = build_report(batch, START, END, by="issue")
+    records = list(csv.DictReader(io.StringIO(format_report(issue_rows, by="issue", fmt="csv"))))
+    assert records == [{"issue": "PP-2", "hours": "11.7"}, {"issue": "PP-1", "hours": "5.0"}]
+    assert format_report([], by="issue", fmt="csv") == "issue,hours\n"
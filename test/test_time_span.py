@@ -1,10 +1,11 @@
-from datetime import date
-from datetime import datetime, timedelta
+import pickle
+import random
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
 import pytest
 
-from tempo_worklog_cli.time_span import TimeSpan
+from tempo_worklog_cli.time_span import AFTERNOON, FULL_DAY, MORNING, IntervalSet, TimeSpan
 
 
 @pytest.mark.parametrize(
@@ -162,3 +163,103 @@ def test_serialization(time_span: TimeSpan, tmp_path: Path):
 def test_change_date(time_span: TimeSpan, new_date: date, expected: TimeSpan):
     actual = time_span.change_date(new_date)
     assert actual == expected
+
+
+def test_integer_representation():
+    time_span = TimeSpan(
+        start=datetime(2024, 3, 4, 9, 30, 15, 999), duration=timedelta(hours=1, microseconds=5)
+    )
+    assert time_span.start == datetime(2024, 3, 4, 9, 30, 15)
+    assert time_span.duration == timedelta(hours=1)
+    assert time_span.end_seconds - time_span.start_seconds == time_span.duration_seconds == 3600
+    assert TimeSpan.from_seconds(time_span.start_seconds, 3600) == time_span
+    assert time_span.dates == [date(2024, 3, 4)]
+    assert repr(time_span) == (
+        "TimeSpan(start=datetime.datetime(2024, 3, 4, 9, 30, 15), "
+        "duration=datetime.timedelta(seconds=3600))"
+    )
+
+
+def test_immutable_and_hashable():
+    time_span = TimeSpan(start=datetime(2024, 3, 4, 9), duration=timedelta(hours=1))
+    with pytest.raises(AttributeError):
+        time_span.start = datetime(2024, 3, 4, 10)
+    with pytest.raises(AttributeError):
+        time_span.__dict__
+    for name in ("_start", "_duration", "_hash"):
+        with pytest.raises(AttributeError):
+            setattr(time_span, name, 0)
+        with pytest.raises(AttributeError):
+            delattr(time_span, name)
+    assert time_span.end == datetime(2024, 3, 4, 10)
+
+    same = TimeSpan.from_start_and_end(datetime(2024, 3, 4, 9), datetime(2024, 3, 4, 10))
+    assert hash(time_span) == hash(same)
+    assert len({time_span, same}) == 1
+    assert pickle.loads(pickle.dumps(time_span)) == time_span
+
+
+def random_spans(rng: random.Random, n: int) -> list[TimeSpan]:
+    return [
+        TimeSpan(
+            datetime(2000, 1, 1) + timedelta(minutes=rng.randrange(200)),
+            timedelta(minutes=rng.randint(1, 30)),
+        )
+        for _ in range(n)
+    ]
+
+
+def minutes(spans) -> set[datetime]:
+    return {
+        span.start + timedelta(minutes=m)
+        for span in spans
+        for m in range(span.duration_seconds // 60)
+    }
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_interval_set(seed: int):
+    rng = random.Random(seed)
+    spans1, spans2 = random_spans(rng, rng.randint(0, 10)), random_spans(rng, rng.randint(0, 10))
+    set1, set2 = IntervalSet(spans1), IntervalSet(spans2)
+
+    # normalised: sorted, disjoint and not adjacent
+    for span, next_span in zip(set1, list(set1)[1:]):
+        assert span.end < next_span.start
+    assert minutes(set1) == minutes(spans1)
+    assert set1.duration == timedelta(minutes=len(minutes(spans1)))
+    assert IntervalSet(reversed(spans1)) == set1
+
+    assert minutes(set1 | set2) == minutes(spans1) | minutes(spans2)
+    assert minutes(set1 & set2) == minutes(spans1) & minutes(spans2)
+    assert minutes(set1 - set2) == minutes(spans1) - minutes(spans2)
+    assert set1 | set2 == IntervalSet(spans1 + spans2)
+    for span in spans2:
+        assert set1.overlaps(span) == bool(minutes([span]) & minutes(spans1))
+
+
+def test_interval_set_gaps():
+    day = IntervalSet([MORNING, AFTERNOON])
+    logged = IntervalSet(
+        [
+            TimeSpan(datetime(1, 1, 1, 9), timedelta(hours=1)),
+            TimeSpan(datetime(1, 1, 1, 12), timedelta(hours=3)),
+        ]
+    )
+    assert list(day - logged) == [
+        TimeSpan(datetime(1, 1, 1, 10), timedelta(hours=2)),
+        TimeSpan(datetime(1, 1, 1, 15), AFTERNOON.end - datetime(1, 1, 1, 15)),
+    ]
+    assert (day - logged) | (day & logged) == day
+    assert logged.bounds == [(span.start_seconds, span.end_seconds) for span in logged]
+    assert not day - IntervalSet([FULL_DAY, AFTERNOON])
+
+
+def test_interval_set_drops_empty_spans():
+    empty = TimeSpan(datetime(1, 1, 1, 11), timedelta(0))
+    assert len(IntervalSet([empty])) == 0
+    day = IntervalSet([MORNING, AFTERNOON])
+    assert IntervalSet([MORNING, empty, AFTERNOON]) == day
+    assert not IntervalSet([empty]).overlaps(MORNING)
+    assert not day.overlaps(empty)  # even though 11:00 is in the morning
+    assert day - IntervalSet([empty]) == day
@@ -1,10 +1,20 @@
+import random
 from datetime import datetime, timedelta
+from itertools import combinations
 from pathlib import Path
 
 import pytest
 
 from tempo_worklog_cli.time_span import TimeSpan
-from tempo_worklog_cli.work_log import WorkLog, WorkLogSequence
+from tempo_worklog_cli.util.io_util import get_yaml
+from tempo_worklog_cli.util.serialization import converter
+from tempo_worklog_cli.work_log import (
+    WorkLog,
+    WorkLogSequence,
+    iter_worklogs_from_yaml,
+    load_worklogs_from_yaml,
+    overlapping,
+)
 
 
 @pytest.mark.parametrize(
@@ -69,3 +79,71 @@ def test_work_log_sequence_serialization(sequence: WorkLogSequence, tmp_path: Pa
     sequence.to_yaml(filepath)
     sequence2 = WorkLogSequence.from_yaml(filepath)
     assert sequence2 == sequence
+
+
+def random_worklogs(n: int, seed: int) -> list[WorkLog]:
+    rng = random.Random(seed)
+    return [
+        WorkLog(
+            "PP-1",
+            TimeSpan(
+                datetime(2024, 1, 1) + timedelta(minutes=15 * rng.randrange(100)),
+                timedelta(minutes=15 * rng.randrange(1, 8)),
+            ),
+            f"log {i}",
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("n, seed", [(0, 0), (1, 0), (10, 1), (50, 2), (200, 3)])
+def test_overlapping(n: int, seed: int):
+    worklogs = random_worklogs(n, seed)
+    expected = [
+        (log1, log2) for log1, log2 in combinations(worklogs, 2) if log1.time_span & log2.time_span
+    ]
+    assert overlapping(worklogs) == expected
+
+
+def test_overlapping_adjacent():
+    first = WorkLog("PP-1", TimeSpan(datetime(2024, 1, 1, 9), timedelta(hours=1)), "first")
+    second = WorkLog("PP-1", TimeSpan(datetime(2024, 1, 1, 10), timedelta(hours=1)), "second")
+    assert overlapping([second, first]) == []
+
+
+def test_overlapping_empty():
+    log = WorkLog("PP-1", TimeSpan(datetime(2024, 1, 1, 9), timedelta(hours=2)), "log")
+    empty = WorkLog("PP-1", TimeSpan(datetime(2024, 1, 1, 10), timedelta(0)), "empty")
+    assert log.time_span & empty.time_span is None
+    assert overlapping([log, empty]) == []
+    assert overlapping([empty, empty, log]) == []
+
+
+def test_iter_worklogs_from_yaml(tmp_path: Path):
+    worklogs = random_worklogs(6, 0)
+    sequence = WorkLogSequence.from_worklogs(worklogs[4:])
+    invalid = {"issue": "PP-1", "time_span": "not a time span", "description": ""}
+    filepath = tmp_path / "worklogs.yaml"
+    with filepath.open("w") as file:
+        get_yaml().dump_all(
+            [
+                converter.unstructure(worklogs[:2]),
+                None,
+                [*converter.unstructure(worklogs[2:4]), invalid],
+                sequence.to_dict(),
+            ],
+            file,
+        )
+
+    with pytest.raises(ValueError, match="invalid worklog 2 in document 2"):
+        load_worklogs_from_yaml(filepath)
+
+    errors = []
+    assert list(iter_worklogs_from_yaml(filepath, on_error=errors.append)) == worklogs
+    assert len(errors) == 1
+
+
+def test_worklog_is_slotted():
+    worklog = random_worklogs(1, 0)[0]
+    assert not hasattr(worklog, "__dict__")
+    assert not hasattr(worklog.time_span, "__dict__")
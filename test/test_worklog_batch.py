@@ -0,0 +1,117 @@
+import random
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from tempo_worklog_cli.time_span import TimeSpan
+from tempo_worklog_cli.work_log import WorkLog, overlapping
+from tempo_worklog_cli.worklog_batch import WorkLogBatch
+
+from .fakes import ISSUES, FakeJira, FakeTempo
+
+pytestmark = pytest.mark.usefixtures("batch_backend")
+
+DAY = datetime(2024, 3, 4)  # monday
+
+
+def random_logs(rng: random.Random, n: int) -> list[WorkLog]:
+    return [
+        WorkLog(
+            issue=rng.choice(list(ISSUES)),
+            time_span=TimeSpan(
+                DAY + timedelta(days=rng.randrange(10), minutes=15 * rng.randrange(96)),
+                timedelta(minutes=15 * rng.randint(1, 16)),
+            ),
+            description=f"log {i}",
+            worklog_id=rng.choice([None, 1000 + i]),
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_worklog_round_trip(seed: int):
+    logs = random_logs(random.Random(seed), 50)
+    batch = WorkLogBatch.from_worklogs(logs)
+    assert len(batch) == len(logs)
+    assert batch.total_duration == sum(log.time_span.duration_seconds for log in logs)
+    assert batch.to_worklogs() == logs
+
+
+def test_from_tempo_dicts():
+    logs = random_logs(random.Random(0), 20)
+    tempo = FakeTempo()
+    jira = FakeJira()
+    log_dicts = [tempo.add(log.as_tempo_dict(jira)) for log in logs]
+    id_to_issue = {str(issue_id): issue for issue, issue_id in ISSUES.items()}
+
+    batch = WorkLogBatch.from_tempo_dicts(log_dicts, issue_key=id_to_issue.__getitem__)
+    assert batch.to_worklogs() == [
+        WorkLog.from_tempo_dict(log_dict, jira) for log_dict in log_dicts
+    ]
+    assert sorted(batch.issues) == sorted({log.issue for log in logs})
+
+    batch = WorkLogBatch.from_tempo_dicts(log_dicts)
+    assert set(batch.issues) == {str(ISSUES[log.issue]) for log in logs}
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_filters(seed: int):
+    rng = random.Random(seed)
+    logs = random_logs(rng, 100)
+    batch = WorkLogBatch.from_worklogs(logs)
+
+    time_span = TimeSpan(DAY + timedelta(days=rng.randrange(10), hours=10), timedelta(hours=5))
+    assert batch.in_time_span(time_span).to_worklogs() == [
+        log for log in logs if log.time_span & time_span
+    ]
+    assert batch.filter(batch.issue_mask("PP-1")).to_worklogs() == [
+        log for log in logs if log.issue == "PP-1"
+    ]
+    assert len(batch.filter(batch.issue_mask("UNKNOWN-1"))) == 0
+
+    overlapping_logs = {log for pair in overlapping(logs) for log in pair}
+    assert batch.filter(batch.overlapping_mask()).to_worklogs() == [
+        log for log in logs if log in overlapping_logs
+    ]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_durations_by(seed: int):
+    logs = random_logs(random.Random(seed), 100)
+    batch = WorkLogBatch.from_worklogs(logs)
+
+    expected = Counter()
+    for log in logs:
+        start = log.time_span.start
+        key = (tuple(start.isocalendar()[:2]), start.date(), log.issue)
+        expected[key] += log.time_span.duration_seconds
+    assert batch.durations_by("week", "date", "issue") == dict(sorted(expected.items()))
+
+    by_issue = Counter()
+    for (_, _, issue), duration in expected.items():
+        by_issue[(issue,)] += duration
+    assert batch.durations_by("issue") == dict(sorted(by_issue.items()))
+
+
+def test_durations_by_week():
+    batch = WorkLogBatch.from_worklogs(
+        [
+            WorkLog("PP-1", TimeSpan(datetime(2024, 12, 29, 10), timedelta(hours=1)), ""),
+            WorkLog("PP-1", TimeSpan(datetime(2024, 12, 30, 10), timedelta(hours=2)), ""),
+            WorkLog("PP-1", TimeSpan(datetime(2025, 1, 5, 10), timedelta(hours=3)), ""),
+        ]
+    )
+    assert batch.durations_by("week") == {((2024, 52),): 3600, ((2025, 1),): 5 * 3600}
+    assert batch.durations_by("date")[(date(2024, 12, 30),)] == 2 * 3600
+
+
+def test_invalid_batches():
+    with pytest.raises(ValueError):
+        WorkLogBatch.from_worklogs([]).durations_by()
+    with pytest.raises(ValueError):
+        WorkLogBatch.from_worklogs([]).durations_by("month")
+    with pytest.raises(ValueError):
+        WorkLogBatch([1], [1], [], [], [], [])
+    assert WorkLogBatch.from_worklogs([]).durations_by("date") == {}
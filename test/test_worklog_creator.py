@@ -0,0 +1,460 @@
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import replace
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+import pytest
+import requests
+from jira import JIRA
+from requests.adapters import BaseAdapter
+
+from tempo_worklog_cli import worklog_creator
+from tempo_worklog_cli.time_span import AFTERNOON, MORNING, TimeSpan
+from tempo_worklog_cli.util.io_util import get_yaml, save_yaml
+from tempo_worklog_cli.util.serialization import converter
+from tempo_worklog_cli.work_log import WorkLog, iter_worklogs_from_yaml
+from tempo_worklog_cli.worklog_creator import (
+    DEFAULT_NUM_THREADS,
+    WorkLogCreator,
+    WorkLogCreatorError,
+    _apply_server_info,
+)
+
+from .fakes import ACCOUNT_ID
+
+
+def test_create_logs(creator: WorkLogCreator):
+    worklogs = [
+        WorkLog("PP-1", TimeSpan(datetime(2024, 3, 4, 9), timedelta(hours=2)), "first"),
+        WorkLog("CORE-24", TimeSpan(datetime(2024, 3, 5, 9), timedelta(hours=1)), "second"),
+    ]
+    created = creator.create_logs(worklogs)
+
+    assert [log.worklog_id for log in created] == [1, 2]
+    assert [(log.issue, log.time_span, log.description) for log in created] == [
+        (log.issue, log.time_span, log.description) for log in worklogs
+    ]
+    assert creator.get_logs_on_date(date(2024, 3, 4)) == created[:1]
+    # the user's account id is fetched once and then reused for every payload
+    assert creator.jira.calls["myself"] == 1
+    assert creator.jira.calls["issue"] == 0
+
+
+def test_create_logs_fetches_date_ranges(creator: WorkLogCreator):
+    creator.tempo.add(
+        {
+            "issueId": 10001,
+            "startDate": "2024-03-13",
+            "startTime": "09:00:00",
+            "timeSpentSeconds": 7200,
+            "description": "existing",
+        }
+    )
+    # three weeks of workdays are fetched with a single request across the weekends
+    created = creator.create_workdays(date(2024, 3, 4), date(2024, 3, 22), "CORE-24", "work")
+    assert len(created) == 2 * 15
+    assert creator.tempo.calls["get_worklogs"] == 1
+    assert creator.tempo.worklogs[1]["timeSpentSeconds"] == 1800
+
+    creator.create_logs(
+        [
+            WorkLog("PP-1", TimeSpan(datetime(2024, 4, 1, 8), timedelta(hours=1)), "a"),
+            WorkLog("PP-1", TimeSpan(datetime(2024, 4, 2, 8), timedelta(hours=1)), "b"),
+            WorkLog("PP-1", TimeSpan(datetime(2024, 4, 15, 8), timedelta(hours=1)), "c"),
+        ]
+    )
+    assert creator.tempo.calls["get_worklogs"] == 3
+
+
+def test_account_id_is_cached(creator_kwargs: dict[str, Any]):
+    assert WorkLogCreator(**creator_kwargs).user_id == ACCOUNT_ID
+
+    warm_creator = WorkLogCreator(**creator_kwargs)
+    assert warm_creator.user_id == ACCOUNT_ID
+    assert warm_creator.jira.calls["myself"] == 0
+
+
+def test_connection_pools(creator_kwargs: dict[str, Any]):
+    creator = WorkLogCreator(**creator_kwargs, num_threads=12)
+    for session in (creator.jira._session, creator.tempo._session):
+        assert session.get_adapter("https://api.tempo.io").pool_size == 12
+
+
+def test_tempo_url(creator_kwargs: dict[str, Any]):
+    assert WorkLogCreator(**creator_kwargs).tempo.base_url == "https://api.tempo.io/4"
+    creator = WorkLogCreator(**creator_kwargs, tempo_url="http://localhost:8080/tempo/4")
+    assert creator.tempo.base_url == "http://localhost:8080/tempo/4"
+
+
+def test_mirror(creator_kwargs: dict[str, Any]):
+    creator = WorkLogCreator(**creator_kwargs, mirror=True)
+    creator.tempo.add(
+        {
+            "issueId": 10001,
+            "startDate": "2024-03-04",
+            "startTime": "09:00:00",
+            "timeSpentSeconds": 3600,
+            "description": "existing",
+        }
+    )
+    time_span = TimeSpan.from_start_and_end(date(2024, 3, 4), date(2024, 3, 8))
+    assert len(creator.get_logs_in_timespan(time_span)) == 1
+    assert creator.tempo.calls["get_worklogs"] == 1
+
+    # writes are planned from a fresh download, and write through to the mirror
+    created = creator.create_logs(
+        [WorkLog("PP-1", TimeSpan(datetime(2024, 3, 4, 9, 30), timedelta(hours=1)), "new")]
+    )
+    assert creator.tempo.calls["get_worklogs"] == 2
+    # served from the mirror within the refresh interval
+    logs = creator.get_logs_in_timespan(time_span)
+    assert [log.description for log in logs] == ["existing", "new"]
+    assert logs[1] == created[0]
+    assert logs[0].time_span.duration == timedelta(minutes=30)
+    assert creator.tempo.calls["get_worklogs"] == 2
+
+    # an outdated mirror only fetches updates
+    creator._mirror_refresh_interval = timedelta(0)
+    creator.tempo.worklogs[created[0].worklog_id]["description"] = "changed elsewhere"
+    creator.tempo.updated[created[0].worklog_id] = datetime.now()
+    logs = creator.get_logs_in_timespan(time_span)
+    assert [log.description for log in logs] == ["existing", "changed elsewhere"]
+    assert creator.tempo.calls["get_worklogs"] == 3
+
+    # closing the creator closes the database connection of the mirror
+    creator.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        creator.mirror.get(date(2024, 3, 4), date(2024, 3, 8))
+
+
+def test_mirror_writes_ignore_stale_worklogs(creator_kwargs: dict[str, Any]):
+    creator = WorkLogCreator(**creator_kwargs, mirror=True)
+    existing = creator.tempo.add(
+        {
+            "issueId": 10001,
+            "startDate": "2024-03-04",
+            "startTime": "09:00:00",
+            "timeSpentSeconds": 3600,
+            "description": "existing",
+        }
+    )
+    time_span = TimeSpan.from_start_and_end(date(2024, 3, 4), date(2024, 3, 4))
+    assert len(creator.get_logs_in_timespan(time_span)) == 1
+
+    # deleted elsewhere, which the incremental sync of the mirror doesn't notice
+    del creator.tempo.worklogs[existing["tempoWorklogId"]]
+    creator._mirror_refresh_interval = timedelta(0)
+    assert len(creator.get_logs_in_timespan(time_span)) == 1
+
+    creator.create_logs(
+        [WorkLog("PP-1", TimeSpan(datetime(2024, 3, 4, 9), timedelta(hours=1)), "new")]
+    )
+    # the stale worklog is neither updated nor deleted
+    assert creator.tempo.calls["put"] == creator.tempo.calls["delete"] == 0
+    assert [
+        log["description"] for log in creator.mirror.get(date(2024, 3, 4), date(2024, 3, 4))
+    ] == ["new"]
+    creator.delete_logs(time_span)
+    assert creator.tempo.worklogs == {}
+
+
+def test_get_logs_in_timespan_is_user_scoped(creator: WorkLogCreator):
+    log = {"startDate": "2024-03-04", "timeSpentSeconds": 3600, "description": ""}
+    creator.tempo.add({**log, "issueId": 10001, "startTime": "09:00:00"})
+    creator.tempo.add({**log, "issueId": 10002, "startTime": "09:00:00", "authorAccountId": "x"})
+    creator.tempo.add({**log, "issueId": 10024, "startTime": "15:00:00"})
+
+    time_span = TimeSpan(datetime(2024, 3, 4, 8), timedelta(hours=4))
+    assert [log.issue for log in creator.get_logs_in_timespan(time_span)] == ["PP-1"]
+    # neither the other user's log nor the log outside the time span have been resolved, so
+    # looking them up takes a Jira request each
+    assert creator.jira.calls["issue"] == 0
+    assert creator.issue_cache.issue_key(10024) == "CORE-24"
+    assert creator.issue_cache.issue_key(10002) == "PP-2"
+    assert creator.jira.calls["issue"] == 2
+    assert creator.issue_cache.issue_key(10001) == "PP-1"
+    assert creator.jira.calls["issue"] == 2
+
+
+def test_delete_logs_without_get(creator: WorkLogCreator):
+    created = creator.create_workdays(date(2024, 3, 4), date(2024, 3, 8), "CORE-24", "work")
+    creator.delete_logs(TimeSpan.from_start_and_end(date(2024, 3, 4), date(2024, 3, 6)))
+
+    assert len(creator.tempo.worklogs) == len(created) - 6
+    assert creator.tempo.calls["delete"] == 6
+    assert creator.tempo.calls["get"] == 0
+
+    # a bare id still needs to be fetched for logging
+    creator.delete_log(created[-1].worklog_id)
+    assert creator.tempo.calls["get"] == 1
+    assert created[-1].worklog_id not in creator.tempo.worklogs
+
+
+def test_create_logs_sync(creator: WorkLogCreator):
+    worklogs = [
+        WorkLog("PP-1", TimeSpan(datetime(2024, 3, 4, 9), timedelta(hours=2)), "first"),
+        WorkLog("CORE-24", TimeSpan(datetime(2024, 3, 4, 11), timedelta(hours=1)), "second"),
+    ]
+    created = creator.create_logs(worklogs)
+    writes = ("post", "put", "delete")
+    assert [creator.tempo.calls[method] for method in writes] == [2, 0, 0]
+
+    # re-applying the same logs doesn't write anything, changed logs replace their predecessors
+    assert creator.create_logs(worklogs, sync=True) == created
+    assert [creator.tempo.calls[method] for method in writes] == [2, 0, 0]
+
+    worklogs[1] = replace(worklogs[1], description="changed")
+    synced = creator.create_logs(worklogs, sync=True)
+    assert synced[0] == created[0]
+    assert synced[1].description == "changed"
+    assert [log.description for log in creator.get_logs_on_date(date(2024, 3, 4))] == [
+        "first",
+        "changed",
+    ]
+
+
+def test_create_logs_moves_covered_logs(creator: WorkLogCreator):
+    (existing,) = creator.create_logs(
+        [WorkLog("PP-1", TimeSpan(datetime(2024, 3, 4, 9), timedelta(hours=1)), "old")]
+    )
+    (moved,) = creator.create_logs(
+        [WorkLog("PP-1", TimeSpan(datetime(2024, 3, 4, 8), timedelta(hours=3)), "new")]
+    )
+
+    # the covered log is updated in place instead of being deleted and created again
+    assert moved.worklog_id == existing.worklog_id
+    assert moved.description == "new"
+    assert [creator.tempo.calls[method] for method in ("post", "put", "delete")] == [1, 1, 0]
+
+
+def test_create_logs_from_yaml_in_chunks(
+    creator: WorkLogCreator, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    worklogs = [
+        WorkLog("PP-1", TimeSpan(datetime(2024, 3, 4 + day, 9), timedelta(hours=1)), str(day))
+        for day in range(5)
+    ]
+    filepath = tmp_path / "worklogs.yaml"
+    with filepath.open("w") as file:
+        get_yaml().dump_all(
+            [converter.unstructure(worklogs[:3]), converter.unstructure(worklogs[3:])], file
+        )
+
+    creator.create_logs_from_yaml(filepath, chunk_size=2)
+    assert creator.tempo.calls["post"] == 5
+    assert creator.tempo.calls["get_worklogs"] == 3
+
+    # a worklog overlapping with one of an earlier chunk stops the creation before its chunk
+    new_log = WorkLog("PP-1", TimeSpan(datetime(2024, 3, 11, 9), timedelta(hours=1)), "new")
+    overlapping_log = replace(new_log, description="overlapping")
+    save_yaml(converter.unstructure([new_log, *worklogs[3:], overlapping_log]), filepath)
+    parsed = []
+    monkeypatch.setattr(
+        worklog_creator,
+        "iter_worklogs_from_yaml",
+        lambda *args, **kwargs: parsed.append(args) or iter_worklogs_from_yaml(*args, **kwargs),
+    )
+    with pytest.raises(WorkLogCreatorError, match="earlier chunk"):
+        creator.create_logs_from_yaml(filepath, chunk_size=2)
+    assert len(parsed) == 1  # the file is read once
+    # only the first chunk is written: new_log is created and worklogs[3] replaced in place
+    assert [creator.tempo.calls[method] for method in ("post", "put", "delete")] == [6, 1, 0]
+    descriptions = [log["description"] for log in creator.tempo.worklogs.values()]
+    assert "new" in descriptions and "overlapping" not in descriptions
+
+
+def test_get_batch_in_date_range(creator: WorkLogCreator, batch_backend: str):
+    created = creator.create_logs(
+        [
+            WorkLog("PP-1", TimeSpan(datetime(2024, 3, 4, 9), timedelta(hours=2)), "first"),
+            WorkLog("CORE-24", TimeSpan(datetime(2024, 3, 5, 9), timedelta(hours=1)), "second"),
+            WorkLog("PP-1", TimeSpan(datetime(2024, 3, 8, 9), timedelta(hours=1)), "third"),
+        ]
+    )
+    batch = creator.get_batch_in_date_range(date(2024, 3, 4), date(2024, 3, 5))
+    assert batch.to_worklogs() == created[:2]
+    assert batch.durations_by("issue") == {("PP-1",): 7200, ("CORE-24",): 3600}
+
+
+def test_create_logs_skips_weekends(creator: WorkLogCreator):
+    (existing,) = creator.create_logs(
+        [WorkLog("PP-1", TimeSpan(datetime(2024, 3, 4, 9), timedelta(hours=1)), "monday")]
+    )
+    created = creator.create_logs(
+        [
+            WorkLog("PP-1", TimeSpan(datetime(2024, 3, 2, 9), timedelta(hours=1)), "saturday"),
+            WorkLog("PP-2", TimeSpan(datetime(2024, 3, 4, 8), timedelta(hours=3)), "covering"),
+        ]
+    )
+
+    # the covered monday log is deleted, not moved onto the skipped saturday
+    assert creator.tempo.calls["put"] == 0
+    assert existing.worklog_id not in creator.tempo.worklogs
+    assert [log.description for log in created if log is not None] == ["covering"]
+    assert [log["startDate"] for log in creator.tempo.worklogs.values()] == ["2024-03-04"]
+
+
+def test_fill_gaps(creator: WorkLogCreator):
+    existing = creator.create_logs(
+        [
+            WorkLog("PP-1", TimeSpan(datetime(2024, 3, 8, 10), timedelta(hours=1)), "meeting"),
+            WorkLog("PP-2", TimeSpan(datetime(2024, 3, 8, 12), timedelta(hours=3)), "review"),
+        ]
+    )
+    # FRI to MON
+    fetches = creator.tempo.calls["get_worklogs"]
+    created = creator.fill_gaps(date(2024, 3, 8), date(2024, 3, 11), "CORE-24", "work")
+    assert creator.tempo.calls["get_worklogs"] == fetches + 1  # existing logs are fetched once
+    assert [log.time_span for log in created] == [
+        TimeSpan.from_start_and_end(
+            MORNING.change_date(date(2024, 3, 8)).start, datetime(2024, 3, 8, 10)
+        ),
+        TimeSpan(datetime(2024, 3, 8, 11), timedelta(hours=1)),
+        TimeSpan.from_start_and_end(
+            datetime(2024, 3, 8, 15), AFTERNOON.change_date(date(2024, 3, 8)).end
+        ),
+        MORNING.change_date(date(2024, 3, 11)),
+        AFTERNOON.change_date(date(2024, 3, 11)),
+    ]
+    assert {log.issue for log in created} == {"CORE-24"}
+    assert creator.tempo.calls["post"] == len(existing) + len(created)
+    # existing logs are left untouched and there are no gaps left
+    assert creator.tempo.calls["put"] == creator.tempo.calls["delete"] == 0
+    assert creator.fill_gaps(date(2024, 3, 8), date(2024, 3, 11), "CORE-24", "work") == []
+
+
+def test_stats(creator_kwargs: dict[str, Any]):
+    creator = WorkLogCreator(**creator_kwargs)
+    creator.create_logs(
+        [
+            WorkLog("PP-1", TimeSpan(datetime(2024, 3, 4, 9), timedelta(hours=2)), "first"),
+            WorkLog("PP-1", TimeSpan(datetime(2024, 3, 5, 9), timedelta(hours=2)), "second"),
+        ]
+    )
+    stats = creator.stats.as_dict()
+    assert list(stats["phases"]) == ["fetch existing", "reconcile", "update", "delete", "create"]
+    assert all(phase["calls"] == 1 for phase in stats["phases"].values())
+    # PP-1 is resolved in bulk once and then served from the cache for both payloads and results
+    assert stats["caches"]["issues"] == {"hits": 4, "misses": 1, "hit_rate": 0.8}
+    assert stats["caches"]["accounts"]["misses"] == 1
+
+    warm_creator = WorkLogCreator(**creator_kwargs)
+    assert warm_creator.stats.as_dict()["caches"]["accounts"]["hits"] == 1
+
+
+def test_batches_share_a_bounded_pool(creator_kwargs: dict[str, Any]):
+    in_flight = 0
+    max_in_flight = 0
+    threads = set()
+    lock = threading.Lock()
+
+    def request(item: int) -> int:
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            threads.add(threading.get_ident())
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+        return item
+
+    with WorkLogCreator(**creator_kwargs) as creator:
+        start = time.perf_counter()
+        results = creator._batch_perform_action(request, range(64))
+        elapsed = time.perf_counter() - start
+        # later phases reuse the same worker threads
+        creator._batch_perform_action(request, range(64))
+
+    assert results == list(range(64))
+    assert max_in_flight == DEFAULT_NUM_THREADS
+    assert len(threads) == DEFAULT_NUM_THREADS
+    # 64 requests at 16 concurrent requests take ~4 rounds of 50 ms
+    assert elapsed < 1.0
+
+
+def test_mirror_syncs_date_ranges(creator_kwargs: dict[str, Any]):
+    creator = WorkLogCreator(**creator_kwargs, mirror=True)
+    fetched = []
+    get_worklogs = creator.tempo.get_worklogs
+
+    def record(date_from, date_to, **kwargs):
+        fetched.append((date_from, date_to))
+        return get_worklogs(date_from, date_to, **kwargs)
+
+    creator.tempo.get_worklogs = record
+    creator.create_logs(
+        [
+            WorkLog("PP-1", TimeSpan(datetime(2024, 1, 8, 9), timedelta(hours=1)), "a"),
+            WorkLog("PP-1", TimeSpan(datetime(2024, 12, 9, 9), timedelta(hours=1)), "b"),
+        ]
+    )
+    # two single days rather than the whole year in between
+    assert sorted(fetched) == [
+        (date(2024, 1, 8), date(2024, 1, 8)),
+        (date(2024, 12, 9), date(2024, 12, 9)),
+    ]
+
+
+class JsonAdapter(BaseAdapter):
+    """
+    serves canned JSON by the last segment of the request path and records the requested paths
+    """
+
+    def __init__(self, responses: dict[str, Any]) -> None:
+        super().__init__()
+        self.responses = responses
+        self.paths: list[str] = []
+
+    def send(self, request, **kwargs) -> requests.Response:
+        path = urlsplit(request.url).path
+        self.paths.append(path)
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response._content = json.dumps(self.responses[path.rsplit("/", 1)[-1]]).encode()
+        response.url, response.request = request.url, request
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.mark.parametrize(
+    "deployment_type, version, search_path",
+    [
+        ("Cloud", [1001, 0, 0], "/rest/api/2/search/jql"),
+        ("Server", [9, 12, 0], "/rest/api/2/search"),
+    ],
+)
+def test_server_info_contract(deployment_type: str, version: list[int], search_path: str):
+    """
+    the real client skips the server info on construction, the attributes set in its place must be
+    the ones `search_issues` reads (see the jira pin in pyproject.toml)
+    """
+    issue = {"id": "10001", "key": "PP-1", "self": "", "fields": {}}
+    adapter = JsonAdapter(
+        {
+            "serverInfo": {"versionNumbers": version, "deploymentType": deployment_type},
+            "field": [],
+            "jql": {"issues": [issue], "isLast": True},
+            "search": {"startAt": 0, "maxResults": 1, "total": 1, "issues": [issue]},
+        }
+    )
+    jira = JIRA("https://jira.invalid", basic_auth=("u", "t"), max_retries=0, get_server_info=False)
+    assert adapter.paths == []  # nothing is sent on construction
+    jira._session.mount("https://", adapter)
+
+    _apply_server_info(jira, jira.server_info())
+    assert jira._version == tuple(version)
+    assert jira._is_cloud == (deployment_type == "Cloud")
+    assert jira._get_url("serverInfo") == "https://jira.invalid/rest/api/2/serverInfo"
+
+    found = jira.search_issues("issue in (PP-1)", maxResults=1, fields="key", validate_query=False)
+    assert [found_issue.key for found_issue in found] == ["PP-1"]
+    assert adapter.paths[-1] == search_path
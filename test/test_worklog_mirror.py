@@ -0,0 +1,71 @@
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from tempo_worklog_cli.worklog_mirror import WorkLogMirror
+
+
+def tempo_dict(worklog_id: int, start_date: str, description: str = "test") -> dict:
+    return {
+        "tempoWorklogId": worklog_id,
+        "issue": {"id": 10001},
+        "startDate": start_date,
+        "startTime": "09:00:00",
+        "timeSpentSeconds": 3600,
+        "description": description,
+    }
+
+
+def test_sync_state(tmp_path: Path):
+    filepath = tmp_path / "worklogs.sqlite"
+    mirror = WorkLogMirror(filepath)
+    assert mirror.synced_at(date(2024, 3, 4), date(2024, 3, 8)) is None
+
+    synced_at = datetime(2024, 3, 10, 12, tzinfo=timezone.utc)
+    mirror.replace(date(2024, 3, 4), date(2024, 3, 6), [], synced_at=synced_at)
+    assert mirror.synced_at(date(2024, 3, 4), date(2024, 3, 6)) == synced_at
+    assert mirror.synced_at(date(2024, 3, 5), date(2024, 3, 5)) == synced_at
+    # partially synced range
+    assert mirror.synced_at(date(2024, 3, 4), date(2024, 3, 8)) is None
+
+    later = synced_at + timedelta(hours=1)
+    mirror.update(date(2024, 3, 6), date(2024, 3, 8), [], synced_at=later)
+    assert mirror.synced_at(date(2024, 3, 4), date(2024, 3, 8)) == synced_at
+    assert mirror.synced_at(date(2024, 3, 6), date(2024, 3, 8)) == later
+    mirror.close()
+
+    # state is persisted
+    mirror = WorkLogMirror(filepath)
+    assert mirror.synced_at(date(2024, 3, 4), date(2024, 3, 6)) == synced_at
+
+    # sync times are stored in UTC, such that the oldest one is found regardless of time zones
+    earlier = datetime(2024, 3, 10, 13, tzinfo=timezone(timedelta(hours=2)))
+    mirror.update(date(2024, 3, 6), date(2024, 3, 6), [], synced_at=earlier)
+    oldest = mirror.synced_at(date(2024, 3, 4), date(2024, 3, 6))
+    assert oldest == earlier
+    assert oldest.tzinfo == timezone.utc
+
+
+def test_worklogs():
+    mirror = WorkLogMirror(None)
+    mirror.replace(
+        date(2024, 3, 4),
+        date(2024, 3, 6),
+        [tempo_dict(2, "2024-03-05"), tempo_dict(1, "2024-03-04"), tempo_dict(3, "2024-03-06")],
+        synced_at=datetime.now(),
+    )
+    assert [log["tempoWorklogId"] for log in mirror.get(date(2024, 3, 4), date(2024, 3, 5))] == [
+        1,
+        2,
+    ]
+
+    mirror.upsert([tempo_dict(2, "2024-03-05", "updated"), tempo_dict(4, "2024-03-05")])
+    mirror.delete([1])
+    logs = mirror.get(date(2024, 3, 4), date(2024, 3, 5))
+    assert [(log["tempoWorklogId"], log["description"]) for log in logs] == [
+        (2, "updated"),
+        (4, "test"),
+    ]
+
+    # a full download replaces everything in its range
+    mirror.replace(date(2024, 3, 5), date(2024, 3, 5), [], synced_at=datetime.now())
+    assert [log["tempoWorklogId"] for log in mirror.get(date(2024, 3, 1), date(2024, 3, 31))] == [3]
@@ -0,0 +1,57 @@
+import threading
+from collections import Counter
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests[self.path] += 1
+            count = self.server.requests[self.path]
+
+        status = 200
+        if self.path == "/throttled" and count <= 2:
+            status = 429
+        elif self.path == "/unavailable":
+            status = 503
+
+        body = b"{}"
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_POST = do_PUT = do_DELETE = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server() -> Iterator[ThreadingHTTPServer]:
+    """
+    local HTTP server which counts the TCP connections opened to it
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CountingHandler)
+    server.connections = 0
+    server.requests = Counter()
+    server.lock = threading.Lock()
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
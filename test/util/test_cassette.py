@@ -0,0 +1,85 @@
+import json
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+import requests
+
+from tempo_worklog_cli.util.cassette import Cassette, CassetteError
+from tempo_worklog_cli.util.http import ThrottledHTTPAdapter, mount_adapter
+from tempo_worklog_cli.util.throttle import RetryPolicy
+
+SECRET = "secret-token"
+
+
+def _session(cassette: Cassette) -> requests.Session:
+    session = requests.Session()
+    adapter = ThrottledHTTPAdapter(
+        pool_size=1, retry_policy=RetryPolicy(max_retries=3, backoff_base=0.5), cassette=cassette
+    )
+    mount_adapter(session, adapter)
+    return session
+
+
+def _exchanges(session: requests.Session, url: str) -> list[tuple[int, str]]:
+    responses = [
+        session.get(f"{url}/throttled"),
+        session.post(f"{url}/worklogs?token={SECRET}", json={"b": 1, "a": SECRET}),  # unsorted
+    ]
+    return [(response.status_code, response.text) for response in responses]
+
+
+@pytest.fixture
+def recorded(server: ThreadingHTTPServer, tmp_path: Path) -> tuple[Path, list[tuple[int, str]]]:
+    path = tmp_path / "cassette.json"
+    with Cassette(path, mode="record", secrets=[SECRET]) as cassette:
+        results = _exchanges(_session(cassette), f"http://127.0.0.1:{server.server_address[1]}")
+    return path, results
+
+
+def test_record(recorded: tuple[Path, list[tuple[int, str]]]):
+    path, results = recorded
+    assert results == [(200, "{}"), (200, "{}")]
+    content = path.read_text()
+    assert SECRET not in content
+
+    interactions = json.loads(content)["interactions"]
+    # the throttled attempts are recorded as well
+    assert [interaction["status"] for interaction in interactions] == [429, 429, 200, 200]
+    assert interactions[-1]["body"] == '{"a": "<scrubbed>", "b": 1}'
+    assert all(interaction["elapsed"] > 0 for interaction in interactions)
+
+
+def test_replay(recorded: tuple[Path, list[tuple[int, str]]]):
+    path, results = recorded
+    sleeps = []
+    cassette = Cassette(path, latency=True, secrets=[SECRET], sleep=sleeps.append)
+    session = _session(cassette)
+    url = "http://nowhere.invalid"  # matched regardless of the host, nothing is sent
+
+    assert _exchanges(session, url) == results
+    recorded_elapsed = [interaction["elapsed"] for interaction in cassette._interactions]
+    assert sleeps == recorded_elapsed
+    assert cassette.misses == 0
+
+    with pytest.raises(CassetteError):
+        session.get(f"{url}/unavailable")
+    assert cassette.misses == 1  # not retried
+
+
+def test_replay_instant(recorded: tuple[Path, list[tuple[int, str]]], monkeypatch):
+    path, results = recorded
+    monkeypatch.setattr("time.sleep", lambda _: pytest.fail("replay must not wait"))
+    # the retries of the throttled request don't wait either
+    cassette = Cassette(path, latency=False, secrets=[SECRET, "x"])
+    assert _exchanges(_session(cassette), "http://nowhere.invalid") == results
+    assert cassette.misses == 0
+
+
+def test_invalid_cassette(tmp_path: Path):
+    with pytest.raises(ValueError):
+        Cassette(tmp_path / "cassette.json", mode="append")
+    path = tmp_path / "cassette.json"
+    path.write_text(json.dumps({"version": 0, "interactions": []}))
+    with pytest.raises(ValueError):
+        Cassette(path)
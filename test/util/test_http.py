@@ -0,0 +1,50 @@
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer
+
+import pytest
+import requests
+
+from tempo_worklog_cli.util.http import ThrottledHTTPAdapter, mount_adapter
+from tempo_worklog_cli.util.throttle import RetryPolicy
+
+
+@pytest.mark.parametrize("pool_size, num_workers", [(1, 1), (4, 4), (4, 16)])
+def test_keep_alive_reuse(server: ThreadingHTTPServer, pool_size: int, num_workers: int):
+    url = f"http://127.0.0.1:{server.server_address[1]}/worklogs"
+    with requests.Session() as session:
+        # the adapter WorkLogCreator mounts for Jira and Tempo
+        mount_adapter(session, ThrottledHTTPAdapter(pool_size))
+        with ThreadPoolExecutor(max_workers=num_workers) as pool:
+            responses = list(pool.map(lambda _: session.get(url), range(100)))
+
+    assert all(response.ok for response in responses)
+    assert 1 <= server.connections <= pool_size
+
+
+@pytest.mark.parametrize(
+    "method, path, status, num_requests",
+    [
+        ("GET", "/throttled", 200, 3),
+        ("POST", "/throttled", 200, 3),  # throttled requests were rejected, safe to resend
+        ("GET", "/unavailable", 503, 4),
+        ("POST", "/unavailable", 503, 1),  # not idempotent, no retry
+        ("PUT", "/unavailable", 503, 4),
+    ],
+)
+def test_retries(
+    server: ThreadingHTTPServer, method: str, path: str, status: int, num_requests: int
+):
+    adapter = ThrottledHTTPAdapter(
+        pool_size=4, retry_policy=RetryPolicy(max_retries=3, backoff_base=0.001)
+    )
+    url = f"http://127.0.0.1:{server.server_address[1]}{path}"
+    with requests.Session() as session:
+        mount_adapter(session, adapter)
+        response = session.request(method, url)
+
+    assert response.status_code == status
+    assert server.requests[path] == num_requests
+    if path == "/throttled":
+        # concurrency is halved for every throttled request (4 -> 2 -> 1) and grows again on
+        # success
+        assert adapter.limiter.limit == 2
@@ -0,0 +1,54 @@
+from datetime import timedelta
+from pathlib import Path
+
+from tempo_worklog_cli.util.persistent_cache import PersistentCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_round_trip(tmp_path: Path):
+    filepath = tmp_path / "cache" / "cache.json"
+    cache = PersistentCache(filepath)
+    cache.update({"a": 1, "b": ["x", "y"]})
+
+    cache2 = PersistentCache(filepath)
+    assert cache2.get("a") == 1
+    assert cache2.get("b") == ["x", "y"]
+    assert cache2.get("c") is None
+
+
+def test_ttl():
+    clock = Clock()
+    cache = PersistentCache(None, ttl=timedelta(seconds=10), clock=clock)
+    cache.set("a", 1)
+    clock.now = 10
+    assert cache.get("a") == 1
+    clock.now = 11
+    assert cache.get("a") is None
+
+
+def test_eviction():
+    clock = Clock()
+    cache = PersistentCache(None, max_entries=2, clock=clock)
+    for i, key in enumerate("abc"):
+        clock.now = i
+        cache.set(key, i)
+
+    assert len(cache) == 2
+    assert "a" not in cache
+    assert cache.get("c") == 2
+
+
+def test_corrupt_file(tmp_path: Path):
+    filepath = tmp_path / "cache.json"
+    filepath.write_text("{not json")
+    cache = PersistentCache(filepath)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert PersistentCache(filepath).get("a") == 1
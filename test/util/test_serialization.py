@@ -3,7 +3,8 @@ from typing import TypeVar
 
 import pytest
 
-from tempo_worklog_cli.util.serialization import converter
+from tempo_worklog_cli.util import serialization
+from tempo_worklog_cli.util.serialization import converter, frozen_today
 
 T = TypeVar("T", date, datetime, timedelta)
 
@@ -34,12 +35,49 @@ T = TypeVar("T", date, datetime, timedelta)
         ("1T00:00:01", timedelta, timedelta(days=1, seconds=1)),
         ("0T12:34:56", timedelta, timedelta(hours=12, minutes=34, seconds=56)),
         ("7T12:30:00", timedelta, timedelta(weeks=1, hours=12, minutes=30)),
+        ("1h30m", timedelta, timedelta(hours=1, minutes=30)),
+        ("02:30", timedelta, timedelta(hours=2, minutes=30)),
+        # values already structured by the yaml loader
+        (date(2000, 1, 1), date, date(2000, 1, 1)),
+        (datetime(2000, 1, 1, 12), date, date(2000, 1, 1)),
+        (datetime(2000, 1, 1, 12), datetime, datetime(2000, 1, 1, 12)),
+        (timedelta(hours=1), timedelta, timedelta(hours=1)),
     ],
 )
 def test_structuring(string: str, cls: type[T], expected: T):
     assert converter.structure(string, cls) == expected
 
 
+@pytest.mark.parametrize(
+    "string, cls",
+    [
+        ("25:00:00", timedelta),
+        ("0T12:60:00", timedelta),
+        (5400, timedelta),  # seconds or minutes?
+        ("noon", datetime),
+        ("soon", date),
+    ],
+)
+def test_structuring_invalid(string: str, cls: type):
+    with pytest.raises(ValueError):
+        converter.structure(string, cls)
+
+
+def test_frozen_today(monkeypatch: pytest.MonkeyPatch):
+    class FixedDate(date):
+        @classmethod
+        def today(cls):
+            return cls(2000, 1, 1)
+
+    with frozen_today() as expected:
+        monkeypatch.setattr(serialization, "date", FixedDate)
+        assert converter.structure("today", date) == expected
+        with frozen_today() as nested:
+            assert nested == expected
+    # resolved anew outside of the block
+    assert converter.structure("today+1", date) == date(2000, 1, 2)
+
+
 @pytest.mark.parametrize(
     "obj, expected",
     [
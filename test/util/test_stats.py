@@ -0,0 +1,94 @@
+from http.server import ThreadingHTTPServer
+
+import pytest
+import requests
+
+from tempo_worklog_cli.util.http import ThrottledHTTPAdapter, mount_adapter
+from tempo_worklog_cli.util.stats import RunStats, percentile
+from tempo_worklog_cli.util.throttle import RetryPolicy
+
+
+@pytest.mark.parametrize(
+    "method, url, endpoint",
+    [
+        ("get", "https://x.atlassian.net/rest/api/2/issue/PP-1?fields=key", "GET /issue/{id}"),
+        ("GET", "https://x.atlassian.net/rest/api/2/myself", "GET /myself"),
+        ("POST", "https://api.tempo.io/4/worklogs", "POST /worklogs"),
+        ("PUT", "https://api.tempo.io/4/worklogs/123", "PUT /worklogs/{id}"),
+        ("GET", "https://api.tempo.io/4/worklogs/user/acc-1?limit=5000", "GET /worklogs/user/{id}"),
+        ("GET", "https://api.tempo.io/4", "GET /"),
+        ("GET", "https://other.net/4b/worklogs", "GET /{id}/worklogs"),  # not a base path
+    ],
+)
+def test_endpoint(method: str, url: str, endpoint: str):
+    stats = RunStats(base_paths=["/rest/api/2", "/4", "/"])
+    assert stats.endpoint(method, url) == endpoint
+
+
+def test_percentile():
+    assert percentile([], 50) == 0.0
+    assert percentile([1.0], 95) == 1.0
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 0) == 1.0
+
+
+def test_run_stats():
+    stats = RunStats(base_paths=["/4"])
+    for seconds in (0.1, 0.2, 0.3, 0.4):
+        stats.record_request("GET", "https://api.tempo.io/4/worklogs/1", seconds, num_bytes=10)
+    stats.record_request("POST", "https://api.tempo.io/4/worklogs", 1.0, retries=2, error=True)
+    with stats.phase("create"):
+        pass
+    with pytest.raises(RuntimeError), stats.phase("create"):
+        raise RuntimeError
+    stats.count_cache("issues", hits=3, misses=1)
+    stats.count_cache("accounts")
+
+    data = stats.as_dict()
+    assert data["requests"]["GET /worklogs/{id}"] == {
+        "requests": 4,
+        "retries": 0,
+        "errors": 0,
+        "bytes": 40,
+        "p50_s": 0.2,
+        "p95_s": 0.4,
+        "total_s": pytest.approx(1.0),
+    }
+    assert data["requests"]["POST /worklogs"]["retries"] == 2
+    assert data["requests"]["POST /worklogs"]["errors"] == 1
+    assert data["phases"]["create"]["calls"] == 2
+    assert data["caches"] == {
+        "issues": {"hits": 3, "misses": 1, "hit_rate": 0.75},
+        "accounts": {"hits": 0, "misses": 0, "hit_rate": None},
+    }
+
+    lines = stats.format().splitlines()
+    assert lines[0].split()[:2] == ["endpoint", "requests"]
+    # busiest endpoint first
+    assert lines[1].split() == ["GET", "/worklogs/{id}", "4", "0", "0", "200.0", "400.0", "40"]
+    assert ["issues", "3", "1", "75.0%"] in [line.split() for line in lines]
+
+    stats.reset()
+    assert stats.format() == ""
+
+
+def test_adapter_stats(server: ThreadingHTTPServer):
+    stats = RunStats()
+    adapter = ThrottledHTTPAdapter(
+        pool_size=2, retry_policy=RetryPolicy(max_retries=3, backoff_base=0.001), stats=stats
+    )
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    with requests.Session() as session:
+        mount_adapter(session, adapter)
+        session.get(f"{url}/throttled")
+        session.post(f"{url}/unavailable", data=b"12345")
+
+    throttled = stats.endpoints["GET /throttled"]
+    assert (throttled.requests, throttled.retries, throttled.errors) == (1, 2, 0)
+    assert throttled.bytes == 3 * len(b"{}")  # every attempt is counted
+    unavailable = stats.endpoints["POST /unavailable"]
+    assert (unavailable.requests, unavailable.retries, unavailable.errors) == (1, 0, 1)
+    assert unavailable.bytes == 5 + len(b"{}")
+    assert throttled.latencies[0] > 0
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from tempo_worklog_cli.util.throttle import (
+    AdaptiveConcurrencyLimiter,
+    RetryPolicy,
+    TokenBucket,
+    parse_retry_after,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+def test_token_bucket_rate():
+    clock = Clock()
+    bucket = TokenBucket(rate=10, capacity=1, clock=clock, sleep=clock.sleep)
+    for _ in range(11):
+        bucket.acquire()
+    assert clock.now == pytest.approx(1.0)
+
+
+def test_token_bucket_pause():
+    clock = Clock()
+    bucket = TokenBucket(clock=clock, sleep=clock.sleep)
+    bucket.acquire()
+    assert clock.now == 0
+    bucket.pause(5)
+    bucket.acquire()
+    assert clock.now == pytest.approx(5)
+
+
+def test_adaptive_concurrency():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=8)
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert limiter.limit == 2
+    for _ in range(2):
+        limiter.on_success()
+    assert limiter.limit == 3
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.limit == 8
+    for _ in range(10):
+        limiter.on_throttle()
+    assert limiter.limit == 1
+
+
+def test_backoff():
+    policy = RetryPolicy(backoff_base=1, backoff_max=10)
+    for attempt in range(10):
+        assert 0 <= policy.backoff(attempt) <= min(10, 2**attempt)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (None, None),
+        ("", None),
+        ("3", 3),
+        ("1.5", 1.5),
+        ("-1", 0),
+        ("not a date", None),
+        (format_datetime(datetime(2000, 1, 1, tzinfo=timezone.utc), usegmt=True), 0),
+    ],
+)
+def test_parse_retry_after(value: str | None, expected: float | None):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_date():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 < parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 30